@@ -0,0 +1,72 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from gi.repository import Gio, GLib
+
+from assets.utils.debug import log_debug
+
+# Small pool: calls are short D-Bus/nmcli round trips, not CPU work
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="connex-async")
+
+
+def on_main_loop(callback: Callable, *args):
+    # idle_add repeats while the callback returns True; views' timer callbacks do
+    def run():
+        callback(*args)
+        return False
+    GLib.idle_add(run)
+
+
+def call_async(func: Callable, *args, callback: Optional[Callable] = None, **kwargs) -> Future:
+    # Run func in a worker, hand its result to callback on the GTK main loop
+    future = _executor.submit(func, *args, **kwargs)
+
+    def deliver(fut):
+        try:
+            result = fut.result()
+        except Exception as e:
+            log_debug(f"Async call {getattr(func, '__name__', func)} failed: {e}")
+            return
+        if callback:
+            on_main_loop(callback, result)
+
+    future.add_done_callback(deliver)
+    return future
+
+
+def run_async(args: List[str], callback: Optional[Callable] = None, timeout: int = 8) -> Optional[Gio.Cancellable]:
+    # Gio.Subprocess version of run_cmd: callback(code, stdout, stderr) on the main loop
+    log_debug(f"Running async: {' '.join(args)}")
+    cancellable = Gio.Cancellable()
+    try:
+        proc = Gio.Subprocess.new(
+            args, Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_PIPE
+        )
+    except GLib.Error as e:
+        if callback:
+            on_main_loop(callback, 1, "", e.message)
+        return None
+
+    state = {"timed_out": False}
+
+    def on_timeout():
+        state["timed_out"] = True
+        proc.force_exit()
+        cancellable.cancel()
+        return False
+
+    timeout_id = GLib.timeout_add_seconds(timeout, on_timeout)
+
+    def on_done(proc, result):
+        if not state["timed_out"]:
+            GLib.source_remove(timeout_id)
+        try:
+            ok, out, err = proc.communicate_utf8_finish(result)
+            code = proc.get_exit_status() if proc.get_if_exited() else 1
+        except GLib.Error as e:
+            code, out, err = 1, "", "Command timed out" if state["timed_out"] else e.message
+        if callback:
+            callback(code, (out or "").strip(), (err or "").strip())
+
+    proc.communicate_utf8_async(None, cancellable, on_done)
+    return cancellable
@@ -0,0 +1,76 @@
+import socket
+import threading
+import time
+from typing import Optional
+
+from assets.utils.debug import log_debug, get_config
+from assets.core.nm_backend import get_backend
+from assets.core.nm_events import get_event_monitor
+
+DEFAULT_TTL = 30
+# Used when NM's own check is disabled or says "unknown"
+PROBE_TARGETS = (("1.1.1.1", 443), ("9.9.9.9", 53))
+PROBE_TIMEOUT = 2
+
+
+def tcp_probe(targets=PROBE_TARGETS, timeout: float = PROBE_TIMEOUT) -> bool:
+    for host, port in targets:
+        try:
+            with socket.create_connection((host, port), timeout=timeout):
+                return True
+        except OSError:
+            continue
+    return False
+
+
+class ConnectivityService:
+    def __init__(self, ttl: float = DEFAULT_TTL, backend=None):
+        self.ttl = ttl
+        self.backend = backend or get_backend()
+        self._state: Optional[str] = None
+        self._time = 0.0
+        self._lock = threading.Lock()
+
+        events = get_event_monitor()
+        if events:
+            # Connectivity changes arrive as "state"; subscribe before the views
+            events.subscribe("state", self.invalidate)
+
+    def peek(self) -> Optional[str]:
+        return self._state
+
+    def is_fresh(self) -> bool:
+        return bool(self._time) and time.monotonic() - self._time < self.ttl
+
+    def get(self) -> str:
+        # May block on a probe; call from a worker. Concurrent callers share one check.
+        with self._lock:
+            if not self.is_fresh():
+                self._state = self._check()
+                self._time = time.monotonic()
+            return self._state
+
+    def is_online(self) -> bool:
+        return self.get() == "full"
+
+    def invalidate(self):
+        self._time = 0.0
+
+    def _check(self) -> str:
+        state = self.backend.connectivity()
+        if state == "unknown":
+            state = "full" if tcp_probe() else "none"
+        log_debug(f"Connectivity: {state}")
+        return state
+
+
+_service = None
+
+
+def get_connectivity() -> ConnectivityService:
+    global _service
+    if _service is None:
+        config = get_config()
+        ttl = config.getfloat('GENERAL', 'connectivity_ttl', fallback=DEFAULT_TTL) if config else DEFAULT_TTL
+        _service = ConnectivityService(ttl=ttl)
+    return _service
@@ -0,0 +1,179 @@
+import json
+import os
+import signal
+import socketserver
+import threading
+import time
+from typing import Dict
+
+from gi.repository import GLib
+
+from assets.utils.debug import log_debug
+from assets.core.nm_backend import get_backend
+from assets.core.nm_events import get_event_monitor
+from assets.core.scan_cache import ScanCache, cache_ttl
+from assets.core.connectivity import get_connectivity
+from assets.core.scheduler import get_scheduler
+from assets.core.async_cmd import call_async
+from assets.core.ipc import DaemonClient, socket_path
+
+STATE_TTL = 30
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                result = self.server.connexd.handle(request.get("method"), request.get("params") or {})
+                reply = {"ok": True, "result": result}
+            except Exception as e:
+                reply = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ConnexDaemon:
+    # Owns the scan cache and NM state for every frontend on the session
+    def __init__(self, path=None):
+        self.path = path or socket_path()
+        self.backend = get_backend()
+        self.scan_cache = ScanCache(ttl=cache_ttl())
+        self.connectivity = get_connectivity()
+        self.scheduler = get_scheduler()
+        self.server = None
+        self.loop = None
+        self._state = None
+        self._state_time = 0.0
+        self.started = time.time()
+
+        self.methods = {
+            "ping": self.ping,
+            "networks": self.networks,
+            "status": self.status,
+            "vpn": self.vpn,
+            "proxy": self.proxy,
+            "history": self.history,
+        }
+
+        self.events = get_event_monitor()
+        if self.events:
+            for topic in ("state", "active-connections", "radio"):
+                self.events.subscribe(topic, self.refresh_state)
+        else:
+            self.scheduler.add(10, self.refresh_state)
+        if not (self.events and "access-points" in self.events.provides):
+            self.scheduler.add(30, self.scan_cache.refresh)
+
+    def handle(self, method, params: Dict):
+        if method not in self.methods:
+            raise ValueError(f"Unknown method: {method}")
+        log_debug(f"connexd: {method} {params}")
+        return self.methods[method](**params)
+
+    def ping(self):
+        return {"pid": os.getpid(), "uptime": round(time.time() - self.started, 1),
+                "backend": self.backend.name}
+
+    def networks(self, rescan=False):
+        # Raw AP list, same shape as backend.get_wifi_networks()
+        if rescan or not self.scan_cache.is_fresh():
+            return self.scan_cache.load(rescan)
+        return self.scan_cache.peek()
+
+    def read_state(self):
+        connected = self.backend.is_connected()
+        ssid = None
+        for conn in self.backend.get_active_connections():
+            if conn['type'] == "802-11-wireless":
+                ssid = conn['name']
+                break
+        return {
+            "connected": connected,
+            "ssid": ssid,
+            "connectivity": self.connectivity.get() if connected else "none",
+            "wifi_enabled": self.backend.wifi_enabled(),
+            "device": self.backend.device_show() or [],
+        }
+
+    def set_state(self, state):
+        self._state = state
+        self._state_time = time.monotonic()
+
+    def refresh_state(self):
+        call_async(self.read_state, callback=self.set_state)
+        return True
+
+    def status(self):
+        if self._state is None or time.monotonic() - self._state_time > STATE_TTL:
+            self.set_state(self.read_state())
+        return self._state
+
+    def vpn(self):
+        from assets.core.vpn_manager import VPNManager
+        return {"connections": VPNManager.get_vpn_list(), "active": VPNManager.get_active_vpn()}
+
+    def proxy(self):
+        from assets.core.proxies import ProxyManager
+        return ProxyManager().get_current_proxy()
+
+    def history(self, limit=50, **filters):
+        from assets.core.history import get_history
+        return get_history().query(limit=limit, **filters)
+
+    def start(self) -> bool:
+        if not self.path:
+            print("No private directory for the connexd socket; set XDG_RUNTIME_DIR")
+            return False
+        if DaemonClient(self.path).request("ping") is not None:
+            print(f"connexd is already running on {self.path}")
+            return False
+        if os.path.exists(self.path):
+            # Left behind by a daemon that didn't shut down cleanly
+            os.unlink(self.path)
+
+        old_umask = os.umask(0o077)
+        try:
+            self.server = _Server(self.path, _Handler)
+        finally:
+            os.umask(old_umask)
+        self.server.connexd = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        log_debug(f"connexd listening on {self.path}")
+
+        self.refresh_state()
+        self.scan_cache.refresh()
+        return True
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        if self.loop:
+            self.loop.quit()
+        return False
+
+    def run(self) -> int:
+        if not self.start():
+            return 1
+        self.loop = GLib.MainLoop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signum, self.stop)
+        print(f"connexd running on {self.path}")
+        try:
+            self.loop.run()
+        finally:
+            self.stop()
+        return 0
+
+
+def run_daemon() -> int:
+    return ConnexDaemon().run()
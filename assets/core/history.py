@@ -0,0 +1,423 @@
+import fcntl
+import glob
+import gzip
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from assets.utils.debug import log_debug, get_config, CONFIG_DIR, HISTORY_FILE
+
+HISTORY_DB = CONFIG_DIR / "history.db"
+ARCHIVE_DIR = CONFIG_DIR / "history-archive"
+SCHEMA_VERSION = 1
+
+# [HISTORY] defaults: rows older than rotate_days, or the oldest half once the
+# database passes max_db_kb, go to gzip segments; segments are deleted after
+# retention_days (0 keeps them forever)
+DEFAULT_ROTATE_DAYS = 30
+DEFAULT_RETENTION_DAYS = 365
+DEFAULT_MAX_DB_KB = 1024
+MAINTAIN_INTERVAL = 24 * 3600
+
+# AUTOINCREMENT: ids must never be reused once rows move to archives
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS connections (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts       REAL NOT NULL,
+    ssid     TEXT NOT NULL,
+    bssid    TEXT NOT NULL DEFAULT '',
+    signal   INTEGER,
+    outcome  TEXT NOT NULL,
+    error    TEXT NOT NULL DEFAULT '',
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS connections_ssid_ts ON connections (ssid, ts);
+CREATE INDEX IF NOT EXISTS connections_ts ON connections (ts);
+"""
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_FAILED = "failed"
+
+# "2024-05-01 10:00:00 | SUCCESS | ssid | Signal: 70% | Error: msg"
+LEGACY_LINE = re.compile(
+    r"^(?P<ts>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d) \| (?P<status>SUCCESS|FAILED) \| (?P<ssid>.*?)"
+    r" \| Signal: (?P<signal>-?\d+)%(?: \| Error: (?P<error>.*))?$"
+)
+
+
+# history-<first id>-<last id>-<oldest ts>-<newest ts>-<rows>.jsonl.gz; the name
+# alone answers unfiltered counts and tells which segments a filter can touch
+SEGMENT_NAME = re.compile(r"history-(\d+)-(\d+)-(\d+)-(\d+)-(\d+)\.jsonl\.gz$")
+# Segments never change once written, so decoded ones can be kept around
+SEGMENT_CACHE = 8
+# Touched after each maintenance run, shared by every connex process;
+# the lock file keeps two processes from rotating the same rows
+MAINTAIN_STAMP = ".maintained"
+MAINTAIN_LOCK = ".maintain.lock"
+
+
+@lru_cache(maxsize=SEGMENT_CACHE)
+def _load_segment(path) -> tuple:
+    try:
+        with gzip.open(path, "rt") as f:
+            return tuple(json.loads(line) for line in f if line.strip())
+    except (OSError, ValueError) as e:
+        log_debug(f"Unreadable history segment {path}: {e}")
+        return ()
+
+
+def _overlap(segment, ssid=None, since=None, until=None, outcome=None, search=None,
+             before_id=None, after_id=None) -> str:
+    # "none", "all" or "some" of the segment's rows can match the filters
+    first_id, last_id, oldest, newest = segment[:4]
+    if (before_id is not None and first_id >= before_id) or (after_id is not None and last_id <= after_id) \
+            or (since is not None and newest < since) or (until is not None and oldest >= until):
+        return "none"
+    if ssid is None and outcome is None and not search \
+            and (before_id is None or last_id < before_id) and (after_id is None or first_id > after_id) \
+            and (since is None or oldest >= since) and (until is None or newest < until):
+        return "all"
+    return "some"
+
+
+def _matches(record: Dict, ssid=None, since=None, until=None, outcome=None, search=None,
+             before_id=None, after_id=None) -> bool:
+    # Python twin of HistoryStore._where, for rows that live in archives
+    if ssid is not None and record['ssid'] != ssid:
+        return False
+    if since is not None and record['ts'] < since:
+        return False
+    if until is not None and record['ts'] >= until:
+        return False
+    if outcome is not None and record['outcome'] != outcome:
+        return False
+    if before_id is not None and record['id'] >= before_id:
+        return False
+    if after_id is not None and record['id'] <= after_id:
+        return False
+    if search:
+        needle = search.lower()
+        if not any(needle in (record.get(k) or "").lower() for k in ('ssid', 'error', 'bssid')):
+            return False
+    return True
+
+
+class HistoryStore:
+    def __init__(self, path=HISTORY_DB, archive_dir=ARCHIVE_DIR, rotate_days=DEFAULT_ROTATE_DAYS,
+                 retention_days=DEFAULT_RETENTION_DAYS, max_db_kb=DEFAULT_MAX_DB_KB):
+        self.path = Path(path)
+        self.archive_dir = Path(archive_dir)
+        self.rotate_days = rotate_days
+        self.retention_days = retention_days
+        self.max_db_kb = max_db_kb
+        self._stamp = self.archive_dir / MAINTAIN_STAMP
+        self._maintained = 0.0
+        self._maintaining = False
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One connection shared by the GTK thread and connect workers, serialized by _lock
+        self._db = sqlite3.connect(str(path), check_same_thread=False, timeout=5)
+        self._db.row_factory = sqlite3.Row
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+            self._db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._db.commit()
+
+    def add(self, ssid: str, signal: Optional[int], success: bool, error: str = "",
+            bssid: str = "", duration: Optional[float] = None, ts: Optional[float] = None) -> int:
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT INTO connections (ts, ssid, bssid, signal, outcome, error, duration) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (ts or time.time(), ssid, bssid or "", signal,
+                 OUTCOME_SUCCESS if success else OUTCOME_FAILED, error or "", duration)
+            )
+            self._db.commit()
+            record_id = cur.lastrowid
+        # Long-running trays only ever add, so maintenance piggybacks on that;
+        # off the caller's thread, since a rotation vacuums the database
+        if not self._maintaining and self._maintenance_due():
+            self._maintaining = True
+            threading.Thread(target=self._maintain_in_background, daemon=True).start()
+        return record_id
+
+    def _maintenance_due(self) -> bool:
+        # The stamp is re-read each time: another process may have just done it
+        try:
+            self._maintained = max(self._maintained, os.path.getmtime(self._stamp))
+        except OSError:
+            pass
+        return time.time() - self._maintained > MAINTAIN_INTERVAL
+
+    def _maintain_in_background(self):
+        try:
+            self.maintain(if_due=True)
+        except (sqlite3.Error, OSError) as e:
+            # Usually another connex process holding the database; retried next interval
+            log_debug(f"History maintenance failed: {e}")
+        finally:
+            self._maintaining = False
+
+    @staticmethod
+    def _where(ssid=None, since=None, until=None, outcome=None, search=None, before_id=None, after_id=None):
+        clauses, params = [], []
+        if ssid is not None:
+            clauses.append("ssid = ?")
+            params.append(ssid)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        if outcome is not None:
+            clauses.append("outcome = ?")
+            params.append(outcome)
+        if search:
+            # Plain substring like _matches; LIKE would treat _ and % as wildcards
+            clauses.append("(instr(lower(ssid), ?) > 0 OR instr(lower(error), ?) > 0 OR instr(lower(bssid), ?) > 0)")
+            params += [search.lower()] * 3
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        if after_id is not None:
+            clauses.append("id > ?")
+            params.append(after_id)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, limit: int = 100, **filters) -> List[Dict]:
+        # Newest first; pass the last id seen as before_id for the next page.
+        # Id order is time order: rows are appended, and the legacy import renumbers what it merges.
+        where, params = self._where(**filters)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT * FROM connections{where} ORDER BY id DESC LIMIT ?",
+                params + [limit]
+            ).fetchall()
+        records = [dict(r) for r in rows]
+        if len(records) < limit:
+            # Ran past the live table: keep paging into the rotated segments
+            before = records[-1]['id'] if records else filters.get('before_id')
+            records += self._query_archives(limit - len(records), dict(filters, before_id=before))
+        return records
+
+    def count(self, **filters) -> int:
+        where, params = self._where(**filters)
+        with self._lock:
+            live = self._db.execute(f"SELECT COUNT(*) FROM connections{where}", params).fetchone()[0]
+        archived = 0
+        for segment in self.segments():
+            overlap = _overlap(segment, **filters)
+            if overlap == "all":
+                archived += segment[4]
+            elif overlap == "some":
+                archived += sum(1 for record in _load_segment(segment[5]) if _matches(record, **filters))
+        return live + archived
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM connections")
+            self._db.commit()
+        for segment in self.segments():
+            os.remove(segment[5])
+
+    def segments(self) -> List[tuple]:
+        # (first_id, last_id, oldest_ts, newest_ts, rows, path), newest segment first
+        found = []
+        for path in glob.glob(str(self.archive_dir / "history-*.jsonl.gz")):
+            match = SEGMENT_NAME.search(path)
+            if match:
+                found.append(tuple(int(match[i]) for i in range(1, 6)) + (path,))
+        return sorted(found, reverse=True)
+
+    def _query_archives(self, limit, filters) -> List[Dict]:
+        records = []
+        for segment in self.segments():
+            if _overlap(segment, **filters) == "none":
+                continue
+            for record in reversed(_load_segment(segment[5])):
+                if _matches(record, **filters):
+                    records.append(dict(record))
+                    if len(records) >= limit:
+                        return records
+        return records
+
+    def _archive(self, rows: List[sqlite3.Row]):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        # Timestamps rounded outwards so the name's range always covers the rows
+        oldest = math.floor(min(r['ts'] for r in rows))
+        newest = math.ceil(max(r['ts'] for r in rows))
+        name = f"history-{rows[0]['id']}-{rows[-1]['id']}-{oldest}-{newest}-{len(rows)}.jsonl.gz"
+        tmp = self.archive_dir / f".{name}.tmp"
+        with gzip.open(tmp, "wt") as f:
+            for row in rows:
+                f.write(json.dumps(dict(row)) + "\n")
+        os.replace(tmp, self.archive_dir / name)
+        return name
+
+    def db_size_kb(self) -> float:
+        size = 0
+        for suffix in ("", "-wal"):
+            try:
+                size += os.path.getsize(f"{self.path}{suffix}")
+            except OSError:
+                pass
+        return size / 1024
+
+    def maintain(self, if_due: bool = False) -> bool:
+        # Rotate old rows (or the oldest half when over max_db_kb) into a gzip
+        # segment, compact the database, then drop segments past retention.
+        # False if another process is at it, or (if_due) did it recently.
+        os.makedirs(self.archive_dir, exist_ok=True)
+        with open(self.archive_dir / MAINTAIN_LOCK, "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            if if_due and not self._maintenance_due():
+                return False
+            now = self._maintained = time.time()
+            self._stamp.touch()
+            with self._lock:
+                cutoff_id = None
+                if self.rotate_days:
+                    row = self._db.execute(
+                        "SELECT MAX(id) FROM connections WHERE ts < ?", (now - self.rotate_days * 86400,)
+                    ).fetchone()
+                    cutoff_id = row[0]
+                if self.max_db_kb and self.db_size_kb() > self.max_db_kb:
+                    total = self._db.execute("SELECT COUNT(*) FROM connections").fetchone()[0]
+                    row = self._db.execute(
+                        "SELECT id FROM connections ORDER BY id LIMIT 1 OFFSET ?", (max(total // 2 - 1, 0),)
+                    ).fetchone()
+                    if row:
+                        cutoff_id = max(cutoff_id or 0, row[0])
+
+                if cutoff_id:
+                    rows = self._db.execute(
+                        "SELECT * FROM connections WHERE id <= ? ORDER BY id", (cutoff_id,)
+                    ).fetchall()
+                    if rows:
+                        name = self._archive(rows)
+                        self._db.execute("DELETE FROM connections WHERE id <= ?", (cutoff_id,))
+                        self._db.commit()
+                        self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                        self._db.execute("VACUUM")
+                        log_debug(f"Rotated {len(rows)} history entries into {name}")
+
+            if self.retention_days:
+                horizon = now - self.retention_days * 86400
+                for _, _, _, newest_ts, _, path in self.segments():
+                    if newest_ts < horizon:
+                        os.remove(path)
+                        log_debug(f"Dropped expired history segment {path}")
+        return True
+
+    def migrate_text_log(self, log_path=HISTORY_FILE) -> int:
+        # Import the old free-text history.log once, then move it aside. Renaming
+        # it to a name only this process knows claims it, so concurrent first
+        # runs (tray, connexd, CLI) can't import it twice.
+        claimed = f"{log_path}.migrating-{os.getpid()}"
+        try:
+            os.rename(log_path, claimed)
+        except OSError:
+            # Not there, or another process got it first
+            return 0
+
+        records = []
+        with open(claimed, errors="replace") as f:
+            for line in f:
+                match = LEGACY_LINE.match(line.rstrip("\n"))
+                if not match:
+                    continue
+                ts = datetime.strptime(match["ts"], "%Y-%m-%d %H:%M:%S").timestamp()
+                outcome = OUTCOME_SUCCESS if match["status"] == "SUCCESS" else OUTCOME_FAILED
+                records.append({'ts': ts, 'ssid': match["ssid"], 'bssid': "", 'signal': int(match["signal"]),
+                                'outcome': outcome, 'error': match["error"] or "", 'duration': None})
+
+        if records and self.segments():
+            # Archived ids are fixed, so older rows can't be slotted in before them
+            log_debug(f"History already rotated, not importing {log_path}")
+            records = []
+        if records:
+            try:
+                self._import(records)
+            except sqlite3.Error as e:
+                # Put it back for the next start to retry
+                log_debug(f"Migrating {log_path} failed: {e}")
+                try:
+                    os.rename(claimed, log_path)
+                except OSError:
+                    pass
+                return 0
+
+        try:
+            os.replace(claimed, f"{log_path}.migrated")
+        except OSError as e:
+            log_debug(f"Could not move {claimed} aside: {e}")
+        log_debug(f"Migrated {len(records)} entries from {log_path}")
+        return len(records)
+
+    def _import(self, records: List[Dict]):
+        # Ids follow time order (paging and rotation rely on it), so any rows
+        # already in the table are renumbered together with the imported ones
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                existing = [dict(r) for r in self._db.execute("SELECT * FROM connections")]
+                self._db.execute("DELETE FROM connections")
+                self._db.executemany(
+                    "INSERT INTO connections (ts, ssid, bssid, signal, outcome, error, duration) "
+                    "VALUES (:ts, :ssid, :bssid, :signal, :outcome, :error, :duration)",
+                    sorted(records + existing, key=lambda r: r['ts'])
+                )
+                self._db.commit()
+            except sqlite3.Error:
+                self._db.rollback()
+                raise
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def format_record(record: Dict) -> str:
+    # Same shape as the old history.log lines
+    stamp = datetime.fromtimestamp(record['ts']).strftime("%Y-%m-%d %H:%M:%S")
+    line = f"{stamp} | {record['outcome'].upper()} | {record['ssid']} | Signal: {record['signal'] or 0}%"
+    if record.get('duration') is not None:
+        line += f" | {record['duration']:.1f}s"
+    if record.get('error'):
+        line += f" | Error: {record['error']}"
+    return line
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_history() -> HistoryStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            config = get_config()
+            settings = {}
+            if config:
+                settings = {
+                    "rotate_days": config.getint('HISTORY', 'rotate_days', fallback=DEFAULT_ROTATE_DAYS),
+                    "retention_days": config.getint('HISTORY', 'retention_days', fallback=DEFAULT_RETENTION_DAYS),
+                    "max_db_kb": config.getint('HISTORY', 'max_db_kb', fallback=DEFAULT_MAX_DB_KB),
+                }
+            _store = HistoryStore(**settings)
+            _store.migrate_text_log()
+        return _store
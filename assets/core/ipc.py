@@ -0,0 +1,82 @@
+import os
+import stat
+from typing import Any, Optional
+
+from assets.utils.debug import log_debug
+
+# One JSON object per line each way:
+#   -> {"method": "networks", "params": {"rescan": false}}
+#   <- {"ok": true, "result": [...]}   or   {"ok": false, "error": "..."}
+
+
+def _private_dir(path: str) -> bool:
+    # Ours, a real directory (not a symlink) and closed to everyone else
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(info.st_mode) and info.st_uid == os.getuid() and not info.st_mode & 0o077
+
+
+def socket_path() -> Optional[str]:
+    # None if no safe place exists: in a shared /tmp another user could
+    # create the path first and pose as connexd
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and _private_dir(runtime):
+        return os.path.join(runtime, "connex.sock")
+
+    fallback = f"/tmp/connex-{os.getuid()}"
+    try:
+        os.mkdir(fallback, 0o700)
+    except FileExistsError:
+        pass
+    except OSError as e:
+        log_debug(f"Cannot create {fallback}: {e}")
+        return None
+    if not _private_dir(fallback):
+        log_debug(f"{fallback} is not a private directory owned by us, not using it")
+        return None
+    return os.path.join(fallback, "connex.sock")
+
+
+class DaemonClient:
+    def __init__(self, path: Optional[str] = None, timeout: float = 2.0):
+        self.path = path or socket_path()
+        self.timeout = timeout
+
+    def available(self) -> bool:
+        # Only talk to a socket our own user created
+        if not self.path:
+            return False
+        try:
+            return os.stat(self.path).st_uid == os.getuid()
+        except OSError:
+            return False
+
+    def request(self, method: str, timeout: Optional[float] = None, **params) -> Optional[Any]:
+        # None when no daemon answers (or it reported an error); callers then do the work locally
+        if not self.available():
+            return None
+        # Imported here: with no daemon running the CLI never needs them
+        import json
+        import socket
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout or self.timeout)
+                sock.connect(self.path)
+                sock.sendall(json.dumps({"method": method, "params": params}).encode() + b"\n")
+                with sock.makefile("rb") as reader:
+                    line = reader.readline()
+        except OSError as e:
+            log_debug(f"connexd unreachable: {e}")
+            return None
+
+        try:
+            reply = json.loads(line)
+        except ValueError:
+            log_debug(f"connexd sent garbage for {method}")
+            return None
+        if not reply.get("ok"):
+            log_debug(f"connexd {method} failed: {reply.get('error')}")
+            return None
+        return reply.get("result")
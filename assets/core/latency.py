@@ -0,0 +1,155 @@
+import errno
+import selectors
+import socket
+import statistics
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from assets.utils.debug import log_debug
+
+# Probes go out every INTERVAL to every target at once, without waiting for
+# the previous reply; one that takes longer than TIMEOUT counts as lost
+DEFAULT_SAMPLES = 20
+DEFAULT_INTERVAL = 0.1
+DEFAULT_TIMEOUT = 1.0
+DEFAULT_BUDGET = 3.0
+# Used when the system resolver is a local stub (systemd-resolved, dnsmasq)
+FALLBACK_DNS = "8.8.8.8"
+
+# A refused connection is a reply too: gateways rarely listen on anything
+REPLIED = (0, errno.ECONNREFUSED)
+
+
+def default_gateway() -> Optional[str]:
+    try:
+        with open("/proc/net/route") as f:
+            next(f)
+            for line in f:
+                fields = line.split()
+                # Destination 0.0.0.0 with RTF_GATEWAY set
+                if len(fields) > 3 and fields[1] == "00000000" and int(fields[3], 16) & 0x2:
+                    return socket.inet_ntoa(struct.pack("<L", int(fields[2], 16)))
+    except (OSError, ValueError, StopIteration):
+        pass
+    return None
+
+
+def dns_server() -> str:
+    try:
+        with open("/etc/resolv.conf") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) > 1 and fields[0] == "nameserver" and not fields[1].startswith("127."):
+                    return fields[1]
+    except OSError:
+        pass
+    return FALLBACK_DNS
+
+
+def latency_stats(rtts: List[float], sent: int) -> Dict:
+    # Jitter is the mean difference between consecutive round trips (RFC 3550 style)
+    if not rtts:
+        return {'min': 0.0, 'avg': 0.0, 'max': 0.0, 'jitter': 0.0,
+                'loss': 100.0 if sent else 0.0, 'samples': sent}
+    jitter = statistics.mean(abs(b - a) for a, b in zip(rtts, rtts[1:])) if len(rtts) > 1 else 0.0
+    return {
+        'min': round(min(rtts), 2),
+        'avg': round(statistics.mean(rtts), 2),
+        'max': round(max(rtts), 2),
+        'jitter': round(jitter, 2),
+        'loss': round((sent - len(rtts)) / sent * 100, 1) if sent else 0.0,
+        'samples': sent,
+    }
+
+
+class LatencyProbe:
+    # TCP connect round trips to several targets at once, from a single thread
+    def __init__(self, targets: Dict[str, Tuple[str, int]], interval: float = DEFAULT_INTERVAL,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.targets = {}
+        self.interval = interval
+        self.timeout = timeout
+        self.rtts: Dict[str, List[float]] = {}
+        self.sent: Dict[str, int] = {}
+        for name, (host, port) in targets.items():
+            # Resolved up front so DNS time never ends up in a sample
+            try:
+                family, _, _, _, address = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0]
+            except (OSError, IndexError) as e:
+                log_debug(f"Latency target {name} ({host}) unresolvable: {e}")
+                continue
+            self.targets[name] = (family, address)
+            self.rtts[name] = []
+            self.sent[name] = 0
+
+    def _send(self, name, selector, pending):
+        family, address = self.targets[name]
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        self.sent[name] += 1
+        start = time.perf_counter()
+        result = sock.connect_ex(address)
+        if result == errno.EINPROGRESS:
+            selector.register(sock, selectors.EVENT_WRITE)
+            pending[sock] = (name, start)
+            return
+        # Loopback and local refusals complete right away
+        if result in REPLIED:
+            self.rtts[name].append((time.perf_counter() - start) * 1000)
+        sock.close()
+
+    def run(self, samples: Optional[int] = DEFAULT_SAMPLES, budget: float = DEFAULT_BUDGET,
+            stop: Optional[threading.Event] = None) -> Dict[str, Dict]:
+        # Sends until every target has `samples` probes out (None: until stop is
+        # set), never past budget seconds; then waits out the stragglers
+        selector = selectors.DefaultSelector()
+        pending = {}
+        started = time.perf_counter()
+        next_send = started
+        sending = bool(self.targets)
+        try:
+            while sending or pending:
+                now = time.perf_counter()
+                if sending:
+                    if (stop and stop.is_set()) or now - started >= budget or \
+                            (samples is not None and all(n >= samples for n in self.sent.values())):
+                        sending = False
+                    elif now >= next_send:
+                        for name in self.targets:
+                            if samples is None or self.sent[name] < samples:
+                                self._send(name, selector, pending)
+                        next_send += self.interval
+
+                waits = [start + self.timeout - now for _, start in pending.values()]
+                if sending:
+                    waits.append(next_send - now)
+                timeout = max(min(waits), 0) if waits else 0
+                if pending:
+                    events = selector.select(timeout)
+                else:
+                    time.sleep(timeout)
+                    events = []
+                for key, _ in events:
+                    sock = key.fileobj
+                    name, start = pending.pop(sock)
+                    if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) in REPLIED:
+                        self.rtts[name].append((time.perf_counter() - start) * 1000)
+                    selector.unregister(sock)
+                    sock.close()
+
+                now = time.perf_counter()
+                for sock, (name, start) in list(pending.items()):
+                    if now - start > self.timeout:
+                        del pending[sock]
+                        selector.unregister(sock)
+                        sock.close()
+        finally:
+            for sock in pending:
+                sock.close()
+            selector.close()
+        return self.stats()
+
+    def stats(self) -> Dict[str, Dict]:
+        return {name: latency_stats(self.rtts[name], self.sent[name]) for name in self.targets}
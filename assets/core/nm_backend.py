@@ -0,0 +1,406 @@
+import importlib.util
+import os
+import subprocess
+import shlex
+import time
+from typing import List, Dict, Optional, Tuple
+from assets.utils.debug import log_debug, get_config
+from assets.core.nmcli_parser import (
+    WIFI_FIELDS, parse_wifi_list, parse_connections, parse_key_values,
+)
+
+# gi is imported on first use, so CLI runs that end up on nmcli never pay for it
+DBUS_AVAILABLE = importlib.util.find_spec("gi") is not None
+Gio = GLib = None
+
+
+def _load_gi():
+    global Gio, GLib
+    if Gio is None:
+        from gi.repository import Gio as _Gio, GLib as _GLib
+        Gio, GLib = _Gio, _GLib
+
+NM_BUS = "org.freedesktop.NetworkManager"
+NM_PATH = "/org/freedesktop/NetworkManager"
+NM_SETTINGS_PATH = "/org/freedesktop/NetworkManager/Settings"
+
+NM_IFACE = "org.freedesktop.NetworkManager"
+DEVICE_IFACE = "org.freedesktop.NetworkManager.Device"
+WIRELESS_IFACE = "org.freedesktop.NetworkManager.Device.Wireless"
+AP_IFACE = "org.freedesktop.NetworkManager.AccessPoint"
+ACTIVE_IFACE = "org.freedesktop.NetworkManager.Connection.Active"
+SETTINGS_IFACE = "org.freedesktop.NetworkManager.Settings"
+CONNECTION_IFACE = "org.freedesktop.NetworkManager.Settings.Connection"
+IP4_IFACE = "org.freedesktop.NetworkManager.IP4Config"
+PROPS_IFACE = "org.freedesktop.DBus.Properties"
+
+DEVICE_TYPE_WIFI = 2
+
+# NMState values that mean "some connectivity is up"
+NM_STATE_CONNECTED = (50, 60, 70)
+# NMConnectivityState, named like `nmcli general` prints them
+CONNECTIVITY_STATES = {0: "unknown", 1: "none", 2: "portal", 3: "limited", 4: "full"}
+
+DEVICE_STATES = {
+    10: "unmanaged", 20: "unavailable", 30: "disconnected", 40: "connecting (prepare)",
+    50: "connecting (configuring)", 60: "connecting (need authentication)",
+    70: "connecting (getting IP configuration)", 80: "connecting (checking IP connectivity)",
+    90: "connecting (starting secondary connections)", 100: "connected",
+    110: "deactivating", 120: "connection failed",
+}
+
+
+def security_from_flags(flags: int, wpa_flags: int, rsn_flags: int) -> str:
+    # Same wording nmcli uses in its SECURITY column
+    parts = []
+    if flags & 0x1 and not wpa_flags and not rsn_flags:
+        parts.append("WEP")
+    if wpa_flags:
+        parts.append("WPA1")
+    if rsn_flags & (0x100 | 0x200):
+        parts.append("WPA2")
+    if rsn_flags & 0x400:
+        parts.append("WPA3")
+    if rsn_flags & 0x800:
+        parts.append("OWE")
+    if (wpa_flags | rsn_flags) & 0x200:
+        parts.append("802.1X")
+    return " ".join(parts)
+
+
+def channel_from_freq(freq: int) -> int:
+    if freq == 2484:
+        return 14
+    if 2412 <= freq < 2484:
+        return (freq - 2407) // 5
+    if 5000 < freq < 5925:
+        return (freq - 5000) // 5
+    if 5950 <= freq <= 7125:
+        return (freq - 5950) // 5
+    return 0
+
+
+class NmcliBackend:
+    name = "nmcli"
+
+    @staticmethod
+    def run_cmd(cmd: str, timeout: int = 10) -> Tuple[int, str, str]:
+        try:
+            log_debug(f"Running: {cmd}")
+            res = subprocess.run(shlex.split(cmd), capture_output=True, text=True, timeout=timeout)
+            return res.returncode, res.stdout.strip(), res.stderr.strip()
+        except subprocess.TimeoutExpired:
+            return 1, "", "Command timed out"
+        except Exception as e:
+            return 1, "", str(e)
+
+    def is_connected(self) -> bool:
+        code, out, err = self.run_cmd("nmcli -t -f STATE general")
+        return code == 0 and out.strip().startswith("connected")
+
+    def connectivity(self) -> str:
+        code, out, err = self.run_cmd("nmcli -t -f CONNECTIVITY general")
+        return out.strip() if code == 0 and out.strip() else "unknown"
+
+    def wifi_enabled(self) -> bool:
+        code, out, err = self.run_cmd("nmcli radio wifi")
+        return "enabled" in out.lower()
+
+    def set_wifi_enabled(self, enabled: bool) -> Tuple[bool, str]:
+        code, out, err = self.run_cmd(f"nmcli radio wifi {'on' if enabled else 'off'}")
+        return code == 0, err or out
+
+    def request_scan(self) -> bool:
+        code, out, err = self.run_cmd("nmcli device wifi rescan", timeout=5)
+        return code == 0
+
+    def last_scan_age(self) -> Optional[float]:
+        # nmcli does not expose LastScan
+        return None
+
+    def get_wifi_networks(self) -> Optional[List[Dict]]:
+        code, out, err = self.run_cmd(f"nmcli -t -f {','.join(WIFI_FIELDS)} device wifi list")
+        if code != 0:
+            log_debug(f"Wi-Fi list failed: {err}")
+            return None
+        return parse_wifi_list(out)
+
+    def get_active_connections(self) -> List[Dict[str, str]]:
+        code, out, err = self.run_cmd("nmcli -t -f NAME,TYPE,UUID,DEVICE connection show --active")
+        return parse_connections(out) if code == 0 else []
+
+    def get_connections(self) -> List[Dict[str, str]]:
+        code, out, err = self.run_cmd("nmcli -t -f NAME,TYPE,UUID,DEVICE connection show")
+        return parse_connections(out) if code == 0 else []
+
+    def device_show(self) -> Optional[List[Tuple[str, str]]]:
+        code, out, err = self.run_cmd("nmcli -t -f GENERAL,IP4 device show")
+        if code != 0:
+            return None
+        return parse_key_values(out)
+
+    def deactivate_connection(self, name: str) -> Tuple[bool, str]:
+        code, out, err = self.run_cmd(f"nmcli connection down {shlex.quote(name)}")
+        return code == 0, err or out
+
+    def delete_connection(self, name: str) -> Tuple[bool, str]:
+        code, out, err = self.run_cmd(f"nmcli connection delete {shlex.quote(name)}")
+        return code == 0, err or out
+
+
+class DBusBackend:
+    name = "dbus"
+
+    def __init__(self, bus=None):
+        _load_gi()
+        self.bus = bus or Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+
+    def _call(self, path, iface, method, args=None, reply=None, timeout=5000):
+        result = self.bus.call_sync(
+            NM_BUS, path, iface, method, args,
+            GLib.VariantType.new(reply) if reply else None,
+            Gio.DBusCallFlags.NONE, timeout, None
+        )
+        return result.unpack() if result is not None else ()
+
+    def _props(self, path: str, iface: str) -> Dict:
+        return self._call(path, PROPS_IFACE, "GetAll", GLib.Variant("(s)", (iface,)), "(a{sv})")[0]
+
+    def _prop(self, path: str, iface: str, name: str):
+        return self._call(path, PROPS_IFACE, "Get", GLib.Variant("(ss)", (iface, name)), "(v)")[0]
+
+    def _wifi_devices(self) -> List[str]:
+        devices = self._call(NM_PATH, NM_IFACE, "GetDevices", reply="(ao)")[0]
+        return [d for d in devices if self._prop(d, DEVICE_IFACE, "DeviceType") == DEVICE_TYPE_WIFI]
+
+    def is_connected(self) -> bool:
+        try:
+            return self._prop(NM_PATH, NM_IFACE, "State") in NM_STATE_CONNECTED
+        except GLib.Error as e:
+            log_debug(f"D-Bus State failed: {e}")
+            return False
+
+    def connectivity(self) -> str:
+        try:
+            return CONNECTIVITY_STATES.get(self._prop(NM_PATH, NM_IFACE, "Connectivity"), "unknown")
+        except GLib.Error as e:
+            log_debug(f"D-Bus Connectivity failed: {e}")
+            return "unknown"
+
+    def wifi_enabled(self) -> bool:
+        try:
+            return bool(self._prop(NM_PATH, NM_IFACE, "WirelessEnabled"))
+        except GLib.Error as e:
+            log_debug(f"D-Bus WirelessEnabled failed: {e}")
+            return False
+
+    def set_wifi_enabled(self, enabled: bool) -> Tuple[bool, str]:
+        try:
+            self._call(NM_PATH, PROPS_IFACE, "Set",
+                       GLib.Variant("(ssv)", (NM_IFACE, "WirelessEnabled", GLib.Variant("b", enabled))))
+            return True, ""
+        except GLib.Error as e:
+            return False, e.message
+
+    def request_scan(self) -> bool:
+        ok = False
+        try:
+            for dev in self._wifi_devices():
+                try:
+                    self._call(dev, WIRELESS_IFACE, "RequestScan", GLib.Variant("(a{sv})", ({},)))
+                    ok = True
+                except GLib.Error as e:
+                    # NM refuses scans that come too close together
+                    log_debug(f"RequestScan on {dev} refused: {e.message}")
+        except GLib.Error as e:
+            log_debug(f"D-Bus rescan failed: {e}")
+        return ok
+
+    def last_scan_age(self) -> Optional[float]:
+        # LastScan is CLOCK_BOOTTIME in ms, -1 when the device never scanned
+        try:
+            stamps = [self._prop(d, WIRELESS_IFACE, "LastScan") for d in self._wifi_devices()]
+        except GLib.Error as e:
+            log_debug(f"D-Bus LastScan failed: {e}")
+            return None
+        stamps = [s for s in stamps if s >= 0]
+        if not stamps:
+            return float("inf")
+        return max(0.0, time.clock_gettime(time.CLOCK_BOOTTIME) - max(stamps) / 1000)
+
+    def get_wifi_networks(self) -> Optional[List[Dict]]:
+        try:
+            networks = []
+            for dev in self._wifi_devices():
+                wireless = self._props(dev, WIRELESS_IFACE)
+                active_ap = wireless.get("ActiveAccessPoint", "/")
+                for ap in wireless.get("AccessPoints", []):
+                    try:
+                        props = self._props(ap, AP_IFACE)
+                    except GLib.Error:
+                        # AP vanished between listing and reading it
+                        continue
+                    freq = props.get("Frequency", 0)
+                    networks.append({
+                        'ssid': bytes(props.get("Ssid", [])).decode("utf-8", "replace"),
+                        'bssid': props.get("HwAddress", ""),
+                        'chan': channel_from_freq(freq),
+                        'freq': freq,
+                        'rate': props.get("MaxBitrate", 0) // 1000,
+                        'signal': int(props.get("Strength", 0)),
+                        'security': security_from_flags(
+                            props.get("Flags", 0), props.get("WpaFlags", 0), props.get("RsnFlags", 0)
+                        ),
+                        'in_use': ap == active_ap,
+                    })
+            networks.sort(key=lambda n: n['signal'], reverse=True)
+            return networks
+        except GLib.Error as e:
+            log_debug(f"D-Bus Wi-Fi list failed: {e}")
+            return None
+
+    def _active_paths(self) -> List[str]:
+        return self._prop(NM_PATH, NM_IFACE, "ActiveConnections")
+
+    def _device_name(self, path: str) -> str:
+        return self._prop(path, DEVICE_IFACE, "Interface")
+
+    def get_active_connections(self) -> List[Dict[str, str]]:
+        connections = []
+        try:
+            for path in self._active_paths():
+                try:
+                    props = self._props(path, ACTIVE_IFACE)
+                except GLib.Error:
+                    continue
+                devices = props.get("Devices", [])
+                connections.append({
+                    'name': props.get("Id", ""),
+                    'type': props.get("Type", ""),
+                    'uuid': props.get("Uuid", ""),
+                    'device': self._device_name(devices[0]) if devices else '',
+                    'path': path,
+                })
+        except GLib.Error as e:
+            log_debug(f"D-Bus active connections failed: {e}")
+        return connections
+
+    def get_connections(self) -> List[Dict[str, str]]:
+        active = {c['uuid']: c['device'] for c in self.get_active_connections()}
+        connections = []
+        try:
+            paths = self._call(NM_SETTINGS_PATH, SETTINGS_IFACE, "ListConnections", reply="(ao)")[0]
+            for path in paths:
+                try:
+                    settings = self._call(path, CONNECTION_IFACE, "GetSettings", reply="(a{sa{sv}})")[0]
+                except GLib.Error:
+                    continue
+                conn = settings.get("connection", {})
+                uuid = conn.get("uuid", "")
+                connections.append({
+                    'name': conn.get("id", ""),
+                    'type': conn.get("type", ""),
+                    'uuid': uuid,
+                    'device': active.get(uuid, ''),
+                    'path': path,
+                })
+        except GLib.Error as e:
+            log_debug(f"D-Bus connection list failed: {e}")
+        return connections
+
+    def device_show(self) -> Optional[List[Tuple[str, str]]]:
+        try:
+            devices = self._call(NM_PATH, NM_IFACE, "GetDevices", reply="(ao)")[0]
+        except GLib.Error as e:
+            log_debug(f"D-Bus GetDevices failed: {e}")
+            return None
+
+        rows = []
+        for dev in devices:
+            try:
+                props = self._props(dev, DEVICE_IFACE)
+            except GLib.Error:
+                continue
+            state = props.get("State", 0)
+            connection = ""
+            active = props.get("ActiveConnection", "/")
+            if active != "/":
+                try:
+                    connection = self._prop(active, ACTIVE_IFACE, "Id")
+                except GLib.Error:
+                    pass
+            rows.append(("GENERAL.DEVICE", props.get("Interface", "")))
+            rows.append(("GENERAL.STATE", f"{state} ({DEVICE_STATES.get(state, 'unknown')})"))
+            rows.append(("GENERAL.CONNECTION", connection))
+
+            ip4 = props.get("Ip4Config", "/")
+            if ip4 == "/":
+                continue
+            try:
+                ip_props = self._props(ip4, IP4_IFACE)
+            except GLib.Error:
+                continue
+            for i, addr in enumerate(ip_props.get("AddressData", []), 1):
+                rows.append((f"IP4.ADDRESS[{i}]", f"{addr.get('address')}/{addr.get('prefix')}"))
+            rows.append(("IP4.GATEWAY", ip_props.get("Gateway", "")))
+            for i, dns in enumerate(ip_props.get("NameserverData", []), 1):
+                rows.append((f"IP4.DNS[{i}]", dns.get("address", "")))
+        return rows
+
+    def deactivate_connection(self, name: str) -> Tuple[bool, str]:
+        for conn in self.get_active_connections():
+            if conn['name'] == name:
+                try:
+                    self._call(NM_PATH, NM_IFACE, "DeactivateConnection",
+                               GLib.Variant("(o)", (conn['path'],)))
+                    return True, ""
+                except GLib.Error as e:
+                    return False, e.message
+        return False, f"'{name}' is not an active connection"
+
+    def delete_connection(self, name: str) -> Tuple[bool, str]:
+        for conn in self.get_connections():
+            if conn['name'] == name:
+                try:
+                    self._call(conn['path'], CONNECTION_IFACE, "Delete")
+                    return True, ""
+                except GLib.Error as e:
+                    return False, e.message
+        return False, f"Connection '{name}' not found"
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is not None:
+        return _backend
+
+    # CONNEX_BACKEND overrides the config, e.g. to pin benchmarks to a stub nmcli
+    config = get_config()
+    choice = os.environ.get("CONNEX_BACKEND") or (
+        config.get('GENERAL', 'backend', fallback='auto') if config else 'auto')
+    if DBUS_AVAILABLE and choice != 'nmcli':
+        try:
+            _load_gi()
+        except (ImportError, ValueError) as e:
+            log_debug(f"PyGObject unusable, falling back to nmcli: {e}")
+            choice = 'nmcli'
+    if DBUS_AVAILABLE and choice != 'nmcli':
+        try:
+            bus = Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+            owner = bus.call_sync(
+                "org.freedesktop.DBus", "/org/freedesktop/DBus", "org.freedesktop.DBus",
+                "NameHasOwner", GLib.Variant("(s)", (NM_BUS,)), GLib.VariantType.new("(b)"),
+                Gio.DBusCallFlags.NONE, 1000, None
+            ).unpack()[0]
+            if owner:
+                _backend = DBusBackend(bus)
+        except GLib.Error as e:
+            log_debug(f"NetworkManager D-Bus unavailable: {e}")
+
+    if _backend is None:
+        _backend = NmcliBackend()
+    log_debug(f"Using {_backend.name} backend")
+    return _backend
@@ -0,0 +1,286 @@
+import os
+import re
+import shutil
+import subprocess
+from typing import Callable, Dict, Optional
+from assets.utils.debug import log_debug
+from assets.core.nm_backend import (
+    DBUS_AVAILABLE, get_backend,
+    NM_BUS, NM_IFACE, DEVICE_IFACE, WIRELESS_IFACE, AP_IFACE,
+    ACTIVE_IFACE, SETTINGS_IFACE, PROPS_IFACE,
+)
+
+Gio = GLib = None
+
+
+def _load_gi():
+    # Raises ImportError/ValueError when PyGObject is installed but unusable
+    global Gio, GLib
+    if Gio is None:
+        from gi.repository import Gio as _Gio, GLib as _GLib
+        Gio, GLib = _Gio, _GLib
+
+# Topics views can subscribe to:
+#   state              - global/device state, active access point
+#   access-points      - APs appeared, disappeared or changed strength
+#   active-connections - something was activated or deactivated
+#   connections        - saved profiles were added or removed
+#   radio              - Wi-Fi radio switched on/off
+TOPICS = ("state", "access-points", "active-connections", "connections", "radio")
+
+# (interface, member) -> topic for plain signals
+SIGNAL_TOPICS = {
+    (NM_IFACE, "StateChanged"): "state",
+    (DEVICE_IFACE, "StateChanged"): "state",
+    (WIRELESS_IFACE, "AccessPointAdded"): "access-points",
+    (WIRELESS_IFACE, "AccessPointRemoved"): "access-points",
+    (ACTIVE_IFACE, "StateChanged"): "active-connections",
+    (SETTINGS_IFACE, "NewConnection"): "connections",
+    (SETTINGS_IFACE, "ConnectionRemoved"): "connections",
+}
+
+# (interface, property) -> topic for PropertiesChanged
+PROPERTY_TOPICS = {
+    (NM_IFACE, "State"): "state",
+    (NM_IFACE, "Connectivity"): "state",
+    (NM_IFACE, "ActiveConnections"): "active-connections",
+    (NM_IFACE, "WirelessEnabled"): "radio",
+    (WIRELESS_IFACE, "ActiveAccessPoint"): "state",
+    (WIRELESS_IFACE, "LastScan"): "access-points",
+    (AP_IFACE, "Strength"): "access-points",
+    (ACTIVE_IFACE, "State"): "active-connections",
+}
+
+# Bursts (a scan touches every AP) are folded into one callback per window
+DEBOUNCE_MS = {
+    "state": 200,
+    "access-points": 1500,
+    "active-connections": 300,
+    "connections": 300,
+    "radio": 200,
+}
+
+
+class EventMonitor:
+    # Topics this source can actually report; views keep polling for the rest
+    provides = frozenset(TOPICS)
+
+    def __init__(self):
+        self._subscribers: Dict[str, Dict[int, Callable]] = {t: {} for t in TOPICS}
+        self._pending: Dict[str, int] = {}
+        self._next_id = 1
+
+    def subscribe(self, topic: str, callback: Callable) -> int:
+        if topic not in self._subscribers:
+            raise ValueError(f"Unknown topic: {topic}")
+        handle = self._next_id
+        self._next_id += 1
+        self._subscribers[topic][handle] = callback
+        return handle
+
+    def unsubscribe(self, handle: int):
+        for subs in self._subscribers.values():
+            subs.pop(handle, None)
+
+    def emit(self, topic: str):
+        if topic in self._pending or not self._subscribers.get(topic):
+            return
+        self._pending[topic] = GLib.timeout_add(DEBOUNCE_MS.get(topic, 200), self._dispatch, topic)
+
+    def _dispatch(self, topic):
+        self._pending.pop(topic, None)
+        log_debug(f"NM event: {topic}")
+        for callback in list(self._subscribers[topic].values()):
+            try:
+                callback()
+            except Exception as e:
+                log_debug(f"Event handler for {topic} failed: {e}")
+        return False
+
+    def close(self):
+        for source in self._pending.values():
+            GLib.source_remove(source)
+        self._pending.clear()
+
+
+class NMEventMonitor(EventMonitor):
+    def __init__(self, bus):
+        super().__init__()
+        self.bus = bus
+        self._signal_ids = []
+
+        for iface, member in SIGNAL_TOPICS:
+            self._watch(iface, member)
+        self._watch(PROPS_IFACE, "PropertiesChanged")
+
+    def _watch(self, iface, member):
+        sid = self.bus.signal_subscribe(
+            NM_BUS, iface, member, None, None,
+            Gio.DBusSignalFlags.NONE, self._on_signal, None
+        )
+        self._signal_ids.append(sid)
+
+    def _on_signal(self, conn, sender, path, iface, member, params, user_data):
+        if member == "PropertiesChanged":
+            changed_iface, changed, _ = params.unpack()
+            for prop in changed:
+                topic = PROPERTY_TOPICS.get((changed_iface, prop))
+                if topic:
+                    self.emit(topic)
+            return
+
+        topic = SIGNAL_TOPICS.get((iface, member))
+        if topic:
+            self.emit(topic)
+
+    def close(self):
+        for sid in self._signal_ids:
+            self.bus.signal_unsubscribe(sid)
+        self._signal_ids = []
+        super().close()
+
+
+# `nmcli monitor` line shapes -> (dedup key group, topics)
+MONITOR_PATTERNS = [
+    (re.compile(r"^NetworkManager is now in the '(?P<value>[^']*)' state"), "nm-state", ("state",)),
+    (re.compile(r"^Connectivity is now '(?P<value>[^']*)'"), "connectivity", ("state",)),
+    (re.compile(r"^'(?P<value>.*)' is now the primary connection"), "primary", ("active-connections",)),
+    (re.compile(r"^There's no primary connection(?P<value>)"), "primary", ("active-connections",)),
+    (re.compile(r"^(?i:wi-?fi)\b.*\b(?P<value>enabled|disabled)"), "radio", ("radio",)),
+    (re.compile(r"^(?P<key>.+?): connection profile (?P<value>created|removed|changed)"), None, ("connections",)),
+    (re.compile(r"^(?P<key>[^:\s]+): using connection '(?P<value>.*)'"), None, ("active-connections",)),
+    (re.compile(r"^(?P<key>[^:\s]+): (?P<value>unavailable)$"), None, ("state", "radio")),
+    (re.compile(r"^(?P<key>[^:\s]+): (?P<value>.+)$"), None, ("state", "active-connections")),
+]
+
+
+class NmcliMonitor(EventMonitor):
+    # nmcli monitor says nothing about access points, so scans stay on timers
+    provides = frozenset(("state", "active-connections", "connections", "radio"))
+
+    RESPAWN_MIN_MS = 1000
+    RESPAWN_MAX_MS = 60000
+
+    def __init__(self):
+        super().__init__()
+        self.proc = None
+        self._watch_id = None
+        self._buffer = b""
+        self._last: Dict[str, str] = {}
+        self._respawn_ms = self.RESPAWN_MIN_MS
+        self._respawn_id = None
+        self._closed = False
+        self._spawn()
+
+    def _spawn(self):
+        self._respawn_id = None
+        if self._closed:
+            return False
+        try:
+            self.proc = subprocess.Popen(
+                ["nmcli", "monitor"],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                env=dict(os.environ, LC_ALL="C")
+            )
+        except OSError as e:
+            log_debug(f"Could not start nmcli monitor: {e}")
+            self._schedule_respawn()
+            return False
+
+        fd = self.proc.stdout.fileno()
+        os.set_blocking(fd, False)
+        self._buffer = b""
+        self._watch_id = GLib.io_add_watch(
+            fd, GLib.PRIORITY_DEFAULT, GLib.IO_IN | GLib.IO_HUP | GLib.IO_ERR, self._on_readable
+        )
+        log_debug(f"nmcli monitor started (pid {self.proc.pid})")
+        return False
+
+    def _on_readable(self, fd, condition):
+        try:
+            chunk = os.read(fd, 4096)
+        except BlockingIOError:
+            return True
+        except OSError:
+            chunk = b""
+
+        if not chunk:
+            self._on_exit()
+            return False
+
+        self._respawn_ms = self.RESPAWN_MIN_MS
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split(b"\n")
+        for line in lines:
+            self.feed_line(line.decode("utf-8", "replace").strip())
+        return True
+
+    def feed_line(self, line: str):
+        if not line:
+            return
+        for pattern, group, topics in MONITOR_PATTERNS:
+            match = pattern.match(line)
+            if not match:
+                continue
+            # Only wake views when the reported value differs from last time
+            key = group or match.groupdict().get("key") or line
+            value = match.group("value")
+            if self._last.get(key) == value:
+                return
+            self._last[key] = value
+            for topic in topics:
+                self.emit(topic)
+            return
+
+    def _on_exit(self):
+        self._watch_id = None
+        if self.proc:
+            self.proc.stdout.close()
+            self.proc.wait()
+            log_debug(f"nmcli monitor exited with {self.proc.returncode}")
+            self.proc = None
+        if not self._closed:
+            self._schedule_respawn()
+
+    def _schedule_respawn(self):
+        self._respawn_id = GLib.timeout_add(self._respawn_ms, self._spawn)
+        self._respawn_ms = min(self._respawn_ms * 2, self.RESPAWN_MAX_MS)
+
+    def close(self):
+        self._closed = True
+        if self._respawn_id:
+            GLib.source_remove(self._respawn_id)
+            self._respawn_id = None
+        if self._watch_id:
+            GLib.source_remove(self._watch_id)
+            self._watch_id = None
+        if self.proc:
+            self.proc.terminate()
+            self.proc.wait()
+            self.proc = None
+        super().close()
+
+
+_monitor = None
+
+
+def get_event_monitor() -> Optional[EventMonitor]:
+    # D-Bus signals first, a long-lived `nmcli monitor` otherwise;
+    # callers fall back to timers on None or for topics not in .provides
+    global _monitor
+    if _monitor is None and DBUS_AVAILABLE:
+        try:
+            _load_gi()
+        except (ImportError, ValueError) as e:
+            # Both monitors dispatch through the GLib main loop
+            log_debug(f"PyGObject unusable, no event monitor: {e}")
+            return None
+        backend = get_backend()
+        if backend.name == "dbus":
+            try:
+                _monitor = NMEventMonitor(backend.bus)
+            except GLib.Error as e:
+                log_debug(f"NetworkManager signals unavailable, using nmcli monitor: {e}")
+        if _monitor is None and shutil.which("nmcli"):
+            _monitor = NmcliMonitor()
+    return _monitor
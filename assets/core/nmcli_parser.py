@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# Field order passed to `nmcli -t -f ... device wifi list`
+WIFI_FIELDS = ("IN-USE", "BSSID", "SSID", "CHAN", "FREQ", "RATE", "SIGNAL", "SECURITY")
+CONNECTION_FIELDS = ("NAME", "TYPE", "UUID", "DEVICE")
+
+
+def split_terse(line: str, maxsplit: int = -1) -> List[str]:
+    # nmcli -t escapes ':' as '\:' and '\' as '\\' inside values. Swap the
+    # escapes for control chars so the split itself stays in C.
+    if "\\" not in line:
+        return line.split(":", maxsplit)
+    line = line.replace("\\\\", "\x00").replace("\\:", "\x01")
+    return [
+        f.replace("\x01", ":").replace("\x00", "\\")
+        for f in line.split(":", maxsplit)
+    ]
+
+
+def parse_terse(out: str, fields: Sequence[str]) -> List[Dict[str, str]]:
+    rows = []
+    count = len(fields)
+    for line in out.splitlines():
+        if not line.strip():
+            continue
+        parts = split_terse(line)
+        if len(parts) < count:
+            parts += [""] * (count - len(parts))
+        rows.append(dict(zip(fields, parts)))
+    return rows
+
+
+def _leading_int(value: str) -> int:
+    # "2437 MHz", "130 Mbit/s", "78"
+    digits = value.split(" ", 1)[0]
+    return int(digits) if digits.isdigit() else 0
+
+
+def parse_wifi_list(out: str) -> List[Dict]:
+    # Expects WIFI_FIELDS order; indexes parts directly since this runs per AP
+    aps = []
+    count = len(WIFI_FIELDS)
+    for line in out.splitlines():
+        if not line.strip():
+            continue
+        parts = split_terse(line)
+        if len(parts) < count:
+            parts += [""] * (count - len(parts))
+        in_use, bssid, ssid, chan, freq, rate, signal, security = parts[:count]
+        aps.append({
+            'ssid': ssid,
+            'bssid': bssid,
+            'chan': _leading_int(chan),
+            'freq': _leading_int(freq),
+            'rate': _leading_int(rate),
+            'signal': _leading_int(signal),
+            'security': "" if security == "--" else security,
+            'in_use': in_use == "*",
+        })
+    return aps
+
+
+def parse_connections(out: str) -> List[Dict[str, str]]:
+    return [
+        {'name': r["NAME"], 'type': r["TYPE"], 'uuid': r["UUID"], 'device': r["DEVICE"]}
+        for r in parse_terse(out, CONNECTION_FIELDS)
+        if r["TYPE"]
+    ]
+
+
+def parse_key_values(out: str) -> List[tuple]:
+    # Multi-line terse output: "IP4.ADDRESS[1]:10.0.0.2/24"
+    rows = []
+    for line in out.splitlines():
+        parts = split_terse(line, 1)
+        if len(parts) == 2:
+            rows.append((parts[0], parts[1]))
+    return rows
+
+
+def get_value(out: str, key: Optional[str] = None) -> str:
+    # `nmcli -t -f IP4.ADDRESS connection show x` -> value of the first matching key
+    for k, v in parse_key_values(out):
+        if key is None or k.startswith(key):
+            return v
+    return ""
+
+
+def group_by_ssid(aps: Iterable[Dict]) -> List[Dict]:
+    # One entry per SSID carrying its strongest AP, in a single pass
+    networks: Dict[str, Dict] = {}
+    for ap in aps:
+        net = networks.get(ap['ssid'])
+        if net is None:
+            net = dict(ap)
+            net['aps'] = [ap]
+            networks[ap['ssid']] = net
+            continue
+        net['aps'].append(ap)
+        in_use = net['in_use'] or ap['in_use']
+        if ap['signal'] > net['signal']:
+            aps_list = net['aps']
+            net.update(ap)
+            net['aps'] = aps_list
+        net['in_use'] = in_use
+
+    result = list(networks.values())
+    for net in result:
+        net['aps'].sort(key=lambda a: a['signal'], reverse=True)
+    result.sort(key=lambda n: n['signal'], reverse=True)
+    return result
@@ -0,0 +1,101 @@
+import threading
+import time
+from typing import Optional
+
+from assets.utils.debug import log_debug, get_config
+from assets.core.nm_backend import get_backend
+
+DEFAULT_MIN_INTERVAL = 10
+# How long to wait for NM to finish a scan before reading results anyway
+SCAN_TIMEOUT = 10
+SCAN_POLL = 0.5
+# nmcli has no LastScan to watch, give the radio a moment instead
+NMCLI_SETTLE = 3
+
+
+class RescanScheduler:
+    def __init__(self, min_interval: float = DEFAULT_MIN_INTERVAL, backend=None):
+        self.min_interval = min_interval
+        self.backend = backend or get_backend()
+        self._lock = threading.Lock()
+        self._inflight: Optional[threading.Event] = None
+        self._last_request = 0.0
+        self._last_done = 0.0
+        self.scans = 0
+        self.skipped = 0
+
+    @property
+    def scanning(self) -> bool:
+        return self._inflight is not None
+
+    def last_scan_age(self) -> float:
+        # Prefer NM's own LastScan: it also counts scans other clients triggered
+        age = self.backend.last_scan_age()
+        if age is None:
+            age = time.monotonic() - self._last_done if self._last_done else float("inf")
+        return age
+
+    def is_fresh(self, max_age: Optional[float] = None) -> bool:
+        return self.last_scan_age() < (self.min_interval if max_age is None else max_age)
+
+    def scan(self, max_age: Optional[float] = None) -> bool:
+        # Blocking, call from a worker. Returns True once a scan has completed,
+        # False if recent results were good enough and no scan was requested.
+        with self._lock:
+            event = self._inflight
+            owner = event is None
+            if owner:
+                recent = time.monotonic() - self._last_request < self.min_interval
+                if recent or self.is_fresh(max_age):
+                    self.skipped += 1
+                    log_debug("Rescan skipped, results are fresh enough")
+                    return False
+                event = self._inflight = threading.Event()
+                self._last_request = time.monotonic()
+
+        if not owner:
+            # Someone else's scan is running, wait for it instead of queueing another
+            event.wait(SCAN_TIMEOUT + NMCLI_SETTLE)
+            return True
+
+        try:
+            self._run_scan()
+        finally:
+            with self._lock:
+                self._inflight = None
+            event.set()
+        return True
+
+    def _run_scan(self):
+        before = self.backend.last_scan_age()
+        started = time.monotonic()
+        if not self.backend.request_scan():
+            # NM refuses scans right after the previous one; those results still count
+            log_debug("Rescan request rejected")
+            return
+
+        self.scans += 1
+        if before is None:
+            time.sleep(NMCLI_SETTLE)
+        else:
+            # LastScan moves once the new results are in
+            while time.monotonic() - started < SCAN_TIMEOUT:
+                time.sleep(SCAN_POLL)
+                age = self.backend.last_scan_age()
+                if age is not None and age < time.monotonic() - started:
+                    break
+        self._last_done = time.monotonic()
+        log_debug(f"Rescan finished in {self._last_done - started:.1f}s")
+
+
+_scheduler = None
+
+
+def get_rescan_scheduler() -> RescanScheduler:
+    global _scheduler
+    if _scheduler is None:
+        config = get_config()
+        interval = (config.getfloat('SCAN', 'min_rescan_interval', fallback=DEFAULT_MIN_INTERVAL)
+                    if config else DEFAULT_MIN_INTERVAL)
+        _scheduler = RescanScheduler(min_interval=interval)
+    return _scheduler
@@ -0,0 +1,127 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from gi.repository import GLib
+
+from assets.utils.debug import log_debug, get_config
+from assets.core.nm_backend import get_backend
+from assets.core.nm_events import get_event_monitor
+from assets.core.rescan import get_rescan_scheduler
+from assets.core.ipc import DaemonClient
+
+DEFAULT_TTL = 10
+
+
+class ScanCache:
+    def __init__(self, ttl: float = DEFAULT_TTL, backend=None, remote: Optional[DaemonClient] = None):
+        self.ttl = ttl
+        self.backend = backend or get_backend()
+        # A running connexd owns scanning; frontends read its cache through this
+        self.remote = remote
+        self.rescans = get_rescan_scheduler()
+        self._networks: Optional[List[Dict]] = None
+        self._time = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._rescan_pending = False
+        self._listeners: List[Callable] = []
+
+        events = get_event_monitor()
+        if events:
+            # NM already scanned; just re-read the list for everybody
+            events.subscribe("access-points", self.refresh)
+            events.subscribe("active-connections", self.refresh)
+
+    @property
+    def refreshing(self) -> bool:
+        return self._refreshing
+
+    def age(self) -> float:
+        return time.monotonic() - self._time if self._time else float("inf")
+
+    def is_fresh(self) -> bool:
+        return self.age() < self.ttl
+
+    def peek(self) -> Optional[List[Dict]]:
+        return self._networks
+
+    def get(self, rescan: bool = False) -> Optional[List[Dict]]:
+        # Stale-while-revalidate: hand back what we have right away and let
+        # listeners pick up the new list when the background refresh lands.
+        if rescan or not self.is_fresh():
+            self.refresh(rescan=rescan)
+        return self._networks
+
+    def refresh(self, rescan: bool = False):
+        with self._lock:
+            if self._refreshing:
+                # Piggyback on the scan already running
+                self._rescan_pending |= rescan
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_thread, args=(rescan,), daemon=True).start()
+
+    def load(self, rescan: bool = False) -> Optional[List[Dict]]:
+        # Blocking refresh without notifying listeners; call from a worker
+        networks = None
+        if self.remote:
+            networks = self.remote.request("networks", rescan=rescan, timeout=15 if rescan else None)
+        if networks is None:
+            if rescan:
+                # Coalesced and rate limited; a no-op when NM scanned recently
+                self.rescans.scan()
+            networks = self.backend.get_wifi_networks()
+        if networks is not None:
+            self._networks = networks
+        # A failed read also counts, so listeners can't spin on retries
+        self._time = time.monotonic()
+        log_debug(f"Scan cache refreshed: {len(networks) if networks is not None else 'failed'}")
+        return networks
+
+    def _refresh_thread(self, rescan):
+        while True:
+            networks = self.load(rescan)
+
+            with self._lock:
+                rescan = self._rescan_pending
+                self._rescan_pending = False
+                if not rescan:
+                    self._refreshing = False
+                    break
+        GLib.idle_add(self._notify, networks)
+
+    def _notify(self, networks):
+        for listener in list(self._listeners):
+            try:
+                listener(networks)
+            except Exception as e:
+                log_debug(f"Scan listener failed: {e}")
+        return False
+
+    def invalidate(self):
+        self._time = 0.0
+
+    def add_listener(self, callback: Callable):
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+
+def cache_ttl() -> float:
+    config = get_config()
+    return config.getfloat('SCAN', 'cache_ttl', fallback=DEFAULT_TTL) if config else DEFAULT_TTL
+
+
+_cache = None
+
+
+def get_scan_cache() -> ScanCache:
+    # Frontends' cache: goes through connexd when one is running
+    global _cache
+    if _cache is None:
+        _cache = ScanCache(ttl=cache_ttl(), remote=DaemonClient())
+    return _cache
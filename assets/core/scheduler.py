@@ -0,0 +1,166 @@
+import os
+import time
+from typing import Callable, Dict, Optional
+
+from gi.repository import Gio, GLib
+
+from assets.utils.debug import log_debug
+
+# Interval multipliers; a job's base interval is what it wants while visible on AC
+HIDDEN_FACTOR = 6
+BATTERY_FACTOR = 2
+FOCUSED_FACTOR = 0.5
+# A job may run this fraction of its interval early so it shares a wakeup
+SLACK = 0.25
+POWER_CHECK_INTERVAL = 60
+POWER_SUPPLY_DIR = "/sys/class/power_supply"
+
+
+def read_on_battery() -> bool:
+    # sysfs first: no D-Bus round trip, and AC adapters report "Mains"
+    mains = []
+    try:
+        names = os.listdir(POWER_SUPPLY_DIR)
+    except OSError:
+        names = []
+    for name in names:
+        try:
+            with open(os.path.join(POWER_SUPPLY_DIR, name, "type")) as f:
+                if f.read().strip() != "Mains":
+                    continue
+            with open(os.path.join(POWER_SUPPLY_DIR, name, "online")) as f:
+                mains.append(f.read().strip() == "1")
+        except OSError:
+            continue
+    if mains:
+        return not any(mains)
+
+    # No adapter in sysfs (desktops, some VMs): ask UPower
+    try:
+        bus = Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+        result = bus.call_sync(
+            "org.freedesktop.UPower", "/org/freedesktop/UPower",
+            "org.freedesktop.DBus.Properties", "Get",
+            GLib.Variant("(ss)", ("org.freedesktop.UPower", "OnBattery")),
+            GLib.VariantType("(v)"), Gio.DBusCallFlags.NONE, 500, None
+        )
+        return bool(result.unpack()[0])
+    except GLib.Error:
+        return False
+
+
+class PollJob:
+    def __init__(self, interval: float, callback: Callable, view: Optional[str]):
+        self.interval = interval
+        self.callback = callback
+        self.view = view
+        self.last = time.monotonic()
+        self.runs = 0
+
+
+class PollScheduler:
+    # Owns all periodic work behind one GLib timeout armed for the next due job
+    def __init__(self):
+        self._jobs: Dict[int, PollJob] = {}
+        self._views: Dict[str, Dict[str, bool]] = {}
+        self._next_id = 1
+        self._source = None
+        self._on_battery = read_on_battery()
+        self._power_checked = time.monotonic()
+        self.started = time.monotonic()
+        self.wakeups = 0
+
+    @property
+    def on_battery(self) -> bool:
+        return self._on_battery
+
+    def add(self, interval: float, callback: Callable, view: Optional[str] = None) -> int:
+        # Like timeout_add: the job is dropped once callback returns False.
+        # view ties the interval to a window reported through set_view_state.
+        handle = self._next_id
+        self._next_id += 1
+        self._jobs[handle] = PollJob(interval, callback, view)
+        self._reschedule()
+        return handle
+
+    def remove(self, handle: int):
+        if self._jobs.pop(handle, None):
+            self._reschedule()
+
+    def set_view_state(self, view: str, visible: bool, focused: bool = False):
+        state = {"visible": visible, "focused": visible and focused}
+        if self._views.get(view) == state:
+            return
+        self._views[view] = state
+        log_debug(f"Scheduler: {view} visible={visible} focused={state['focused']}")
+        self._reschedule()
+
+    def interval_for(self, job: PollJob) -> float:
+        interval = job.interval
+        if job.view is not None:
+            state = self._views.get(job.view, {"visible": True, "focused": False})
+            if not state["visible"]:
+                interval *= HIDDEN_FACTOR
+            elif state["focused"]:
+                interval *= FOCUSED_FACTOR
+        if self._on_battery:
+            interval *= BATTERY_FACTOR
+        return interval
+
+    def stats(self) -> Dict:
+        hours = max(time.monotonic() - self.started, 1) / 3600
+        return {
+            "wakeups": self.wakeups,
+            "wakeups_per_hour": round(self.wakeups / hours, 1),
+            "on_battery": self._on_battery,
+            "jobs": {getattr(j.callback, "__name__", str(h)): j.runs for h, j in self._jobs.items()},
+        }
+
+    def _reschedule(self):
+        if self._source:
+            GLib.source_remove(self._source)
+            self._source = None
+        if not self._jobs:
+            return
+        now = time.monotonic()
+        due = min(j.last + self.interval_for(j) for j in self._jobs.values())
+        delay = max(0.0, due - now)
+        if delay >= 1:
+            # Second-granularity timers are batched with the rest of the session
+            self._source = GLib.timeout_add_seconds(int(delay), self._tick)
+        else:
+            self._source = GLib.timeout_add(int(delay * 1000), self._tick)
+
+    def _tick(self):
+        self._source = None
+        self.wakeups += 1
+        now = time.monotonic()
+        if now - self._power_checked >= POWER_CHECK_INTERVAL:
+            self._on_battery = read_on_battery()
+            self._power_checked = now
+
+        for handle, job in list(self._jobs.items()):
+            if now < job.last + self.interval_for(job) * (1 - SLACK):
+                continue
+            job.last = now
+            job.runs += 1
+            try:
+                keep = job.callback()
+            except Exception as e:
+                log_debug(f"Scheduled job {job.callback} failed: {e}")
+                keep = True
+            if keep is False:
+                self._jobs.pop(handle, None)
+
+        self._reschedule()
+        return False
+
+
+_scheduler = None
+
+
+def get_scheduler() -> PollScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = PollScheduler()
+    return _scheduler
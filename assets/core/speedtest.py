@@ -1,10 +1,104 @@
 #!/usr/bin/env python3
-import socket
+import http.client
+import os
+import statistics
 import time
+import urllib.parse
 import urllib.request
 import urllib.error
 import threading
-from typing import Optional, Callable, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Dict, List, Tuple
+
+from assets.utils.debug import get_config, log_debug
+from assets.core.latency import LatencyProbe, default_gateway, dns_server, DEFAULT_TIMEOUT
+
+# Parallel download streams; one TCP stream rarely fills a fast link
+DEFAULT_STREAMS = 4
+MAX_STREAMS = 16
+# Each stream reads into one reused buffer; large reads keep the per-byte
+# Python overhead low enough to measure multi-gigabit links
+READ_BUFFER = 256 * 1024
+# Progress updates within a stage are dropped if they come faster than this;
+# the dialog turns each one into a main loop callback
+PROGRESS_INTERVAL = 0.25
+# Pre-selection: time-to-first-byte probes against every candidate at once,
+# then only the closest servers get the full download
+SELECT_SERVERS = 2
+SELECT_SAMPLES = 2
+SELECT_TIMEOUT = 3
+# Latency: samples per target, all targets probed together within the budget
+PING_SAMPLES = 20
+PING_BUDGET = 3.0
+# Bufferbloat: added latency under load (ms) -> grade, checked in order
+BLOAT_GRADES = ((5, "A+"), (30, "A"), (60, "B"), (200, "C"), (400, "D"))
+# Size of each upload request; streams keep posting until time is up
+UPLOAD_SIZE_MB = 25
+# Upload endpoints must take a small POST first, so a server that rejects
+# uploads never has its refused bytes counted as throughput
+UPLOAD_PROBE_BYTES = 64 * 1024
+# Each direction runs for a fixed time and is sampled at a fixed interval;
+# samples in the ramp-up (TCP slow start, DNS/TLS setup) are left out of the stats
+DEFAULT_DURATION = 10
+SAMPLE_INTERVAL = 0.5
+RAMP_UP = 2.0
+# Bounds offered by the dialog; below MIN_DURATION little is left after ramp-up
+MIN_DURATION = 3
+MAX_DURATION = 60
+SPARK = "▁▂▃▄▅▆▇█"
+
+
+def speedtest_streams() -> int:
+    config = get_config()
+    if config:
+        return config.getint('SPEEDTEST', 'streams', fallback=DEFAULT_STREAMS)
+    return DEFAULT_STREAMS
+
+
+def speedtest_duration() -> float:
+    config = get_config()
+    if config:
+        return config.getfloat('SPEEDTEST', 'duration', fallback=DEFAULT_DURATION)
+    return DEFAULT_DURATION
+
+
+def speedtest_servers() -> List[str]:
+    config = get_config()
+    if config:
+        return [s.strip() for s in config.get('SPEEDTEST', 'servers', fallback="").split(",") if s.strip()]
+    return []
+
+
+def percentile(values: List[float], pct: float) -> float:
+    # Linear interpolation between closest ranks, values sorted ascending
+    if not values:
+        return 0.0
+    rank = (len(values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def throughput_stats(series: List[float], interval: float = SAMPLE_INTERVAL) -> Dict:
+    # Keeps at least half of the samples however short the run was
+    ramp = min(int(RAMP_UP / interval), len(series) // 2)
+    steady = sorted(series[ramp:])
+    if not steady:
+        return {'median': 0.0, 'p90': 0.0, 'peak': 0.0, 'ramp_samples': ramp}
+    return {
+        'median': round(statistics.median(steady), 2),
+        'p90': round(percentile(steady, 90), 2),
+        'peak': round(steady[-1], 2),
+        'ramp_samples': ramp,
+    }
+
+
+def sparkline(series: List[float]) -> str:
+    top = max(series, default=0)
+    if top <= 0:
+        return ""
+    return "".join(SPARK[round(v / top * (len(SPARK) - 1))] for v in series)
+
 
 class SpeedTest:
     DOWNLOAD_URLS = [
@@ -14,168 +108,337 @@ class SpeedTest:
         "http://ipv4.download.thinkbroadband.com/10MB.zip",
     ]
 
-    UPLOAD_URL = "https://httpbin.org/post"
+    # Tried in order until one takes the upload
+    UPLOAD_URLS = [
+        "http://speedtest.tele2.net/upload.php",
+        "https://httpbin.org/post",
+    ]
     
-    def __init__(self, callback: Optional[Callable] = None):
+    def __init__(self, callback: Optional[Callable] = None, streams: Optional[int] = None,
+                 duration: Optional[float] = None, servers: Optional[List[str]] = None):
         self.callback = callback
+        self.streams = max(1, min(streams or speedtest_streams(), MAX_STREAMS))
+        self.duration = duration or speedtest_duration()
+        # Base URLs of connex speedtest servers (connex --speedtest-server)
+        # replace the public download and upload endpoints
+        servers = servers if servers is not None else speedtest_servers()
+        if servers:
+            self.DOWNLOAD_URLS = [f"{base.rstrip('/')}/download" for base in servers]
+            self.UPLOAD_URLS = [f"{base.rstrip('/')}/upload" for base in servers]
+        # download/upload hold the steady-state median; the *_series lists are
+        # the raw Mbps samples, one per sample_interval, ramp-up included
         self.results = {
             'ping': 0.0,
             'download': 0.0,
             'upload': 0.0,
+            'download_stats': {},
+            'upload_stats': {},
+            'download_series': [],
+            'upload_series': [],
+            'sample_interval': SAMPLE_INTERVAL,
             'server': '',
+            'server_latency': 0.0,
+            'jitter': 0.0,
+            'loss': 0.0,
+            # per target (gateway, dns, server): min/avg/max/jitter/loss/samples
+            'latency': {},
+            # idle vs loaded latency to the ping target, see _update_bufferbloat
+            'bufferbloat': {},
             'error': None
         }
         self._cancelled = False
+        self._cancel_event = threading.Event()
+        self._candidates: Optional[List[Tuple[float, str]]] = None
+        self._ping_target: Optional[str] = None
+        self._loaded: Dict[str, Dict] = {}
+        self._last_stage = None
+        self._last_report: Dict[str, float] = {}
     
     def cancel(self):
         self._cancelled = True
+        self._cancel_event.set()
     
     def _report(self, stage: str, progress: float, message: str):
-        if self.callback:
-            self.callback(stage, progress, message)
+        if not self.callback:
+            return
+        # Stage changes and the final 1.0 always go through
+        now = time.monotonic()
+        if stage == self._last_stage and progress < 1.0 \
+                and now - self._last_report.get(stage, 0.0) < PROGRESS_INTERVAL:
+            return
+        self._last_stage = stage
+        self._last_report[stage] = now
+        self.callback(stage, progress, message)
     
-    def test_ping(self, host: str = "8.8.8.8", port: int = 53, timeout: int = 3) -> float:
+    def latency_targets(self) -> Dict[str, Tuple[str, int]]:
+        targets = {}
+        gateway = default_gateway()
+        if gateway:
+            targets['gateway'] = (gateway, 80)
+        targets['dns'] = (dns_server(), 53)
+        if self._candidates:
+            parts = urllib.parse.urlsplit(self._candidates[0][1])
+            targets['server'] = (parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        return targets
+
+    def test_ping(self, samples: int = PING_SAMPLES, budget: float = PING_BUDGET) -> float:
+        # Probes gateway, resolver and speedtest server concurrently; the headline
+        # ping is the farthest of them that answered
         if self._cancelled:
             return 0.0
         
         self._report("ping", 0.1, "Testing latency...")
-        
+        stats = LatencyProbe(self.latency_targets()).run(samples=samples, budget=budget,
+                                                         stop=self._cancel_event)
+        self.results['latency'] = stats
+
+        for name in ('server', 'dns', 'gateway'):
+            if stats.get(name, {}).get('loss', 100.0) < 100.0:
+                self._ping_target = name
+                self.results['ping'] = stats[name]['avg']
+                self.results['jitter'] = stats[name]['jitter']
+                self.results['loss'] = stats[name]['loss']
+                break
+        self._report("ping", 0.2, f"Ping: {self.results['ping']:.1f} ms")
+        return self.results['ping']
+    
+    @staticmethod
+    def _first_byte_time(url: str, timeout: float) -> Optional[float]:
+        # ms until the response headers of a one-byte range request arrive
+        # (DNS, TCP/TLS handshake and server think time); None if unreachable
+        best = None
+        for _ in range(SELECT_SAMPLES):
+            req = urllib.request.Request(url)
+            req.add_header('User-Agent', 'connex/1.0')
+            req.add_header('Range', 'bytes=0-0')
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(req, timeout=timeout) as response:
+                    elapsed = (time.perf_counter() - start) * 1000
+                    response.read(1)
+            except (urllib.error.URLError, OSError) as e:
+                log_debug(f"Server probe {url} failed: {e}")
+                continue
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    @staticmethod
+    def _accepts_upload(url: str, timeout: float) -> bool:
+        req = urllib.request.Request(url, data=bytes(UPLOAD_PROBE_BYTES), method="POST")
+        req.add_header('User-Agent', 'connex/1.0')
+        req.add_header('Content-Type', 'application/octet-stream')
         try:
-            # Resolve DNS first
-            start = time.time()
-            socket.gethostbyname(host)
-            dns_time = (time.time() - start) * 1000
-            
-            # TCP connection test
-            times = []
-            for i in range(3):
-                if self._cancelled:
-                    break
-                
-                start = time.time()
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(timeout)
-                
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                response.read()
+                return response.status < 400
+        except (urllib.error.URLError, OSError) as e:
+            # HTTPError (4xx/5xx) is a URLError too
+            log_debug(f"Upload probe {url} failed: {e}")
+            return False
+
+    def select_servers(self, count: int = SELECT_SERVERS, timeout: float = SELECT_TIMEOUT) -> List[Tuple[float, str]]:
+        # -> [(latency_ms, url)] of the closest reachable servers, closest first
+        self._report("select", 0.05, f"Selecting server ({len(self.DOWNLOAD_URLS)} candidates)...")
+        with ThreadPoolExecutor(max_workers=len(self.DOWNLOAD_URLS) or 1) as pool:
+            latencies = list(pool.map(lambda url: self._first_byte_time(url, timeout), self.DOWNLOAD_URLS))
+        ranked = sorted((ms, url) for ms, url in zip(latencies, self.DOWNLOAD_URLS) if ms is not None)
+        for ms, url in ranked:
+            log_debug(f"Server {url}: {ms:.1f} ms to first byte")
+        self._candidates = ranked[:count]
+        return self._candidates
+
+    def _run_streams(self, worker, stage: str, progress_from: float, progress_to: float,
+                     duration: Optional[float] = None) -> List[float]:
+        # Runs self.streams copies of worker(index, counts, stop), each adding the
+        # bytes it moves to counts[index] until stop is set. Their combined rate is
+        # sampled every SAMPLE_INTERVAL for duration (default self.duration) seconds -> Mbps series.
+        duration = duration or self.duration
+        counts = [0] * self.streams
+        stop = threading.Event()
+        threads = [threading.Thread(target=worker, args=(i, counts, stop), daemon=True)
+                   for i in range(self.streams)]
+        series = []
+        probe = self._load_probe()
+        # Latency under load: probe the ping target once the streams are past ramp-up
+        prober = threading.Thread(
+            target=lambda: stop.wait(RAMP_UP) or probe.run(samples=None, budget=duration, stop=stop),
+            daemon=True) if probe else None
+        start_time = last_time = time.perf_counter()
+        last_bytes = 0
+        for thread in threads:
+            thread.start()
+        if prober:
+            prober.start()
+
+        while True:
+            time.sleep(SAMPLE_INTERVAL)
+            now = time.perf_counter()
+            total = sum(counts)
+            series.append(round((total - last_bytes) * 8 / ((now - last_time) * 1_000_000), 2))
+            last_time, last_bytes = now, total
+            elapsed = now - start_time
+            if self._cancelled or elapsed >= duration or not any(t.is_alive() for t in threads):
+                break
+            progress = progress_from + (progress_to - progress_from) * elapsed / duration
+            message = f"{stage.capitalize()}: {series[-1]:.2f} Mbps"
+            loaded = probe.stats()[self._ping_target] if probe else None
+            if loaded and loaded['avg']:
+                message += f", {loaded['avg']:.1f} ms under load"
+            self._report(stage, progress, message)
+
+        stop.set()
+        for thread in threads:
+            thread.join(1)
+        if prober:
+            # Lets the probes still in flight come back or time out
+            prober.join(DEFAULT_TIMEOUT)
+        if probe and last_bytes:
+            self._loaded[stage] = probe.stats()[self._ping_target]
+            self._update_bufferbloat()
+        return series if last_bytes else []
+
+    def _load_probe(self) -> Optional[LatencyProbe]:
+        # Same target as the idle ping, so the two are comparable
+        if not self._ping_target:
+            return None
+        probe = LatencyProbe({self._ping_target: self.latency_targets()[self._ping_target]})
+        return probe if probe.targets else None
+
+    def _update_bufferbloat(self):
+        idle = self.results['latency'][self._ping_target]['avg']
+        bloat = {'target': self._ping_target, 'idle': idle}
+        increase = 0.0
+        for stage, stats in self._loaded.items():
+            if stats['loss'] >= 100.0:
+                continue
+            bloat[stage] = stats['avg']
+            bloat[f'{stage}_jitter'] = stats['jitter']
+            increase = max(increase, stats['avg'] - idle)
+        bloat['increase'] = round(max(increase, 0.0), 2)
+        bloat['grade'] = next((grade for limit, grade in BLOAT_GRADES if increase < limit), "F")
+        self.results['bufferbloat'] = bloat
+
+    def _download_streams(self, url: str, timeout: int, duration: Optional[float] = None) -> List[float]:
+        def stream(index, counts, stop):
+            buffer = memoryview(bytearray(READ_BUFFER))
+            # Fetch the file again whenever it runs out, so the link stays busy
+            # for the whole duration
+            while not (self._cancelled or stop.is_set()):
                 try:
-                    sock.connect((host, port))
-                    elapsed = (time.time() - start) * 1000
-                    times.append(elapsed)
-                except (socket.timeout, socket.error):
-                    pass
-                finally:
-                    sock.close()
-                
-                self._report("ping", 0.1 + (i + 1) * 0.05, f"Ping test {i+1}/3...")
-            
-            if times:
-                avg_ping = sum(times) / len(times)
-                self.results['ping'] = round(avg_ping, 2)
-                return self.results['ping']
-            else:
-                self.results['ping'] = 0.0
-                return 0.0
-        
-        except Exception as e:
-            self.results['error'] = f"Ping test failed: {str(e)}"
-            return 0.0
-    
-    def test_download(self, size_mb: int = 10, timeout: int = 30) -> float:
+                    req = urllib.request.Request(url)
+                    req.add_header('User-Agent', 'connex/1.0')
+                    with urllib.request.urlopen(req, timeout=timeout) as response:
+                        while not (self._cancelled or stop.is_set()):
+                            n = response.readinto(buffer)
+                            if not n:
+                                break
+                            counts[index] += n
+                except (urllib.error.URLError, OSError) as e:
+                    log_debug(f"Download stream {index} to {url} failed: {e}")
+                    return
+
+        return self._run_streams(stream, "download", 0.3, 0.7, duration)
+
+    def test_download(self, duration: Optional[float] = None, timeout: int = 30) -> float:
         if self._cancelled:
             return 0.0
         
-        self._report("download", 0.3, "Testing download speed...")
-        
-        best_speed = 0.0
-        best_server = ""
-        
-        for i, url in enumerate(self.DOWNLOAD_URLS):
+        candidates = self._candidates if self._candidates is not None else self.select_servers()
+        if not candidates:
+            self.results['error'] = "No speedtest server reachable"
+            return 0.0
+
+        # Closest server first; the next one only if it fails outright
+        for latency, url in candidates:
             if self._cancelled:
+                return 0.0
+            host = url.split('/')[2]
+            self._report("download", 0.3, f"Testing {host} ({self.streams} streams)...")
+            series = self._download_streams(url, timeout, duration)
+            if series:
                 break
-            
-            try:
-                self._report("download", 0.3 + i * 0.1, f"Testing server {i+1}...")
-                
-                start_time = time.time()
-                downloaded = 0
-                
-                req = urllib.request.Request(url)
-                req.add_header('User-Agent', 'connex/1.0')
-                
-                with urllib.request.urlopen(req, timeout=timeout) as response:
-                    chunk_size = 8192
-                    while True:
-                        if self._cancelled:
-                            break
-                        
-                        chunk = response.read(chunk_size)
-                        if not chunk:
-                            break
-                        
-                        downloaded += len(chunk)
-
-                        elapsed = time.time() - start_time
-                        if elapsed > 0:
-                            speed_mbps = (downloaded * 8) / (elapsed * 1_000_000)
-                            progress = min(0.3 + i * 0.1 + 0.05, 0.6)
-                            self._report("download", progress, 
-                                       f"Download: {speed_mbps:.2f} Mbps")
-                
-                elapsed = time.time() - start_time
-                
-                if elapsed > 0 and downloaded > 0:
-                    speed_mbps = (downloaded * 8) / (elapsed * 1_000_000)
-                    
-                    if speed_mbps > best_speed:
-                        best_speed = speed_mbps
-                        best_server = url.split('/')[2]
-                
-                continue
-            
-            except (urllib.error.URLError, socket.timeout) as e:
-                continue
-            except Exception as e:
-                continue
-        
-        self.results['download'] = round(best_speed, 2)
-        self.results['server'] = best_server
+        else:
+            self.results['error'] = "Download test failed"
+            return 0.0
+
+        stats = throughput_stats(series)
+        self.results['download'] = stats['median']
+        self.results['download_stats'] = stats
+        self.results['download_series'] = series
+        self.results['server'] = host
+        self.results['server_latency'] = round(latency, 2)
         return self.results['download']
-    
-    def test_upload(self, size_kb: int = 1024, timeout: int = 30) -> float:
+
+    def _upload_streams(self, url: str, size: int, timeout: int, duration: Optional[float] = None) -> List[float]:
+        # Bytes are counted as they are handed to the socket, so the server's
+        # reply is never part of the number
+        payload = memoryview(os.urandom(READ_BUFFER))
+        parts = urllib.parse.urlsplit(url)
+        conn_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+
+        def stream(index, counts, stop):
+            # POSTs of `size` bytes, streamed from the shared payload, back to back
+            while not (self._cancelled or stop.is_set()):
+                conn = conn_class(parts.netloc, timeout=timeout)
+                try:
+                    conn.putrequest("POST", parts.path or "/")
+                    conn.putheader("User-Agent", "connex/1.0")
+                    conn.putheader("Content-Type", "application/octet-stream")
+                    conn.putheader("Content-Length", str(size))
+                    conn.endheaders()
+                    sent = 0
+                    while sent < size and not (self._cancelled or stop.is_set()):
+                        n = min(len(payload), size - sent)
+                        conn.sock.sendall(payload[:n])
+                        sent += n
+                        counts[index] += n
+                    if sent < size:
+                        return
+                    response = conn.getresponse()
+                    response.read()
+                    if response.status >= 400:
+                        log_debug(f"Upload stream {index} to {url}: HTTP {response.status}")
+                        return
+                except (OSError, http.client.HTTPException) as e:
+                    log_debug(f"Upload stream {index} to {url} failed: {e}")
+                    return
+                finally:
+                    conn.close()
+
+        return self._run_streams(stream, "upload", 0.7, 0.95, duration)
+
+    def test_upload(self, duration: Optional[float] = None, size_mb: int = UPLOAD_SIZE_MB,
+                    timeout: int = 30) -> float:
         if self._cancelled:
             return 0.0
         
-        self._report("upload", 0.7, "Testing upload speed...")
+        self._report("upload", 0.7, f"Testing upload speed ({self.streams} streams)...")
         
-        try:
-            data = b'0' * (size_kb * 1024)
-            
-            start_time = time.time()
-            
-            req = urllib.request.Request(self.UPLOAD_URL, data=data, method='POST')
-            req.add_header('User-Agent', 'connex/1.0')
-            req.add_header('Content-Type', 'application/octet-stream')
-            
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                response.read()
-            
-            elapsed = time.time() - start_time
-            
-            if elapsed > 0:
-                speed_mbps = (len(data) * 8) / (elapsed * 1_000_000)
-                self.results['upload'] = round(speed_mbps, 2)
-                self._report("upload", 0.9, f"Upload: {speed_mbps:.2f} Mbps")
+        for url in self.UPLOAD_URLS:
+            if self._cancelled:
+                break
+            if not self._accepts_upload(url, SELECT_TIMEOUT):
+                continue
+            series = self._upload_streams(url, size_mb * 1024 * 1024, timeout, duration)
+            if series:
+                stats = throughput_stats(series)
+                self.results['upload'] = stats['median']
+                self.results['upload_stats'] = stats
+                self.results['upload_series'] = series
+                self._report("upload", 0.95, f"Upload: {stats['median']:.2f} Mbps")
                 return self.results['upload']
         
-        except Exception as e:
-            self.results['error'] = f"Upload test failed: {str(e)}"
-            return 0.0
-        
+        # Download and ping still stand, so this is not a test error
+        log_debug("Upload test failed: no upload server accepted the data")
         return 0.0
     
     def run_full_test(self) -> Dict:
         try:
             self._report("init", 0.0, "Initializing test...")
-            
+
+            # Pick the server first, it is one of the latency targets
+            self.select_servers()
+
             # Test ping
             self.test_ping()
             
@@ -184,7 +447,6 @@ class SpeedTest:
                 return self.results
             
             # Test download
-            #self.test_download(size_mb=100)
             self.test_download()
             
             if self._cancelled:
@@ -192,7 +454,11 @@ class SpeedTest:
                 return self.results
             
             # Test upload
-            #self.test_upload() # I don't like it for now. 
+            self.test_upload()
+
+            if self._cancelled:
+                self.results['error'] = "Test cancelled"
+                return self.results
             
             self._report("complete", 1.0, "Test complete!")
             
@@ -203,7 +469,8 @@ class SpeedTest:
 
 
 # CLI test function
-def cli_speedtest():
+def cli_speedtest(streams: Optional[int] = None, duration: Optional[float] = None,
+                  servers: Optional[List[str]] = None):
     def progress_callback(stage, progress, message):
         bar_length = 30
         filled = int(bar_length * progress)
@@ -213,7 +480,8 @@ def cli_speedtest():
     print("connex - SpeedTest")
     print("=" * 50)
     
-    test = SpeedTest(callback=progress_callback)
+    test = SpeedTest(callback=progress_callback, streams=streams, duration=duration, servers=servers)
+    print(f"Parallel streams: {test.streams}, {test.duration:g}s per direction")
     results = test.run_full_test()
     
     print("\n\n" + "=" * 50)
@@ -224,12 +492,27 @@ def cli_speedtest():
         print(f"Error: {results['error']}")
         return 1
     
-    print(f"Server: {results['server'] or 'N/A'}")
-    print(f"Ping: {results['ping']:.1f} ms")
-    print(f"Download: {results['download']:.2f} Mbps")
-    
-    if results['upload'] > 0:
-        print(f"Upload: {results['upload']:.2f} Mbps")
+    if results['server']:
+        print(f"Server: {results['server']} ({results['server_latency']:.0f} ms to first byte)")
+    else:
+        print("Server: N/A")
+    print(f"Ping: {results['ping']:.1f} ms (jitter {results['jitter']:.1f} ms, loss {results['loss']:.0f}%)")
+    for name, stats in results['latency'].items():
+        print(f"  {name:<8} min {stats['min']:.1f} / avg {stats['avg']:.1f} / max {stats['max']:.1f} ms, "
+              f"jitter {stats['jitter']:.1f} ms, loss {stats['loss']:.0f}% of {stats['samples']}")
+    bloat = results['bufferbloat']
+    if bloat:
+        loaded = ", ".join(f"{stage} {bloat[stage]:.1f} ms" for stage in ('download', 'upload') if stage in bloat)
+        print(f"Bufferbloat: {bloat['grade']} (idle {bloat['idle']:.1f} ms; under load {loaded}; "
+              f"+{bloat['increase']:.1f} ms)")
+    for direction in ('download', 'upload'):
+        stats = results[f'{direction}_stats']
+        if results[direction] <= 0:
+            print(f"{direction.capitalize()}: unavailable")
+            continue
+        print(f"{direction.capitalize()}: {results[direction]:.2f} Mbps "
+              f"(p90 {stats['p90']:.2f}, peak {stats['peak']:.2f})")
+        print(f"  {sparkline(results[f'{direction}_series'])}")
     
     print("=" * 50)
     return 0
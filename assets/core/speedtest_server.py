@@ -0,0 +1,166 @@
+import json
+import random
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from assets.utils.debug import log_debug
+
+# A minimal server for SpeedTest(servers=[...]):
+#   GET  /download[?bytes=N]  N generated bytes, honours Range: bytes=a-b
+#   POST /upload              reads and discards the body, replies {"received": N}
+#   GET  /                    {"service": "connex-speedtest"}
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8089
+DEFAULT_BODY = 100 * 1024 * 1024
+MAX_BODY = 10 * 1024 * 1024 * 1024
+BLOCK = 1024 * 1024
+# Bodies repeat this block, so byte i of any download is PATTERN[i % BLOCK]
+# and clients can check what they got; random so nothing on the way compresses it
+PATTERN = random.Random(0).randbytes(BLOCK)
+
+RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "connex-speedtest"
+    protocol_version = "HTTP/1.1"
+
+    def _json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body_size(self, query):
+        try:
+            size = int(parse_qs(query).get("bytes", [DEFAULT_BODY])[0])
+        except ValueError:
+            return None
+        return size if 0 <= size <= MAX_BODY else None
+
+    def _byte_range(self, size):
+        # -> (start, end) inclusive, None for the whole body, or False if unsatisfiable
+        header = self.headers.get("Range")
+        if not header:
+            return None
+        match = RANGE.match(header.strip())
+        if not match or match.groups() == ("", ""):
+            return False
+        first, last = match.groups()
+        if first == "":
+            # Suffix range: the last N bytes
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        if start > end or start >= size:
+            return False
+        return start, end
+
+    def _download(self, query, send_body):
+        size = self._body_size(query)
+        if size is None:
+            self._json(400, {"error": f"bytes must be between 0 and {MAX_BODY}"})
+            return
+        span = self._byte_range(size)
+        if span is False:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        start, end = span or (0, size - 1)
+        length = end - start + 1 if size else 0
+        self.send_response(206 if span else 200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Cache-Control", "no-store")
+        if span:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if not send_body:
+            return
+
+        block = memoryview(PATTERN)
+        offset = start % BLOCK
+        try:
+            while length > 0:
+                n = min(BLOCK - offset, length)
+                self.wfile.write(block[offset:offset + n])
+                length -= n
+                offset = 0
+        except OSError:
+            # The client has what it needed (a one-byte probe, a time-boxed test)
+            self.close_connection = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/download":
+            self._download(url.query, send_body=True)
+        elif url.path == "/":
+            self._json(200, {"service": "connex-speedtest"})
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_HEAD(self):
+        url = urlsplit(self.path)
+        if url.path == "/download":
+            self._download(url.query, send_body=False)
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/upload":
+            self._json(404, {"error": "not found"})
+            return
+        try:
+            remaining = int(self.headers["Content-Length"])
+        except (TypeError, ValueError):
+            self.close_connection = True
+            self._json(411, {"error": "Content-Length required"})
+            return
+
+        buffer = memoryview(bytearray(BLOCK))
+        received = 0
+        while received < remaining:
+            n = self.rfile.readinto(buffer[:min(BLOCK, remaining - received)])
+            if not n:
+                # Client stopped mid-body, e.g. at the end of a time-boxed test
+                self.close_connection = True
+                return
+            received += n
+        self._json(200, {"received": received})
+
+    def log_message(self, fmt, *args):
+        log_debug(f"speedtest server: {self.address_string()} {fmt % args}")
+
+
+class SpeedTestServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> SpeedTestServer:
+    return SpeedTestServer((host, port), _Handler)
+
+
+def run_speedtest_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> int:
+    try:
+        server = make_server(host, port)
+    except OSError as e:
+        print(f"Cannot listen on {host}:{port}: {e}")
+        return 1
+    bound_host, bound_port = server.server_address[:2]
+    print(f"connex speedtest server on http://{bound_host}:{bound_port}", flush=True)
+    print(f"  connex --cli speedtest --servers http://{bound_host}:{bound_port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
@@ -2,6 +2,8 @@ import subprocess
 import shlex
 from typing import List, Dict, Optional, Tuple
 from assets.utils.debug import log_debug
+from assets.core.nm_backend import get_backend
+from assets.core.nmcli_parser import get_value, parse_key_values
 
 # sudo pacman -S networkmanager openvpn networkmanager-openvpn wireguard-tools
 
@@ -24,41 +26,26 @@ class VPNManager:
     
     @staticmethod
     def get_vpn_list() -> List[Dict[str, str]]:
-        code, out, err = VPNManager.run_cmd(
-            "nmcli -t -f NAME,TYPE,UUID,DEVICE connection show"
-        )
-        
         vpns = []
-        if code == 0:
-            for line in out.splitlines():
-                if not line.strip():
-                    continue
-                parts = line.split(':')
-                if len(parts) >= 2:
-                    conn_type = parts[1]
-                    if 'vpn' in conn_type.lower() or 'wireguard' in conn_type.lower():
-                        vpns.append({
-                            'name': parts[0],
-                            'type': conn_type,
-                            'uuid': parts[2] if len(parts) > 2 else '',
-                            'device': parts[3] if len(parts) > 3 else '',
-                            'connected': bool(parts[3]) if len(parts) > 3 else False
-                        })
+        for conn in get_backend().get_connections():
+            conn_type = conn['type']
+            if 'vpn' in conn_type.lower() or 'wireguard' in conn_type.lower():
+                vpns.append({
+                    'name': conn['name'],
+                    'type': conn_type,
+                    'uuid': conn['uuid'],
+                    'device': conn['device'],
+                    'connected': bool(conn['device'])
+                })
         
         log_debug(f"Found {len(vpns)} VPN connections")
         return vpns
     
     @staticmethod
     def get_active_vpn() -> Optional[str]:
-        code, out, err = VPNManager.run_cmd(
-            "nmcli -t -f NAME,TYPE connection show --active"
-        )
-        
-        if code == 0:
-            for line in out.splitlines():
-                parts = line.split(':')
-                if len(parts) >= 2 and 'vpn' in parts[1].lower():
-                    return parts[0]
+        for conn in get_backend().get_active_connections():
+            if 'vpn' in conn['type'].lower():
+                return conn['name']
         return None
     
     @staticmethod
@@ -75,18 +62,18 @@ class VPNManager:
     
     @staticmethod
     def disconnect_vpn(name: str) -> Tuple[bool, str]:
-        code, out, err = VPNManager.run_cmd(f"nmcli connection down '{name}'")
+        ok, err = get_backend().deactivate_connection(name)
         
-        if code == 0:
+        if ok:
             return True, f"Disconnected from {name}"
         else:
             return False, err or "Disconnect failed"
     
     @staticmethod
     def delete_vpn(name: str) -> Tuple[bool, str]:
-        code, out, err = VPNManager.run_cmd(f"nmcli connection delete '{name}'")
+        ok, err = get_backend().delete_connection(name)
         
-        if code == 0:
+        if ok:
             return True, f"Deleted {name}"
         else:
             return False, err or "Delete failed"
@@ -170,18 +157,17 @@ class VPNManager:
             # Get IP info
             code, out, err = VPNManager.run_cmd(f"nmcli -t -f IP4.ADDRESS connection show '{name}'")
             if code == 0 and out:
-                status['ip'] = out.split(':')[1] if ':' in out else out
+                status['ip'] = get_value(out, "IP4.ADDRESS")
             
             # Get gateway
             code, out, err = VPNManager.run_cmd(f"nmcli -t -f IP4.GATEWAY connection show '{name}'")
             if code == 0 and out:
-                status['gateway'] = out.split(':')[1] if ':' in out else out
+                status['gateway'] = get_value(out, "IP4.GATEWAY")
             
             # Get DNS
             code, out, err = VPNManager.run_cmd(f"nmcli -t -f IP4.DNS connection show '{name}'")
             if code == 0 and out:
-                for line in out.splitlines():
-                    dns = line.split(':')[1] if ':' in line else line
+                for key, dns in parse_key_values(out):
                     if dns:
                         status['dns'].append(dns)
         
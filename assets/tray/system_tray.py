@@ -1,16 +1,19 @@
 import gi
 import subprocess
 import threading
+import time
 
 gi.require_version("Gtk", "3.0")
 from gi.repository import Gtk, GLib, Notify, AppIndicator3
 
 from assets.utils.debug import log_debug, log_connection
-from assets.ui.main_window import WifiWindow
-from assets.ui.other_ui import SpeedTestDialog
-from assets.ui.proxy_ui import ProxyDialog
-from assets.ui.vpn_ui import VPNManagerDialog
-from assets.ui.wifi_ui import LogViewerDialog, HiddenNetworkDialog, PasswordDialog
+from assets.core.nm_backend import get_backend
+from assets.core.nm_events import get_event_monitor
+from assets.core.scan_cache import get_scan_cache
+from assets.core.async_cmd import call_async
+from assets.core.scheduler import get_scheduler
+from assets.core.nmcli_parser import group_by_ssid
+# The window and dialogs are imported on first use, so --tray-only stays small
 
 
 def run_nmcli(args, timeout=3, text=True):
@@ -30,6 +33,8 @@ class SystemTrayApp:
         self.window = None
         self.current_networks = []
         self.current_ssid = None
+        self.backend = get_backend()
+        self.scan_cache = get_scan_cache()
 
         Notify.init("connex")
 
@@ -42,41 +47,40 @@ class SystemTrayApp:
         self.indicator.set_title("connex")
 
         self.update_menu()
-        GLib.timeout_add_seconds(5, self.update_icon)
-        GLib.timeout_add_seconds(10, self.update_menu_networks)
+        self.scan_cache.add_listener(self.on_scan_results)
 
-    def get_connection_status(self):
-        result = run_nmcli(["-t", "-f", "NAME,TYPE,DEVICE", "connection", "show", "--active"])
-        if not result:
-            return None, False
+        self.events = get_event_monitor()
+        if self.events:
+            for topic in ("state", "active-connections", "radio"):
+                self.events.subscribe(topic, self.on_nm_changed)
+            self.update_icon()
+
+        self.scheduler = get_scheduler()
+        if not self.events:
+            self.scheduler.add(5, self.update_icon)
+        if not (self.events and "access-points" in self.events.provides):
+            self.scheduler.add(10, self.update_menu_networks)
 
-        for line in result.stdout.splitlines():
-            parts = line.split(':')
-            if len(parts) >= 2 and parts[1] == "802-11-wireless":
-                return parts[0], True
+    def get_connection_status(self):
+        for conn in self.backend.get_active_connections():
+            if conn['type'] == "802-11-wireless":
+                return conn['name'], True
         return None, False
 
-    def get_available_networks(self):
-        run_nmcli(["device", "wifi", "rescan"], timeout=3)
-        result = run_nmcli(["-t", "-f", "SSID,SIGNAL,SECURITY,IN-USE", "device", "wifi", "list"], timeout=4)
+    def get_available_networks(self, rescan=False):
+        result = self.scan_cache.get(rescan=rescan)
         if not result:
             return []
 
         networks = []
-        seen = set()
 
-        for line in result.stdout.splitlines():
-            if not line.strip():
-                continue
-            parts = line.split(':')
-            ssid = parts[0] if parts[0] else None
-            if not ssid or ssid in seen:
+        for net in group_by_ssid(result):
+            ssid = net['ssid']
+            if not ssid:
                 continue
 
-            seen.add(ssid)
-            signal = int(parts[1]) if len(parts) > 1 and parts[1] else 0
-            security = parts[2] if len(parts) > 2 else ""
-            in_use = parts[3] if len(parts) > 3 else ""
+            signal = net['signal']
+            security = net['security']
 
             if not security or security == "--":
                 sec_type = "Open"
@@ -91,15 +95,19 @@ class SystemTrayApp:
                 'ssid': ssid,
                 'signal': signal,
                 'security': sec_type,
-                'connected': in_use == '*'
+                'connected': net['in_use']
             })
 
         networks.sort(key=lambda x: x['signal'], reverse=True)
         return networks[:15]
 
-    def update_menu(self):
+    def update_menu(self, rescan=False):
+        call_async(self.get_connection_status, callback=lambda status: self.build_menu(status, rescan))
+        return False
+
+    def build_menu(self, status, rescan=False):
         menu = Gtk.Menu()
-        self.current_ssid, connected = self.get_connection_status()
+        self.current_ssid, connected = status
 
         if connected and self.current_ssid:
             item = Gtk.MenuItem(label=f"✓ Connected to {self.current_ssid}")
@@ -118,7 +126,7 @@ class SystemTrayApp:
 
         connect_item = Gtk.MenuItem(label="Connect to Wi-Fi ▸")
         submenu = Gtk.Menu()
-        self.current_networks = self.get_available_networks()
+        self.current_networks = self.get_available_networks(rescan)
 
         if self.current_networks:
             for net in self.current_networks:
@@ -178,12 +186,20 @@ class SystemTrayApp:
 
         menu.show_all()
         self.indicator.set_menu(menu)
-        return True
 
     def update_menu_networks(self):
         self.update_menu()
         return True
 
+    def on_nm_changed(self):
+        self.update_icon()
+        self.update_menu()
+
+    def on_scan_results(self, networks):
+        # Whoever triggered the refresh, the submenu gets the new list for free
+        self.update_menu()
+        self.update_icon()
+
     def connect_to_network(self, widget, ssid, security):
         if ssid == self.current_ssid:
             return
@@ -194,6 +210,7 @@ class SystemTrayApp:
             self.show_password_dialog(ssid, security)
 
     def show_password_dialog(self, ssid, security):
+        from assets.ui.wifi_ui import PasswordDialog
         dialog = PasswordDialog(None, ssid, security)
         response = dialog.run()
 
@@ -206,16 +223,19 @@ class SystemTrayApp:
             dialog.destroy()
 
     def show_proxy_settings(self, widget):
+        from assets.ui.proxy_ui import ProxyDialog
         dialog = ProxyDialog(None)
         dialog.run()
         dialog.destroy()
 
     def show_vpn_manager(self, *_):
+        from assets.ui.vpn_ui import VPNManagerDialog
         dialog = VPNManagerDialog(None)
         dialog.run()
         dialog.destroy()
 
     def show_hidden_connect_dialog(self, widget):
+        from assets.ui.wifi_ui import HiddenNetworkDialog
         dialog = HiddenNetworkDialog(None)
         dialog.run()
         dialog.destroy()
@@ -227,24 +247,35 @@ class SystemTrayApp:
         if password:
             args += ["password", password]
 
+        started = time.monotonic()
         result = run_nmcli(args, timeout=20)
+        duration = time.monotonic() - started
+        ap = self.strongest_ap(ssid)
 
         if result and result.returncode == 0:
+            log_connection(ssid, ap.get('signal', 0), True, bssid=ap.get('bssid', ""), duration=duration)
             GLib.idle_add(self.show_notification, "Connected", f"Successfully connected to {ssid}", "network-wireless")
             GLib.idle_add(self.update_menu)
         else:
             msg = "Incorrect password" if result and "Secrets" in result.stderr else "Connection failed"
+            log_connection(ssid, ap.get('signal', 0), False, msg, bssid=ap.get('bssid', ""), duration=duration)
             GLib.idle_add(self.show_notification, "Connection Failed", f"Could not connect to {ssid}: {msg}", "network-wireless-offline")
 
+    def strongest_ap(self, ssid):
+        aps = [ap for ap in self.scan_cache.peek() or [] if ap['ssid'] == ssid]
+        return max(aps, key=lambda ap: ap['signal']) if aps else {}
+
     def disconnect_current(self, widget):
         if self.current_ssid:
-            run_nmcli(["connection", "down", self.current_ssid], timeout=4)
+            call_async(self.backend.deactivate_connection, self.current_ssid)
             self.show_notification("Disconnected", f"Disconnected from {self.current_ssid}", "network-wireless-offline")
             GLib.timeout_add(1000, self.update_menu)
 
     def show_connection_info(self, widget):
-        result = run_nmcli(["-t", "-f", "GENERAL,IP4", "device", "show"], timeout=4)
-        if not result:
+        call_async(self.backend.device_show, callback=self.display_connection_info)
+
+    def display_connection_info(self, rows):
+        if not rows:
             return
 
         dialog = Gtk.MessageDialog(
@@ -255,9 +286,8 @@ class SystemTrayApp:
         )
 
         info = []
-        for line in result.stdout.splitlines()[:20]:
-            if any(x in line for x in ["IP4.ADDRESS", "IP4.GATEWAY", "IP4.DNS", "GENERAL.CONNECTION", "GENERAL.STATE"]):
-                key, val = line.split(":", 1)
+        for key, val in rows[:20]:
+            if any(x in key for x in ["IP4.ADDRESS", "IP4.GATEWAY", "IP4.DNS", "GENERAL.CONNECTION", "GENERAL.STATE"]):
                 key = key.replace("GENERAL.", "").replace("IP4.", "")
                 info.append(f"{key}: {val}")
 
@@ -274,29 +304,35 @@ class SystemTrayApp:
         return False
 
     def show_window(self, *_):
-        if self.window is None or not self.window.get_visible():
+        # Built on first open, then only hidden and shown again
+        if self.window is None:
+            from assets.ui.main_window import WifiWindow
             self.window = WifiWindow()
             self.window.connect("delete-event", self.on_window_delete)
-            self.window.show_all()
-        else:
-            self.window.present()
+            self.window.connect("destroy", self.on_window_destroy)
+        self.window.show_all()
+        self.window.present()
 
     def on_window_delete(self, widget, event):
         widget.hide()
         return True
 
+    def on_window_destroy(self, widget):
+        self.window = None
+
     def update_icon(self):
-        ssid, connected = self.get_connection_status()
+        call_async(self.get_connection_status, callback=self.apply_icon)
+        return True
+
+    def apply_icon(self, status):
+        ssid, connected = status
 
         if connected:
-            result = run_nmcli(["-t", "-f", "IN-USE,SIGNAL", "device", "wifi", "list"], timeout=3)
             signal = 0
-            if result:
-                for line in result.stdout.splitlines():
-                    if line.startswith('*'):
-                        parts = line.split(':')
-                        signal = int(parts[1]) if len(parts) > 1 else 0
-                        break
+            for net in self.scan_cache.peek() or []:
+                if net['in_use']:
+                    signal = net['signal']
+                    break
 
             if signal >= 75:
                 icon = "network-wireless-signal-excellent-symbolic"
@@ -310,7 +346,6 @@ class SystemTrayApp:
             icon = "network-wireless-offline-symbolic"
 
         self.indicator.set_icon_full(icon, "")
-        return True
 
     def quit(self, *_):
         if self.window:
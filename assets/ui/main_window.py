@@ -7,15 +7,15 @@ gi.require_version("Gtk", "3.0")
 from gi.repository import Gtk, GObject, GLib, Gdk, Notify, AppIndicator3
 from datetime import datetime
 from assets.utils.debug import log_debug, log_connection, get_distro
-from assets.ui.other_ui import (
-        SpeedTestDialog,
-        QRCodeDialog,
-        QR_AVAILABLE, 
-        AboutDialog
-    )
-from assets.ui.proxy_ui import ProxyDialog
-from assets.ui.vpn_ui import VPNManagerDialog
-from assets.ui.wifi_ui import LogViewerDialog, HiddenNetworkDialog, PasswordDialog
+from assets.core.nm_backend import get_backend
+from assets.core.nm_events import get_event_monitor
+from assets.core.scan_cache import get_scan_cache
+from assets.core.async_cmd import call_async, run_async
+from assets.core.scheduler import get_scheduler
+from assets.core.connectivity import get_connectivity
+from assets.core.nmcli_parser import group_by_ssid
+# Dialogs are imported where they are opened: most sessions never show them,
+# and other_ui drags in qrcode/PIL
 
 class WifiWindow(Gtk.Window):
     def __init__(self, no_scan=False):
@@ -23,6 +23,7 @@ class WifiWindow(Gtk.Window):
         self.set_default_size(700, 550)
         self.set_border_width(0)
 
+        self.backend = get_backend()
         self.apply_theme()
         
         header = Gtk.HeaderBar()
@@ -101,7 +102,7 @@ class WifiWindow(Gtk.Window):
         airplane_icon = Gtk.Image.new_from_icon_name("airplane-mode-symbolic", Gtk.IconSize.BUTTON)
         self.airplane_button.set_image(airplane_icon)
         self.airplane_button.set_tooltip_text("Airplane Mode (toggle WiFi)")
-        self.airplane_button.connect("toggled", self.on_airplane_toggled)
+        self.airplane_toggled_id = self.airplane_button.connect("toggled", self.on_airplane_toggled)
         header.pack_start(self.airplane_button)
         
         self.update_airplane_state()
@@ -150,7 +151,9 @@ class WifiWindow(Gtk.Window):
 
         GLib.timeout_add(500, lambda: self.search_revealer.set_reveal_child(True))
         
-        self.store = Gtk.ListStore(str, str, str, str, str, str)  # SSID, Signal, Security, Icon, Full info, Type
+        self.store = Gtk.ListStore(str, int, str, str, str, str)  # Display SSID, Signal, Security, BSSID, SSID, Type
+        self.store.set_sort_column_id(1, Gtk.SortType.DESCENDING)
+        self.row_iters = {}  # SSID -> TreeIter, ListStore iters persist while the row exists
         self.filter = self.store.filter_new()
         self.filter.set_visible_func(self.filter_func)
         
@@ -174,7 +177,8 @@ class WifiWindow(Gtk.Window):
         tree.append_column(ssid_column)
         
         signal_renderer = Gtk.CellRendererText()
-        signal_column = Gtk.TreeViewColumn("Signal", signal_renderer, text=1)
+        signal_column = Gtk.TreeViewColumn("Signal", signal_renderer)
+        signal_column.set_cell_data_func(signal_renderer, self.signal_text_func)
         signal_column.set_sizing(Gtk.TreeViewColumnSizing.FIXED)
         signal_column.set_fixed_width(80)
         signal_column.set_sort_column_id(1)
@@ -210,17 +214,34 @@ class WifiWindow(Gtk.Window):
         self.current_ssid = None
         
         self.no_scan = no_scan
-        self.scan_in_progress = False
-        self.last_wifi_list = ""
-        self.last_wifi_time = 0
-
-        if not self.no_scan:
-            self.auto_refresh = True
-            GLib.timeout_add_seconds(10, self.auto_scan)
-        else:
-            self.auto_refresh = False
-                
-        GLib.timeout_add_seconds(5, self.update_header_status)
+        self.scan_cache = get_scan_cache()
+        self.scan_cache.add_listener(self.on_scan_results)
+        self.scan_silent = True
+
+        self.auto_refresh = not self.no_scan
+
+        # Created before our own subscriptions so it invalidates first on "state"
+        self.connectivity = get_connectivity()
+
+        # Push updates from NetworkManager when we can, poll otherwise
+        self.events = get_event_monitor()
+        self.event_ids = []
+        if self.events:
+            self.event_ids = [
+                self.events.subscribe("state", self.update_header_status),
+                self.events.subscribe("active-connections", self.update_header_status),
+                self.events.subscribe("radio", self.update_airplane_state),
+            ]
+
+        # Whatever still needs polling slows down while hidden and speeds up in focus
+        self.scheduler = get_scheduler()
+        self.poll_ids = []
+        if not self.events:
+            self.poll_ids.append(self.scheduler.add(5, self.update_header_status, view="window"))
+        if not self.no_scan and not (self.events and "access-points" in self.events.provides):
+            self.poll_ids.append(self.scheduler.add(10, self.auto_scan, view="window"))
+        for signal in ("show", "hide", "notify::is-active", "window-state-event"):
+            self.connect(signal, self.on_view_state_changed)
         
         Notify.init("connex")
         
@@ -232,32 +253,33 @@ class WifiWindow(Gtk.Window):
     
     def apply_theme(self):
         settings = Gtk.Settings.get_default()
-        try:
-            result = subprocess.run(
-                ["gsettings", "get", "org.gnome.desktop.interface", "color-scheme"],
-                capture_output=True, text=True, timeout=2
-            )
-            if "dark" in result.stdout.lower():
-                settings.set_property("gtk-application-prefer-dark-theme", True)
-            else:
-                settings.set_property("gtk-application-prefer-dark-theme", False)
-        except:
-            settings.set_property("gtk-application-prefer-dark-theme", True)
+
+        def on_color_scheme(code, out, err):
+            prefer_dark = "dark" in out.lower() if code == 0 else True
+            settings.set_property("gtk-application-prefer-dark-theme", prefer_dark)
+
+        run_async(["gsettings", "get", "org.gnome.desktop.interface", "color-scheme"],
+                  on_color_scheme, timeout=2)
     
     def update_header_status(self):
         if self.freeze_updates:
             return self.auto_refresh
 
-        code, out, err = self.run_cmd("nmcli -t -f GENERAL.STATE device show")
-
-        connected = "connected" in out.lower()
-        new_ssid = self.get_current_connection() if connected else None
+        call_async(self.read_header_status, callback=self.apply_header_status)
+        return self.auto_refresh
 
-        if connected == getattr(self, "_last_connected", None) and new_ssid == getattr(self, "_last_ssid", None):
-            return self.auto_refresh
+    def read_header_status(self):
+        connected = self.backend.is_connected()
+        if not connected:
+            return False, None, False
+        return True, self.get_current_connection(), self.connectivity.is_online()
 
-        self._last_connected = connected
-        self._last_ssid = new_ssid
+    def apply_header_status(self, status):
+        connected, new_ssid, online = status
+        self.current_ssid = new_ssid
+        if status == getattr(self, "_last_status", None):
+            return
+        self._last_status = status
 
         self.header_revealer.set_reveal_child(False)
 
@@ -267,7 +289,7 @@ class WifiWindow(Gtk.Window):
                     "network-wireless-signal-excellent-symbolic", Gtk.IconSize.BUTTON
                 )
 
-                if self.check_internet():
+                if online:
                     self.header_status_label.set_markup(
                         f"<b>{new_ssid}</b> <span color='green'>✓</span>"
                     )
@@ -283,7 +305,6 @@ class WifiWindow(Gtk.Window):
             return False
 
         GLib.timeout_add(150, update_and_reveal)
-        return self.auto_refresh
 
     def setup_keyboard_shortcuts(self):
         accel_group = Gtk.AccelGroup()
@@ -308,9 +329,14 @@ class WifiWindow(Gtk.Window):
         log_debug("Keyboard shortcuts initialized")
     
     def update_airplane_state(self):
-        code, out, err = self.run_cmd("nmcli radio wifi")
-        enabled = "enabled" in out.lower()
-        self.airplane_button.set_active(not enabled)
+        def apply(enabled):
+            if self.airplane_button.get_active() == enabled:
+                # Mirroring the radio, not a user toggle: don't switch it again
+                self.airplane_button.handler_block(self.airplane_toggled_id)
+                self.airplane_button.set_active(not enabled)
+                self.airplane_button.handler_unblock(self.airplane_toggled_id)
+
+        call_async(self.backend.wifi_enabled, callback=apply)
         return True
     
     def on_airplane_toggled(self, button):
@@ -319,10 +345,10 @@ class WifiWindow(Gtk.Window):
         self.header_revealer.set_reveal_child(False)
         self.status_revealer.set_reveal_child(False)
         
-        def apply_mode():
+        def apply_mode(result):
+            ok, err = result
             if active:
-                code, out, err = self.run_cmd("nmcli radio wifi off")
-                if code == 0:
+                if ok:
                     self.status_label.set_text("✈ Airplane mode enabled")
                     self.status_bar.set_message_type(Gtk.MessageType.WARNING)
                     self.scan_button.set_sensitive(False)
@@ -338,8 +364,7 @@ class WifiWindow(Gtk.Window):
                     button.set_active(False)
                     self.show_error("Failed to disable WiFi")
             else:
-                code, out, err = self.run_cmd("nmcli radio wifi on")
-                if code == 0:
+                if ok:
                     self.status_label.set_text("WiFi enabled")
                     self.status_bar.set_message_type(Gtk.MessageType.INFO)
                     self.scan_button.set_sensitive(True)
@@ -359,21 +384,27 @@ class WifiWindow(Gtk.Window):
             
             self.header_revealer.set_reveal_child(True)
             self.status_revealer.set_reveal_child(True)
-            return False
         
-        GLib.timeout_add(150, apply_mode)
+        def toggle_radio():
+            call_async(self.backend.set_wifi_enabled, not active, callback=apply_mode)
+            return False
+
+        GLib.timeout_add(150, toggle_radio)
     
     def show_speedtest(self, *_):
+        from assets.ui.other_ui import SpeedTestDialog
         dialog = SpeedTestDialog(self)
         dialog.run()
         dialog.destroy()
 
     def show_proxy_settings(self, *_):
+        from assets.ui.proxy_ui import ProxyDialog
         dialog = ProxyDialog(self)
         dialog.run()
         dialog.destroy()
 
     def show_vpn_manager(self, *_):
+        from assets.ui.vpn_ui import VPNManagerDialog
         dialog = VPNManagerDialog(self)
         dialog.run()
         dialog.destroy()
@@ -401,37 +432,26 @@ class WifiWindow(Gtk.Window):
             self.header_spinner.hide()
             self.header_status_icon.show()
 
-    def check_internet(self):
-        try:
-            result = subprocess.run(
-                ["ping", "-c", "1", "-W", "2", "1.1.1.1"],
-                capture_output=True, timeout=3
-            )
-            return result.returncode == 0
-        except:
-            return False
-    
     def signal_icon_func(self, column, cell, model, iter, data):
-        signal_str = model.get_value(iter, 1)
+        signal = model.get_value(iter, 1)
         net_type = model.get_value(iter, 5)
         
-        try:
-            signal = int(signal_str.rstrip('%'))
-            if net_type == "WiFi":
-                if signal >= 75:
-                    icon = "network-wireless-signal-excellent-symbolic"
-                elif signal >= 50:
-                    icon = "network-wireless-signal-good-symbolic"
-                elif signal >= 25:
-                    icon = "network-wireless-signal-ok-symbolic"
-                else:
-                    icon = "network-wireless-signal-weak-symbolic"
+        if net_type == "WiFi":
+            if signal >= 75:
+                icon = "network-wireless-signal-excellent-symbolic"
+            elif signal >= 50:
+                icon = "network-wireless-signal-good-symbolic"
+            elif signal >= 25:
+                icon = "network-wireless-signal-ok-symbolic"
             else:
-                icon = "network-wireless-symbolic"
-        except:
+                icon = "network-wireless-signal-weak-symbolic"
+        else:
             icon = "network-wireless-symbolic"
         
         cell.set_property("icon-name", icon)
+
+    def signal_text_func(self, column, cell, model, iter, data):
+        cell.set_property("text", f"{model.get_value(iter, 1)}%")
     
     def filter_func(self, model, iter, data):
         search_text = self.search_entry.get_text().lower()
@@ -443,6 +463,12 @@ class WifiWindow(Gtk.Window):
     def on_search_changed(self, entry):
         self.filter.refilter()
     
+    def on_view_state_changed(self, *args):
+        gdk_window = self.get_window()
+        iconified = bool(gdk_window and gdk_window.get_state() & Gdk.WindowState.ICONIFIED)
+        self.scheduler.set_view_state("window", self.get_visible() and not iconified, self.is_active())
+        return False
+
     def auto_scan(self):
         if self.auto_refresh and self.is_visible():
             self.scan_networks(silent=True)
@@ -462,43 +488,34 @@ class WifiWindow(Gtk.Window):
             return 1, "", str(e)
     
     def get_current_connection(self):
-        code, out, err = self.run_cmd("nmcli -t -f NAME,TYPE,DEVICE connection show --active")
-        for line in out.splitlines():
-            parts = line.split(':')
-            if len(parts) >= 2 and parts[1] == "802-11-wireless":
-                self.current_ssid = parts[0]
-                return parts[0]
-        self.current_ssid = None
+        # Runs in a worker: only returns, apply_header_status stores it
+        for conn in self.backend.get_active_connections():
+            if conn['type'] == "802-11-wireless":
+                return conn['name']
         return None
     
     def scan_networks(self, silent=False, do_rescan=False):
-        if self.scan_in_progress:
-            return
-
-        now = time.time()
-        if self.last_wifi_list and now - self.last_wifi_time < 5:
-            self.update_network_list(0, self.last_wifi_list, "", silent)
-            return
-
-        if not silent:
+        if not silent and (do_rescan or not self.scan_cache.is_fresh()):
+            self.scan_silent = False
             self.set_status_animated("Scanning networks...", Gtk.MessageType.INFO, show_spinner=True)
             self.status_bar.set_message_type(Gtk.MessageType.INFO)
             self.scan_button.set_sensitive(False)
-        
-        def scan_thread():
-            self.scan_in_progress = True
-            if do_rescan:
-                subprocess.run(["nmcli", "device", "wifi", "rescan"], capture_output=True, timeout=5)
-            
-            code, out, err = self.run_cmd("nmcli -t -f SSID,SIGNAL,SECURITY device wifi list")
-            self.last_wifi_list = out
-            self.last_wifi_time = time.time()
-            self.scan_in_progress = False
-            GLib.idle_add(self.update_network_list, code, out, err, silent)
-        
-        threading.Thread(target=scan_thread, daemon=True).start()
+
+        # Shared with the tray: stale results are painted immediately and
+        # on_scan_results repaints once the background refresh is done.
+        networks = self.scan_cache.get(rescan=do_rescan)
+        if networks is not None and not do_rescan:
+            self.update_network_list(networks, silent or self.scan_cache.refreshing)
+        return False
+
+    def on_scan_results(self, networks):
+        if self.scan_silent and not self.auto_refresh:
+            return
+        silent = self.scan_silent
+        self.scan_silent = True
+        self.update_network_list(networks, silent)
     
-    def update_network_list(self, code, out, err, silent):
+    def update_network_list(self, networks, silent):
         if self.freeze_updates:
             return False
 
@@ -510,27 +527,19 @@ class WifiWindow(Gtk.Window):
         self.header_spinner.hide()
         self.header_status_icon.show()
         
-        if code != 0:
+        if networks is None:
             if not silent:
-                self.set_status_animated(f"Scan failed: {err or 'nmcli error'}", Gtk.MessageType.ERROR)
+                self.set_status_animated("Scan failed: NetworkManager error", Gtk.MessageType.ERROR)
             return False
         
-        self.current_connection = self.get_current_connection()
-        self.store.clear()
+        self.current_connection = next((n['ssid'] for n in networks if n['in_use']), None)
         
-        seen_ssids = set()
-        for line in out.splitlines():
-            if not line.strip():
-                continue
-            parts = line.split(':')
-            ssid = parts[0] if parts[0] else "<Hidden Network>"
-            
-            if ssid in seen_ssids:
-                continue
-            seen_ssids.add(ssid)
-            
-            signal = parts[1] if len(parts) > 1 else "0"
-            sec = parts[2] if len(parts) > 2 else "Open"
+        rows = {}
+        # One row per SSID, showing its strongest access point
+        for net in group_by_ssid(networks):
+            ssid = net['ssid'] or "<Hidden Network>"
+            signal = net['signal']
+            sec = net['security']
             
             if not sec or sec == "--":
                 sec_display = "Open"
@@ -545,9 +554,9 @@ class WifiWindow(Gtk.Window):
             
             display_ssid = f"● {ssid}" if ssid == self.current_connection else ssid
             
-            self.store.append([display_ssid, f"{signal}%", sec_display, signal, ssid, "WiFi"])
+            rows[ssid] = (display_ssid, signal, sec_display, net['bssid'], ssid, "WiFi")
         
-        self.store.set_sort_column_id(3, Gtk.SortType.DESCENDING)
+        self.apply_rows(rows)
 
         count = len(self.store)
         if not silent:
@@ -558,6 +567,24 @@ class WifiWindow(Gtk.Window):
             
         return False
     
+    def apply_rows(self, rows):
+        # Touch only rows that appeared, vanished or changed so selection,
+        # scroll position and the filter model survive a rescan
+        for ssid in list(self.row_iters):
+            if ssid not in rows:
+                self.store.remove(self.row_iters.pop(ssid))
+
+        columns = list(range(self.store.get_n_columns()))
+        for ssid, row in rows.items():
+            it = self.row_iters.get(ssid)
+            if it is None:
+                self.row_iters[ssid] = self.store.append(list(row))
+                continue
+            current = self.store.get(it, *columns)
+            changed = [col for col in columns if current[col] != row[col]]
+            if changed:
+                self.store.set(it, changed, [row[col] for col in changed])
+
     def on_scan_clicked(self, *_):
         self.scan_networks(do_rescan=True)
 
@@ -572,12 +599,16 @@ class WifiWindow(Gtk.Window):
             if (datetime.now() - self.last_resize_time).total_seconds() > 1.5:
                 self.auto_refresh = not self.no_scan
                 self.freeze_updates = False
+                if self.events:
+                    # events that arrived while frozen were dropped
+                    self.update_header_status()
                 return False
             return True
         GLib.timeout_add(1500, reenable)
 
     
     def connect_hidden_network(self, *_):
+        from assets.ui.wifi_ui import HiddenNetworkDialog
         dialog = HiddenNetworkDialog(self)
         response = dialog.run()
         
@@ -597,13 +628,13 @@ class WifiWindow(Gtk.Window):
         model = tree.get_model()
         ssid = model[path][4]
         security = model[path][2]
-        signal = model[path][3]
+        signal = model[path][1]
 
         if "EAP" in security or "8021x" in security or ssid.lower() == "eduroam":
             self.set_status_animated(f"Connecting to {ssid} using system profile...",Gtk.MessageType.INFO, show_spinner=True)
             def eap_connect():
                 code, out, err = self.run_cmd(f"nmcli connection up '{ssid}'")
-                GLib.idle_add(self.on_connect_done, code, out, err, ssid, "0")
+                GLib.idle_add(self.on_connect_done, code, out, err, ssid, 0)
 
             threading.Thread(target=eap_connect, daemon=True).start()
             return
@@ -628,6 +659,7 @@ class WifiWindow(Gtk.Window):
         if security == "Open":
             self.connect_to_network(ssid, "", signal=signal)
         else:
+            from assets.ui.wifi_ui import PasswordDialog
             dialog = PasswordDialog(self, ssid, security)
             response = dialog.run()
             
@@ -641,11 +673,12 @@ class WifiWindow(Gtk.Window):
             else:
                 dialog.destroy()
     
-    def connect_to_network(self, ssid, password, hidden=False, signal="0"):
+    def connect_to_network(self, ssid, password, hidden=False, signal=0):
         self.set_status_animated(f"Connecting to {ssid}...", Gtk.MessageType.INFO, show_spinner=True)
         
         def connect_thread():
             self.forget_network(ssid, True)
+            started = time.monotonic()
 
             args = ["nmcli", "device", "wifi", "connect", ssid]
             if password:
@@ -656,13 +689,19 @@ class WifiWindow(Gtk.Window):
             try:
                 result = subprocess.run(args, capture_output=True, text=True, timeout=20)
                 GLib.idle_add(self.on_connect_done, result.returncode, 
-                            result.stdout, result.stderr, ssid, signal)
+                            result.stdout, result.stderr, ssid, signal, time.monotonic() - started)
             except subprocess.TimeoutExpired:
-                GLib.idle_add(self.on_connect_done, 1, "", "Connection timed out", ssid, signal)
+                GLib.idle_add(self.on_connect_done, 1, "", "Connection timed out", ssid, signal,
+                              time.monotonic() - started)
         
         threading.Thread(target=connect_thread, daemon=True).start()
     
-    def on_connect_done(self, code, out, err, ssid, signal):
+    def bssid_for(self, ssid):
+        it = self.row_iters.get(ssid)
+        return self.store.get_value(it, 3) if it else ""
+
+    def on_connect_done(self, code, out, err, ssid, signal, duration=None):
+        bssid = self.bssid_for(ssid)
         if code == 0:
             self.set_status_animated(f"✓ Connected to {ssid}", Gtk.MessageType.INFO)
             
@@ -677,7 +716,7 @@ class WifiWindow(Gtk.Window):
             )
             notification.show()
             
-            log_connection(ssid, signal, True)
+            log_connection(ssid, signal, True, bssid=bssid, duration=duration)
             
             GLib.timeout_add(1000, lambda: self.scan_networks(silent=True))
             GLib.timeout_add(1000, self.update_header_status)
@@ -709,13 +748,16 @@ class WifiWindow(Gtk.Window):
             )
             notification.show()
             
-            log_connection(ssid, signal, False, error_msg)
+            log_connection(ssid, signal, False, error_msg, bssid=bssid, duration=duration)
         
         return False
     
     def disconnect_network(self, ssid):
-        code, out, err = self.run_cmd(f"nmcli connection down '{ssid}'")
-        if code == 0:
+        call_async(self.backend.deactivate_connection, ssid,
+                   callback=lambda result: self.on_disconnect_done(ssid, *result))
+
+    def on_disconnect_done(self, ssid, ok, err):
+        if ok:
             self.status_label.set_text(f"Disconnected from {ssid}")
             self.status_bar.set_message_type(Gtk.MessageType.INFO)
             
@@ -770,6 +812,7 @@ class WifiWindow(Gtk.Window):
         menu.popup_at_pointer(event)
 
     def show_qr_code(self, ssid, security):
+        from assets.ui.other_ui import QR_AVAILABLE
         password = ""
         if not QR_AVAILABLE:
             if get_distro() == "arch":
@@ -778,28 +821,34 @@ class WifiWindow(Gtk.Window):
                 self.show_error("QR code generation requires: pip install qrcode[pil] pillow")
             return
         
-        if security != "Open":
-            code, out, err = self.run_cmd(f"nmcli -s -g 802-11-wireless-security.psk connection show '{ssid}'")
+        if security == "Open":
+            self.open_qr_dialog(ssid, password, security)
+            return
+
+        def on_psk(code, out, err):
             if code == 0 and out:
-                password = out.strip()
-            else:
-                dialog = PasswordDialog(self, ssid, security)
-                response = dialog.run()
-                if response == Gtk.ResponseType.OK:
-                    password = dialog.get_password()
-                    dialog.destroy()
-                else:
-                    dialog.destroy()
-                    return
-        
+                self.open_qr_dialog(ssid, out.strip(), security)
+                return
+            from assets.ui.wifi_ui import PasswordDialog
+            dialog = PasswordDialog(self, ssid, security)
+            response = dialog.run()
+            password = dialog.get_password()
+            dialog.destroy()
+            if response == Gtk.ResponseType.OK:
+                self.open_qr_dialog(ssid, password, security)
+
+        run_async(["nmcli", "-s", "-g", "802-11-wireless-security.psk", "connection", "show", ssid], on_psk)
+
+    def open_qr_dialog(self, ssid, password, security):
+        from assets.ui.other_ui import QRCodeDialog
         qr_dialog = QRCodeDialog(self, ssid, password, security)
         qr_dialog.run()
         qr_dialog.destroy()
     
     def forget_network(self, ssid, quick=False):
         if quick:
-            code, out, err = self.run_cmd(f"nmcli connection delete '{ssid}'")
-            if code == 0:
+            ok, err = self.backend.delete_connection(ssid)
+            if ok:
                 log_debug("Forgoted sucessfully")
             else:
                 log_debug("Network not saved")
@@ -810,18 +859,22 @@ class WifiWindow(Gtk.Window):
             )
             
             if response == Gtk.ResponseType.YES:
-                code, out, err = self.run_cmd(f"nmcli connection delete '{ssid}'")
-                if code == 0:
-                    self.status_label.set_text(f"Forgot network {ssid}")
-                    self.status_bar.set_message_type(Gtk.MessageType.INFO)
-                else:
-                    self.status_label.set_text(f"Network {ssid} was not saved")
-                    self.status_bar.set_message_type(Gtk.MessageType.WARNING)
+                call_async(self.backend.delete_connection, ssid,
+                           callback=lambda result: self.on_forget_done(ssid, *result))
+
+    def on_forget_done(self, ssid, ok, err):
+        if ok:
+            self.status_label.set_text(f"Forgot network {ssid}")
+            self.status_bar.set_message_type(Gtk.MessageType.INFO)
+        else:
+            self.status_label.set_text(f"Network {ssid} was not saved")
+            self.status_bar.set_message_type(Gtk.MessageType.WARNING)
     
     def show_connection_info(self, *_):
-        code, out, err = self.run_cmd("nmcli -t -f GENERAL,IP4 device show")
-        
-        if code == 0 and out:
+        call_async(self.backend.device_show, callback=self.display_connection_info)
+
+    def display_connection_info(self, rows):
+        if rows:
             dialog = Gtk.MessageDialog(
                 parent=self,
                 modal=True,
@@ -831,10 +884,9 @@ class WifiWindow(Gtk.Window):
             )
             
             info_lines = []
-            for line in out.splitlines()[:20]:
-                if any(x in line for x in ["IP4.ADDRESS", "IP4.GATEWAY", "IP4.DNS", 
-                                           "GENERAL.CONNECTION", "GENERAL.STATE"]):
-                    key, val = line.split(":", 1)
+            for key, val in rows[:20]:
+                if any(x in key for x in ["IP4.ADDRESS", "IP4.GATEWAY", "IP4.DNS", 
+                                          "GENERAL.CONNECTION", "GENERAL.STATE"]):
                     key = key.replace("GENERAL.", "").replace("IP4.", "")
                     info_lines.append(f"{key}: {val}")
             
@@ -847,11 +899,13 @@ class WifiWindow(Gtk.Window):
             self.show_error("Could not retrieve connection info")
     
     def show_history(self, *_):
+        from assets.ui.wifi_ui import LogViewerDialog
         dialog = LogViewerDialog(self)
         dialog.run()
         dialog.destroy()
     
     def show_about(self, *_):
+        from assets.ui.other_ui import AboutDialog
         dialog = AboutDialog(self)
         dialog.run()
         dialog.destroy()
@@ -883,4 +937,13 @@ class WifiWindow(Gtk.Window):
     
     def do_destroy(self):
         self.auto_refresh = False
+        self.scan_cache.remove_listener(self.on_scan_results)
+        for handle in self.poll_ids:
+            self.scheduler.remove(handle)
+        self.poll_ids = []
+        self.scheduler.set_view_state("window", False)
+        log_debug(f"Poll scheduler: {self.scheduler.stats()}")
+        for handle in self.event_ids:
+            self.events.unsubscribe(handle)
+        self.event_ids = []
         Gtk.Window.do_destroy(self)
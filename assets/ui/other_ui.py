@@ -1,19 +1,16 @@
 import gi
+import importlib.util
 import threading
 import webbrowser
 gi.require_version("Gtk", "3.0")
 from gi.repository import Gtk, GObject, GLib, Gdk, Notify, AppIndicator3, GdkPixbuf
 from assets.utils.debug import HISTORY_FILE
-from assets.core.speedtest import SpeedTest
+from assets.core.speedtest import (SpeedTest, speedtest_streams, speedtest_duration, sparkline, MAX_STREAMS,
+                                   MIN_DURATION, MAX_DURATION)
 
 
-try:
-    import qrcode
-    from PIL import Image
-    from io import BytesIO
-    QR_AVAILABLE = True
-except ImportError:
-    QR_AVAILABLE = False
+# Checked without importing: qrcode and PIL are only loaded when a QR code is drawn
+QR_AVAILABLE = all(importlib.util.find_spec(m) is not None for m in ("qrcode", "PIL"))
 
 VERSION = "1.4.1"
 
@@ -21,6 +18,7 @@ VERSION = "1.4.1"
 class SpeedTestDialog(Gtk.Dialog):
     def __init__(self, parent):
         super().__init__(title="Speed Test", parent=parent, modal=True)
+        self.add_button("Run Again", Gtk.ResponseType.APPLY)
         self.add_button("Cancel", Gtk.ResponseType.CANCEL)
         self.add_button("Close", Gtk.ResponseType.CLOSE)
         self.set_default_size(500, 350)
@@ -40,6 +38,17 @@ class SpeedTestDialog(Gtk.Dialog):
         title.set_xalign(0)
         box.pack_start(title, False, False, 0)
 
+        streams_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
+        streams_box.pack_start(Gtk.Label(label="Parallel streams:"), False, False, 0)
+        self.streams_spin = Gtk.SpinButton.new_with_range(1, MAX_STREAMS, 1)
+        self.streams_spin.set_value(speedtest_streams())
+        streams_box.pack_start(self.streams_spin, False, False, 0)
+        streams_box.pack_start(Gtk.Label(label="Seconds per direction:"), False, False, 12)
+        self.duration_spin = Gtk.SpinButton.new_with_range(MIN_DURATION, MAX_DURATION, 1)
+        self.duration_spin.set_value(min(max(speedtest_duration(), MIN_DURATION), MAX_DURATION))
+        streams_box.pack_start(self.duration_spin, False, False, 0)
+        box.pack_start(streams_box, False, False, 0)
+
         self.progress = Gtk.ProgressBar()
         self.progress.set_show_text(True)
         self.progress.set_text("Ready to start")
@@ -69,10 +78,21 @@ class SpeedTestDialog(Gtk.Dialog):
         self.download_label = Gtk.Label(label="Download: --")
         self.download_label.set_xalign(0)
         results_box.pack_start(self.download_label, False, False, 0)
+        self.download_series = Gtk.Label(label="")
+        self.download_series.set_xalign(0)
+        results_box.pack_start(self.download_series, False, False, 0)
         
         self.upload_label = Gtk.Label(label="Upload: --")
         self.upload_label.set_xalign(0)
         results_box.pack_start(self.upload_label, False, False, 0)
+        self.upload_series = Gtk.Label(label="")
+        self.upload_series.set_xalign(0)
+        results_box.pack_start(self.upload_series, False, False, 0)
+
+        self.bloat_label = Gtk.Label(label="Latency under load: --")
+        self.bloat_label.set_xalign(0)
+        self.bloat_label.set_line_wrap(True)
+        results_box.pack_start(self.bloat_label, False, False, 0)
         
         results_frame.add(results_box)
         box.pack_start(results_frame, True, True, 0)
@@ -83,7 +103,11 @@ class SpeedTestDialog(Gtk.Dialog):
         self.start_test()
     
     def on_response(self, dialog, response):
-        if response == Gtk.ResponseType.CANCEL and self.test_running:
+        if response == Gtk.ResponseType.APPLY:
+            if not self.test_running:
+                self.start_test()
+            self.stop_emission_by_name("response")
+        elif response == Gtk.ResponseType.CANCEL and self.test_running:
             if self.test:
                 self.test.cancel()
                 self.status_label.set_markup("<span color='orange'>⚠ Test cancelled</span>")
@@ -91,7 +115,10 @@ class SpeedTestDialog(Gtk.Dialog):
     
     def start_test(self):
         self.test_running = True
-        self.test = SpeedTest(callback=self.on_progress)
+        self.set_options_sensitive(False)
+        self.clear_results()
+        self.test = SpeedTest(callback=self.on_progress, streams=self.streams_spin.get_value_as_int(),
+                              duration=self.duration_spin.get_value())
         self.test_thread = threading.Thread(target=self.run_test, daemon=True)
         self.test_thread.start()
     
@@ -103,6 +130,26 @@ class SpeedTestDialog(Gtk.Dialog):
             GLib.idle_add(self.show_error, f"Test error: {str(e)}")
         finally:
             self.test_running = False
+            GLib.idle_add(self.set_options_sensitive, True)
+
+    def set_options_sensitive(self, sensitive):
+        self.streams_spin.set_sensitive(sensitive)
+        self.duration_spin.set_sensitive(sensitive)
+        return False
+
+    def clear_results(self):
+        # A run that fails part way must not leave the last run's numbers up
+        self.progress.set_fraction(0)
+        self.progress.set_text("Starting...")
+        self.status_label.set_text("")
+        self.server_label.set_text("Server: --")
+        self.ping_label.set_text("Ping: --")
+        self.ping_label.set_tooltip_text(None)
+        self.download_label.set_text("Download: --")
+        self.download_series.set_text("")
+        self.upload_label.set_text("Upload: --")
+        self.upload_series.set_text("")
+        self.bloat_label.set_text("Latency under load: --")
     
     def on_progress(self, stage, progress, message):
         GLib.idle_add(self.update_progress, progress, message)
@@ -133,6 +180,8 @@ class SpeedTestDialog(Gtk.Dialog):
         download = results.get('download', 0)
         upload = results.get('upload', 0)
         
+        if results.get('server_latency'):
+            server = f"{server} ({results['server_latency']:.0f} ms)"
         self.server_label.set_markup(f"<b>Server:</b> {server}")
         
         if ping < 50:
@@ -143,7 +192,11 @@ class SpeedTestDialog(Gtk.Dialog):
             ping_color = "red"
         self.ping_label.set_markup(
             f"<b>Ping:</b> <span color='{ping_color}'>{ping:.1f} ms</span>"
+            f"  <small>jitter {results.get('jitter', 0):.1f} ms · loss {results.get('loss', 0):.0f}%</small>"
         )
+        targets = [f"{name} {stats['avg']:.1f} ms" if stats['loss'] < 100 else f"{name} no reply"
+                   for name, stats in results.get('latency', {}).items()]
+        self.ping_label.set_tooltip_text(", ".join(targets) or None)
 
         if download > 50:
             dl_color = "green"
@@ -153,7 +206,9 @@ class SpeedTestDialog(Gtk.Dialog):
             dl_color = "red"
         self.download_label.set_markup(
             f"<b>Download:</b> <span color='{dl_color}'>{download:.2f} Mbps</span>"
+            f"{self.format_spread(results.get('download_stats'))}"
         )
+        self.download_series.set_markup(self.format_series(results.get('download_series')))
         
         if upload > 0:
             if upload > 20:
@@ -164,16 +219,41 @@ class SpeedTestDialog(Gtk.Dialog):
                 ul_color = "red"
             self.upload_label.set_markup(
                 f"<b>Upload:</b> <span color='{ul_color}'>{upload:.2f} Mbps</span>"
+                f"{self.format_spread(results.get('upload_stats'))}"
             )
+            self.upload_series.set_markup(self.format_series(results.get('upload_series')))
         else:
-            self.upload_label.set_text("Upload: Not tested")
+            self.upload_label.set_text("Upload: unavailable")
         
+        bloat = results.get('bufferbloat')
+        if bloat:
+            grade = bloat['grade']
+            bloat_color = "green" if grade.startswith("A") else "orange" if grade in ("B", "C") else "red"
+            loaded = " · ".join(f"{stage} {bloat[stage]:.0f} ms" for stage in ('download', 'upload') if stage in bloat)
+            self.bloat_label.set_markup(
+                f"<b>Latency under load:</b> <span color='{bloat_color}'>grade {grade}</span>"
+                f"  <small>idle {bloat['idle']:.0f} ms · {loaded}</small>"
+            )
+        else:
+            self.bloat_label.set_text("Latency under load: not measured")
+
         self.progress.set_fraction(1.0)
         self.progress.set_text("Test complete!")
         self.status_label.set_markup("<span color='green'>✓ Test completed successfully</span>")
         
         return False
     
+    @staticmethod
+    def format_spread(stats):
+        if not stats:
+            return ""
+        return f"  <small>p90 {stats['p90']:.2f} · peak {stats['peak']:.2f}</small>"
+
+    @staticmethod
+    def format_series(series):
+        line = sparkline(series or [])
+        return f"<tt>{line}</tt>" if line else ""
+
     def show_error(self, message):
         self.progress.set_fraction(0)
         self.progress.set_text("Failed")
@@ -249,6 +329,7 @@ class QRCodeDialog(Gtk.Dialog):
         return qr_string
     
     def create_qr_image(self, data):
+        import qrcode
         qr = qrcode.QRCode(
             version=1,
             error_correction=qrcode.constants.ERROR_CORRECT_L,
@@ -262,6 +343,7 @@ class QRCodeDialog(Gtk.Dialog):
         return img
     
     def pil_to_pixbuf(self, pil_image):
+        from io import BytesIO
         if pil_image.mode != 'RGB':
             pil_image = pil_image.convert('RGB')
 
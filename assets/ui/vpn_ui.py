@@ -1,4 +1,7 @@
 from assets.core.vpn_manager import VPNManager
+from assets.core.nm_events import get_event_monitor
+from assets.core.async_cmd import call_async
+from assets.core.scheduler import get_scheduler
 import gi
 gi.require_version("Gtk", "3.0")
 from gi.repository import Gtk, GObject, GLib, Gdk, Notify, AppIndicator3, GdkPixbuf
@@ -504,7 +507,19 @@ class VPNManagerDialog(Gtk.Dialog):
         
         self.connect("response", self.on_dialog_response)
         
-        self.auto_refresh_id = GLib.timeout_add_seconds(8, self.auto_refresh_vpns)
+        self.auto_refresh_id = None
+        self.scheduler = get_scheduler()
+        self.events = get_event_monitor()
+        self.event_ids = []
+        if self.events:
+            self.event_ids = [
+                self.events.subscribe("active-connections", self.load_vpn_list),
+                self.events.subscribe("connections", self.load_vpn_list),
+            ]
+        else:
+            self.auto_refresh_id = self.scheduler.add(8, self.auto_refresh_vpns, view="vpn")
+            for signal in ("show", "hide", "notify::is-active"):
+                self.connect(signal, self.on_view_state_changed)
 
     
     def status_icon_func(self, column, cell, model, iter, data):
@@ -590,6 +605,9 @@ class VPNManagerDialog(Gtk.Dialog):
 
         return False
     
+    def on_view_state_changed(self, *args):
+        self.scheduler.set_view_state("vpn", self.get_visible(), self.is_active())
+
     def auto_refresh_vpns(self):
         if self.get_visible():
             self.load_vpn_list()
@@ -729,13 +747,15 @@ class VPNManagerDialog(Gtk.Dialog):
         )
         
         if response == Gtk.ResponseType.YES:
-            success, message = self.manager.delete_vpn(name)
-            
-            if success:
-                self.set_status(f"✓ Deleted {name}", Gtk.MessageType.INFO)
-                self.load_vpn_list()
-            else:
-                self.set_status(f"✗ {message}", Gtk.MessageType.ERROR)
+            call_async(self.manager.delete_vpn, name,
+                       callback=lambda result: self.on_delete_done(name, *result))
+
+    def on_delete_done(self, name, success, message):
+        if success:
+            self.set_status(f"✓ Deleted {name}", Gtk.MessageType.INFO)
+            self.load_vpn_list()
+        else:
+            self.set_status(f"✗ {message}", Gtk.MessageType.ERROR)
     
     def on_add_vpn(self, *_):
         dialog = AddVPNDialog(self)
@@ -827,6 +847,12 @@ class VPNManagerDialog(Gtk.Dialog):
         return response
     
     def on_dialog_response(self, dialog, response):
+        # "Add VPN" also emits a response but keeps the dialog open
+        if response == Gtk.ResponseType.NONE:
+            return
         if self.auto_refresh_id:
-            GLib.source_remove(self.auto_refresh_id)
+            self.scheduler.remove(self.auto_refresh_id)
             self.auto_refresh_id = None
+        for handle in self.event_ids:
+            self.events.unsubscribe(handle)
+        self.event_ids = []
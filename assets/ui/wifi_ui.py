@@ -1,7 +1,9 @@
 import gi
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk, GObject, GLib, Gdk, Notify, AppIndicator3, GdkPixbuf
-from assets.utils.debug import HISTORY_FILE
+from gi.repository import Gtk, GObject, GLib, Gdk, Gio, Notify, AppIndicator3, GdkPixbuf
+from datetime import datetime
+from assets.core.history import get_history, OUTCOME_SUCCESS, OUTCOME_FAILED
+from assets.core.async_cmd import call_async
 
 class PasswordDialog(Gtk.Dialog):
     def __init__(self, parent, ssid, security):
@@ -151,12 +153,30 @@ class HiddenNetworkDialog(Gtk.Dialog):
         return self.password_entry.get_text()
 
 class LogViewerDialog(Gtk.Dialog):
+    # Rows are pulled from the history store a page at a time as the list scrolls
+    PAGE_SIZE = 200
+    FOLLOW_DEBOUNCE_MS = 300
+    SEARCH_DEBOUNCE_MS = 250
+    OUTCOMES = [("All", None), ("Successful", OUTCOME_SUCCESS), ("Failed", OUTCOME_FAILED)]
+
     def __init__(self, parent):
         super().__init__(title="Connection History", parent=parent, modal=True)
         self.add_button("Clear History", Gtk.ResponseType.APPLY)
         self.add_button("Close", Gtk.ResponseType.CLOSE)
         self.set_default_size(700, 400)
-        
+
+        self.history = get_history()
+        self.oldest_id = None
+        self.newest_id = 0
+        self.exhausted = False
+        self.monitor = None
+        self.follow_pending = None
+        self.search_pending = None
+        # Bumped by reload(); replies to queries made for older filters are dropped
+        self.generation = 0
+        self.loading = False
+        self.fetching = False
+
         box = self.get_content_area()
         box.set_spacing(6)
         box.set_margin_start(12)
@@ -164,40 +184,184 @@ class LogViewerDialog(Gtk.Dialog):
         box.set_margin_top(12)
         box.set_margin_bottom(12)
 
+        controls = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+
+        self.search_entry = Gtk.SearchEntry()
+        self.search_entry.set_placeholder_text("Search SSID, BSSID or error...")
+        self.search_entry.connect("search-changed", self.on_search_changed)
+        controls.pack_start(self.search_entry, True, True, 0)
+
+        self.outcome_combo = Gtk.ComboBoxText()
+        for label, _ in self.OUTCOMES:
+            self.outcome_combo.append_text(label)
+        self.outcome_combo.set_active(0)
+        self.outcome_combo.connect("changed", lambda *_: self.reload())
+        controls.pack_start(self.outcome_combo, False, False, 0)
+
+        self.follow_check = Gtk.CheckButton(label="Follow")
+        self.follow_check.set_tooltip_text("Show new attempts as they are recorded")
+        self.follow_check.connect("toggled", self.on_follow_toggled)
+        controls.pack_start(self.follow_check, False, False, 0)
+
+        box.pack_start(controls, False, False, 0)
+
+        # id, Time, SSID, BSSID, Signal, Result, Duration, Error
+        self.store = Gtk.ListStore(int, str, str, str, int, str, str, str)
+        self.tree = Gtk.TreeView(model=self.store)
+        self.tree.set_fixed_height_mode(True)
+        for index, (title, width) in enumerate([
+            ("Time", 150), ("SSID", 140), ("BSSID", 140), ("Signal", 60),
+            ("Result", 80), ("Duration", 70), ("Error", 200)
+        ], start=1):
+            column = Gtk.TreeViewColumn(title, Gtk.CellRendererText(), text=index)
+            column.set_sizing(Gtk.TreeViewColumnSizing.FIXED)
+            column.set_fixed_width(width)
+            column.set_resizable(True)
+            self.tree.append_column(column)
+
         scroll = Gtk.ScrolledWindow()
         scroll.set_vexpand(True)
-        
-        self.text_view = Gtk.TextView()
-        self.text_view.set_editable(False)
-        self.text_view.set_monospace(True)
-        self.text_view.set_wrap_mode(Gtk.WrapMode.WORD)
-        
-        scroll.add(self.text_view)
+        scroll.add(self.tree)
+        scroll.get_vadjustment().connect("value-changed", self.on_scrolled)
         box.pack_start(scroll, True, True, 0)
-        
-        self.load_history()
+
+        self.count_label = Gtk.Label()
+        self.count_label.set_xalign(0)
+        box.pack_start(self.count_label, False, False, 0)
+
+        self.reload()
         self.show_all()
-        
+
         self.connect("response", self.on_response)
-    
-    def load_history(self):
-        buffer = self.text_view.get_buffer()
-        if HISTORY_FILE.exists():
-            with open(HISTORY_FILE, "r") as f:
-                content = f.read()
-                if content:
-                    buffer.set_text(content)
-                else:
-                    buffer.set_text("No connection history yet.")
-        else:
-            buffer.set_text("No connection history yet.")
+        self.connect("destroy", self.on_destroy)
+
+    def filters(self):
+        filters = {}
+        search = self.search_entry.get_text().strip()
+        if search:
+            filters["search"] = search
+        outcome = self.OUTCOMES[max(self.outcome_combo.get_active(), 0)][1]
+        if outcome:
+            filters["outcome"] = outcome
+        return filters
+
+    def row_for(self, record):
+        stamp = datetime.fromtimestamp(record['ts']).strftime("%Y-%m-%d %H:%M:%S")
+        duration = f"{record['duration']:.1f}s" if record['duration'] is not None else ""
+        return [record['id'], stamp, record['ssid'], record['bssid'], record['signal'] or 0,
+                "✓" if record['outcome'] == OUTCOME_SUCCESS else "✗", duration, record['error']]
+
+    def on_search_changed(self, *_):
+        if self.search_pending:
+            GLib.source_remove(self.search_pending)
+        self.search_pending = GLib.timeout_add(self.SEARCH_DEBOUNCE_MS, self.on_search_settled)
+
+    def on_search_settled(self):
+        self.search_pending = None
+        self.reload()
+        return False
+
+    def current(self, generation, callback):
+        # Wraps a main loop callback so it only runs if no reload happened since
+        def run(result):
+            if generation == self.generation:
+                callback(result)
+        return run
+
+    def reload(self):
+        self.generation += 1
+        self.store.clear()
+        self.oldest_id = None
+        self.exhausted = False
+        self.newest_id = 0
+        self.loading = False
+        self.fetching = False
+        self.load_page()
+        self.update_count()
+
+    def update_count(self):
+        # Queries can reach into the gzip archives, so they all run off the main loop
+        call_async(self.history.count, callback=self.current(self.generation, self.show_count),
+                   **self.filters())
+
+    def show_count(self, total):
+        self.count_label.set_markup(
+            f"<small>{total} entries</small>" if total else "<small>No connection history yet.</small>"
+        )
+
+    def load_page(self):
+        if self.exhausted or self.loading:
+            return
+        self.loading = True
+        call_async(self.history.query, callback=self.current(self.generation, self.show_page),
+                   limit=self.PAGE_SIZE, before_id=self.oldest_id, **self.filters())
+
+    def show_page(self, records):
+        self.loading = False
+        for record in records:
+            self.store.append(self.row_for(record))
+        if records:
+            self.oldest_id = records[-1]['id']
+            self.newest_id = max(self.newest_id, records[0]['id'])
+        self.exhausted = len(records) < self.PAGE_SIZE
+
+    def on_scrolled(self, adjustment):
+        # Fetch the next page once the user gets within a screen of the end
+        if adjustment.get_value() + 2 * adjustment.get_page_size() >= adjustment.get_upper():
+            self.load_page()
+
+    def on_follow_toggled(self, button):
+        if button.get_active() and self.monitor is None:
+            # Every commit touches history.db-wal (or history.db after a checkpoint)
+            directory = Gio.File.new_for_path(str(self.history.path.parent))
+            self.monitor = directory.monitor_directory(Gio.FileMonitorFlags.NONE, None)
+            self.monitor.connect("changed", self.on_history_changed)
+            self.fetch_new()
+        elif not button.get_active() and self.monitor:
+            self.monitor.cancel()
+            self.monitor = None
+
+    def on_history_changed(self, monitor, file, other, event):
+        # Writers change the db or its WAL; -shm is touched by every reader, this one included
+        name = self.history.path.name
+        if file.get_basename() not in (name, f"{name}-wal") or self.follow_pending:
+            return
+        self.follow_pending = GLib.timeout_add(self.FOLLOW_DEBOUNCE_MS, self.fetch_new)
+
+    def fetch_new(self):
+        self.follow_pending = None
+        if not self.fetching:
+            self.fetching = True
+            call_async(self.history.query, callback=self.current(self.generation, self.show_new),
+                       limit=self.PAGE_SIZE, after_id=self.newest_id, **self.filters())
+        return False
+
+    def show_new(self, records):
+        self.fetching = False
+        if len(records) >= self.PAGE_SIZE:
+            # More arrived than one batch holds; the rows in between would be skipped
+            self.reload()
+            return
+        for record in reversed(records):
+            self.store.prepend(self.row_for(record))
+        if records:
+            self.newest_id = records[0]['id']
+            self.tree.scroll_to_point(-1, 0)
+            self.update_count()
+
+    def on_destroy(self, *_):
+        if self.monitor:
+            self.monitor.cancel()
+            self.monitor = None
+        if self.follow_pending:
+            GLib.source_remove(self.follow_pending)
+            self.follow_pending = None
+        if self.search_pending:
+            GLib.source_remove(self.search_pending)
+            self.search_pending = None
+        # Late replies from workers must not touch the destroyed widgets
+        self.generation += 1
 
-        end_iter = buffer.get_end_iter()
-        self.text_view.scroll_to_iter(end_iter, 0.0, False, 0.0, 0.0)
-    
     def on_response(self, dialog, response):
         if response == Gtk.ResponseType.APPLY:
-            if HISTORY_FILE.exists():
-                HISTORY_FILE.unlink()
-            buffer = self.text_view.get_buffer()
-            buffer.set_text("History cleared.")
+            call_async(self.history.clear, callback=self.current(self.generation, lambda _: self.reload()))
@@ -22,7 +22,23 @@ class Configuration:
     def create_default_config(self):
         print("Creating default configuration file.")
         self.config['GENERAL'] = {
-            'debug': 'false'
+            'debug': 'false',
+            'backend': 'auto',
+            'connectivity_ttl': '30'
+        }
+        self.config['SCAN'] = {
+            'cache_ttl': '10',
+            'min_rescan_interval': '10'
+        }
+        self.config['HISTORY'] = {
+            'rotate_days': '30',
+            'retention_days': '365',
+            'max_db_kb': '1024'
+        }
+        self.config['SPEEDTEST'] = {
+            'streams': '4',
+            'duration': '10',
+            'servers': ''
         }
         os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
         with open(self.config_path, 'w') as configfile:
@@ -46,4 +62,29 @@ if __name__ == "__main__":
 example config.ini content:
 [GENERAL]
 debug = true
+# auto, dbus or nmcli
+backend = auto
+# seconds an internet check stays valid
+connectivity_ttl = 30
+
+[SCAN]
+cache_ttl = 10
+# seconds between forced Wi-Fi rescans
+min_rescan_interval = 10
+
+[HISTORY]
+# older entries move to gzip archives (still searchable)
+rotate_days = 30
+# archives older than this are deleted, 0 keeps them
+retention_days = 365
+# rotate the oldest half early once the database grows past this
+max_db_kb = 1024
+
+[SPEEDTEST]
+# parallel connections per direction (1-16)
+streams = 4
+# seconds per direction
+duration = 10
+# connex --speedtest-server URLs, comma separated; empty for the public servers
+servers = http://127.0.0.1:8089
 """
\ No newline at end of file
@@ -1,47 +1,54 @@
 from pathlib import Path
-from datetime import datetime
-import platform
-import argparse
+import os
+import sys
 
-from assets.utils.config import Configuration
 # Configuration
 CONFIG_DIR = Path.home() / ".config" / "connex"
 HISTORY_FILE = CONFIG_DIR / "history.log"
-config = Configuration().get_config()
-parser = argparse.ArgumentParser()
-parser.add_argument("--debug", action="store_true", help="Enable debug mode")
-DEBUG_MODE = (config.getboolean('GENERAL', 'debug', fallback=False) if config else False) or parser.parse_args().debug
+# None until first use: the INI is read on demand, and main() calls set_debug() for --debug
+DEBUG_MODE = None
+_config = None
+_config_loaded = False
 
 
+def get_config():
+    global _config, _config_loaded
+    if not _config_loaded:
+        from assets.utils.config import Configuration
+        _config = Configuration().get_config()
+        _config_loaded = True
+    return _config
+
+def set_debug(enabled=True):
+    global DEBUG_MODE
+    DEBUG_MODE = enabled
+
+def debug_enabled():
+    global DEBUG_MODE
+    if DEBUG_MODE is None:
+        config = get_config()
+        DEBUG_MODE = config.getboolean('GENERAL', 'debug', fallback=False) if config else False
+    return DEBUG_MODE
+
 def log_debug(msg):    
-    if DEBUG_MODE:
+    if debug_enabled():
         print(f"[DEBUG] {msg}")
 
 def ensure_config_dir():
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
-def log_connection(ssid, signal, success, error_msg=""):
+def log_connection(ssid, signal, success, error_msg="", bssid="", duration=None):
+    # Recorded in the SQLite history store; HISTORY_FILE is only read to migrate it
+    from assets.core.history import get_history
     ensure_config_dir()
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    status = "SUCCESS" if success else "FAILED"
-    log_entry = f"{timestamp} | {status} | {ssid} | Signal: {signal}%"
-    if error_msg:
-        log_entry += f" | Error: {error_msg}"
-    log_entry += "\n"
-    
-    with open(HISTORY_FILE, "a") as f:
-        f.write(log_entry)
-    log_debug(f"Logged: {log_entry.strip()}")
+    record_id = get_history().add(ssid, signal, success, error_msg, bssid=bssid, duration=duration)
+    log_debug(f"Logged connection #{record_id}: {ssid} {'SUCCESS' if success else 'FAILED'}")
 
 def get_os() -> bool:
-    if platform.system() in ("Windows", "Darwin"):
-        return False
-    elif platform.system() == "Linux":
-        return True
-    else:
-        return False
+    # sys.platform rather than the platform module: this runs on every start
+    return sys.platform.startswith("linux")
 
 def get_distro()-> str:
     if get_os():
-        info = platform.release()
+        info = os.uname().release
         return info
\ No newline at end of file
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# Startup budget for the CLI paths against a stub nmcli:
+#   python3 benchmarks/cli_budget.py [--runs 15] [--budget-ms 100]
+# Fails if the median wall time of a command is over budget, or if it
+# imported GTK/gi at all.
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from stub_env import CONNEX, make_stub_env
+
+COMMANDS = [
+    ["--cli", "status"],
+    ["--cli", "list"],
+    ["--proxy", "status"],
+]
+FORBIDDEN = ("gi.repository", "assets.ui", "assets.tray")
+
+
+def time_command(args, env, runs, script=CONNEX):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, str(script)] + args, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def heavy_imports(args, env):
+    res = subprocess.run([sys.executable, "-X", "importtime", str(CONNEX)] + args, env=env,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    found = set()
+    for line in res.stderr.splitlines():
+        name = line.rsplit("|", 1)[-1].strip()
+        if name.startswith(FORBIDDEN):
+            found.add(name)
+    return sorted(found)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="connex CLI startup budget")
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=100)
+    args = parser.parse_args()
+
+    env = make_stub_env()
+    # First run writes bytecode and the config dir; keep it out of the numbers
+    for cmd in COMMANDS:
+        time_command(cmd, env, 1)
+
+    # What the interpreter alone costs on this machine, for scale
+    bare = statistics.median(time_command(["-c", "pass"], env, args.runs, script="-S"))
+    print(f"python -S -c pass: {bare:.1f} ms")
+
+    failed = False
+    print(f"{'command':<20} {'median':>8} {'min':>8} {'max':>8}  budget {args.budget_ms:.0f} ms")
+    for cmd in COMMANDS:
+        samples = time_command(cmd, env, args.runs)
+        median = statistics.median(samples)
+        heavy = heavy_imports(cmd, env)
+        ok = median <= args.budget_ms and not heavy
+        failed |= not ok
+        print(f"{' '.join(cmd):<20} {median:7.1f}ms {min(samples):7.1f}ms {max(samples):7.1f}ms  "
+              f"{'OK' if ok else 'OVER'}")
+        if heavy:
+            print(f"    imports it should not: {', '.join(heavy)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
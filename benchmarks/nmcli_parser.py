@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# Throughput of the nmcli terse parser on synthetic scans:
+#   python3 benchmarks/nmcli_parser.py
+import random
+import sys
+import time
+
+from stub_env import ROOT
+
+sys.path.insert(0, str(ROOT))
+
+from assets.core.nmcli_parser import group_by_ssid, parse_wifi_list  # noqa: E402
+
+
+def synthetic_scan(count: int) -> str:
+    rng = random.Random(42)
+    lines = []
+    for i in range(count):
+        bssid = ":".join(f"{rng.randrange(256):02X}" for _ in range(6)).replace(":", "\\:")
+        ssid = f"net\\:{i % (count // 4 or 1)}"
+        chan = rng.choice((1, 6, 11, 36, 44, 149))
+        freq = 2407 + chan * 5 if chan < 15 else 5000 + chan * 5
+        lines.append(
+            f"{'*' if i == 0 else ' '}:{bssid}:{ssid}:{chan}:{freq} MHz:"
+            f"{rng.choice((54, 130, 270, 540))} Mbit/s:{rng.randrange(100)}:WPA2 WPA3"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    print("nmcli terse parser benchmark")
+    print("=" * 50)
+    for count in (100, 1000, 5000, 20000):
+        out = synthetic_scan(count)
+        runs = max(1, 20000 // count)
+        start = time.perf_counter()
+        for _ in range(runs):
+            nets = group_by_ssid(parse_wifi_list(out))
+        elapsed = (time.perf_counter() - start) / runs
+        print(f"{count:>6} APs -> {len(nets):>5} SSIDs: {elapsed * 1000:8.2f} ms "
+              f"({elapsed / count * 1e6:.2f} µs/AP)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# Client-side ceiling of the SpeedTest engine, measured on loopback against the
+# bundled server (connex --speedtest-server):
+#   python3 benchmarks/speedtest_loopback.py [--streams 1,4,8] [--duration 3] [--min-gbps 1]
+# The server runs in its own process, so the numbers are bounded by the
+# client's send/receive loops. Range and upload replies are checked first.
+# Fails if a check fails or the best download median is under --min-gbps.
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+import urllib.request
+
+from stub_env import ROOT
+
+sys.path.insert(0, str(ROOT))
+
+
+def check_server(base):
+    # -> list of failures
+    from assets.core.speedtest_server import PATTERN, BLOCK
+    failures = []
+    expected = (PATTERN * 2)[BLOCK - 10:BLOCK + 10]
+    req = urllib.request.Request(f"{base}/download?bytes={4 * BLOCK}",
+                                 headers={"Range": f"bytes={BLOCK - 10}-{BLOCK + 9}"})
+    with urllib.request.urlopen(req, timeout=5) as response:
+        if response.status != 206 or response.read() != expected:
+            failures.append("range request returned the wrong bytes")
+        if response.headers["Content-Range"] != f"bytes {BLOCK - 10}-{BLOCK + 9}/{4 * BLOCK}":
+            failures.append(f"bad Content-Range: {response.headers['Content-Range']}")
+
+    with urllib.request.urlopen(f"{base}/download?bytes=12345", timeout=5) as response:
+        body = response.read()
+        if len(body) != 12345 or body != PATTERN[:12345]:
+            failures.append("full download returned the wrong bytes")
+
+    req = urllib.request.Request(f"{base}/upload", data=bytes(3 * BLOCK + 7), method="POST")
+    with urllib.request.urlopen(req, timeout=5) as response:
+        if json.loads(response.read()).get("received") != 3 * BLOCK + 7:
+            failures.append("upload sink miscounted the body")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SpeedTest loopback throughput ceiling")
+    parser.add_argument("--streams", default="1,4", help="Comma separated stream counts")
+    parser.add_argument("--duration", type=float, default=3, help="Seconds per direction and run")
+    parser.add_argument("--min-gbps", type=float, default=1.0)
+    args = parser.parse_args()
+
+    from assets.core.speedtest import SpeedTest, UPLOAD_SIZE_MB, throughput_stats
+    from assets.core.speedtest_server import make_server
+
+    # Bound here so the port is known; served from a forked process
+    server = make_server("127.0.0.1", 0)
+    process = multiprocessing.get_context("fork").Process(target=server.serve_forever, daemon=True)
+    process.start()
+    server.socket.close()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    best = 0.0
+    try:
+        failures = check_server(base)
+        for failure in failures:
+            print(f"CHECK FAILED: {failure}")
+
+        for streams in (int(s) for s in args.streams.split(",")):
+            test = SpeedTest(streams=streams, duration=args.duration, servers=[base])
+            reports = []
+            test.callback = lambda *report: reports.append(report)
+            for direction in ("download", "upload"):
+                start = time.perf_counter()
+                if direction == "download":
+                    series = test._download_streams(test.DOWNLOAD_URLS[0], timeout=30)
+                else:
+                    series = test._upload_streams(test.UPLOAD_URLS[0], UPLOAD_SIZE_MB * 1024 * 1024, timeout=30)
+                stats = throughput_stats(series)
+                wall = time.perf_counter() - start
+                if direction == "download":
+                    best = max(best, stats['median'])
+                print(f"{streams:>2} streams {direction:<8}: median {stats['median'] / 1000:6.2f} Gbps, "
+                      f"p90 {stats['p90'] / 1000:6.2f}, peak {stats['peak'] / 1000:6.2f}  ({wall:.1f}s)")
+            print(f"   {len(reports)} progress reports")
+    finally:
+        process.terminate()
+        process.join()
+
+    ok = best / 1000 >= args.min_gbps and not failures
+    print(f"best download {best / 1000:.2f} Gbps, need {args.min_gbps:.2f}: {'OK' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# Cold/warm start times and -X importtime breakdown for every connex.py mode.
+#
+#   python3 benchmarks/startup.py [--runs 10] [--cold-runs 3] [--output startup.json]
+#                                 [--modes cli-status,gui] [--compare old.json] [--network]
+#
+# Runs against a copy of the tree with a stub nmcli (see stub_env.py). GUI and
+# tray modes need a display: an existing $DISPLAY with --use-display, otherwise
+# Xvfb is started (and a private session bus if dbus-daemon is installed).
+# They count as started once the main loop first goes idle, i.e. after the
+# first frame has been drawn.
+#
+# "cold" removes the tree's __pycache__ before each run (stdlib bytecode stays
+# cached, the OS page cache is not dropped); "warm" reuses everything.
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from stub_env import ROOT, make_stub_env
+
+MODES = {
+    "gui": ([], True),
+    "tray": (["--tray"], True),
+    "tray-only": (["--tray-only"], True),
+    "cli-list": (["--cli", "list"], False),
+    "cli-status": (["--cli", "status"], False),
+    "cli-connect": (["--cli", "connect", "--ssid", "HomeNet", "--password", "hunter22"], False),
+    "cli-disconnect": (["--cli", "disconnect", "--ssid", "HomeNet"], False),
+    "cli-speedtest": (["--cli", "speedtest"], False),
+    "proxy-status": (["--proxy", "status"], False),
+    "proxy-set": (["--proxy", "set", "--proxy-type", "http",
+                   "--proxy-host", "127.0.0.1", "--proxy-port", "3128"], False),
+    "proxy-disable": (["--proxy", "disable"], False),
+    "proxy-test": (["--proxy", "test", "--proxy-host", "127.0.0.1", "--proxy-port", "9"], False),
+}
+# Hits the internet, so only with --network
+NETWORK_MODES = ("cli-speedtest",)
+# Always listed in the breakdown when they show up
+WATCHED_IMPORTS = ("gi", "gi.repository.Gtk", "qrcode", "PIL", "PIL.Image", "urllib.request")
+RUN_TIMEOUT = 60
+
+# Quits the GTK main loop the first time it is idle, after connex set itself up
+PROBE = '''
+import runpy, sys
+from gi.repository import GLib
+
+def ready():
+    gtk = sys.modules.get("gi.repository.Gtk")
+    if gtk:
+        gtk.main_quit()
+    return False
+
+GLib.idle_add(ready, priority=GLib.PRIORITY_LOW)
+sys.argv = sys.argv[1:]
+runpy.run_path(sys.argv[0], run_name="__main__")
+'''
+
+
+def copy_tree(base: Path) -> Path:
+    tree = base / "tree"
+    tree.mkdir()
+    shutil.copy2(ROOT / "connex.py", tree / "connex.py")
+    shutil.copytree(ROOT / "assets", tree / "assets", ignore=shutil.ignore_patterns("__pycache__"))
+    (base / "probe.py").write_text(PROBE)
+    return tree
+
+
+def clear_bytecode(tree: Path):
+    for cache in tree.rglob("__pycache__"):
+        shutil.rmtree(cache, ignore_errors=True)
+
+
+def command(mode, tree: Path, importtime=False):
+    args, gui = MODES[mode]
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    if gui:
+        cmd.append(str(tree.parent / "probe.py"))
+    return cmd + [str(tree / "connex.py")] + args
+
+
+def run_once(cmd, env):
+    # Own session, so whatever the app spawned (nmcli monitor) goes down with it
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True, start_new_session=True)
+    try:
+        _, err = proc.communicate(timeout=RUN_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.communicate()
+        raise RuntimeError(f"timed out after {RUN_TIMEOUT}s: {' '.join(cmd)}")
+    elapsed = (time.perf_counter() - start) * 1000
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+    return elapsed, proc.returncode, err
+
+
+def summarize(samples):
+    return {
+        "median_ms": round(statistics.median(samples), 2),
+        "min_ms": round(min(samples), 2),
+        "max_ms": round(max(samples), 2),
+        "samples_ms": [round(s, 2) for s in samples],
+    }
+
+
+def import_breakdown(stderr: str, top: int = 12):
+    # "import time: self [us] | cumulative | <indent>name", children before parents
+    entries = []
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)", line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+
+    total = sum(cum for _, _, cum, depth in entries if depth == 0)
+    watched = {}
+    for name, self_us, cumulative_us, _ in entries:
+        if name.startswith("assets.") or name in WATCHED_IMPORTS:
+            watched[name] = {"self_ms": round(self_us / 1000, 2), "cumulative_ms": round(cumulative_us / 1000, 2)}
+    heaviest = sorted(entries, key=lambda e: e[1], reverse=True)[:top]
+    return {
+        "total_ms": round(total / 1000, 2),
+        "modules": len(entries),
+        "watched": watched,
+        "heaviest_self": [{"module": n, "self_ms": round(s / 1000, 2)} for n, s, _, _ in heaviest],
+    }
+
+
+def start_display(env, use_display):
+    # -> list of processes to stop afterwards, or None when GUI modes must be skipped
+    procs = []
+    if use_display and env.get("DISPLAY"):
+        return procs
+    if not shutil.which("Xvfb"):
+        return None
+
+    read_fd, write_fd = os.pipe()
+    xvfb = subprocess.Popen(["Xvfb", "-displayfd", str(write_fd), "-screen", "0", "1280x800x24",
+                             "-nolisten", "tcp"], pass_fds=(write_fd,),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        display = pipe.readline().strip()
+    if not display:
+        xvfb.kill()
+        return None
+    env["DISPLAY"] = f":{display}"
+    env.pop("WAYLAND_DISPLAY", None)
+    procs.append(xvfb)
+
+    if shutil.which("dbus-daemon"):
+        bus = subprocess.Popen(["dbus-daemon", "--session", "--nofork", "--print-address=1"],
+                               stdout=subprocess.PIPE, text=True)
+        env["DBUS_SESSION_BUS_ADDRESS"] = bus.stdout.readline().strip()
+        procs.append(bus)
+    return procs
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "-C", str(ROOT), "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+
+def connex_version():
+    source = (ROOT / "assets" / "ui" / "other_ui.py").read_text()
+    match = re.search(r'^VERSION = "([^"]+)"', source, re.M)
+    return match.group(1) if match else None
+
+
+def compare(results, baseline_path):
+    baseline = json.loads(Path(baseline_path).read_text()).get("modes", {})
+    print(f"\nvs {baseline_path} (warm median)")
+    for mode, result in results["modes"].items():
+        old = baseline.get(mode, {}).get("warm")
+        new = result.get("warm")
+        if not old or not new:
+            continue
+        delta = new["median_ms"] - old["median_ms"]
+        pct = delta / old["median_ms"] * 100 if old["median_ms"] else 0
+        flag = "  <- slower" if pct > 10 else ""
+        print(f"  {mode:<16} {old['median_ms']:8.1f} -> {new['median_ms']:8.1f} ms ({pct:+.0f}%){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="connex startup benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="Warm runs per mode")
+    parser.add_argument("--cold-runs", type=int, default=3, help="Runs without bytecode per mode")
+    parser.add_argument("--modes", help=f"Comma separated subset of: {', '.join(MODES)}")
+    parser.add_argument("--output", default="startup.json", help="JSON results file")
+    parser.add_argument("--compare", help="Earlier results file to diff against")
+    parser.add_argument("--use-display", action="store_true", help="Use $DISPLAY instead of Xvfb")
+    parser.add_argument("--network", action="store_true", help="Include modes that hit the internet")
+    args = parser.parse_args()
+
+    modes = args.modes.split(",") if args.modes else list(MODES)
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)}")
+    if not args.network:
+        modes = [m for m in modes if m not in NETWORK_MODES]
+
+    base = Path(tempfile.mkdtemp(prefix="connex-startup-"))
+    env = make_stub_env(base)
+    tree = copy_tree(base)
+    display_procs = start_display(env, args.use_display) if any(MODES[m][1] for m in modes) else []
+
+    results = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "connex_version": connex_version(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.release()} {platform.machine()}",
+            "warm_runs": args.runs,
+            "cold_runs": args.cold_runs,
+        },
+        "modes": {},
+    }
+
+    try:
+        for mode in modes:
+            if MODES[mode][1] and display_procs is None:
+                results["modes"][mode] = {"skipped": "no display; install Xvfb or pass --use-display"}
+                print(f"{mode:<16} skipped (no display)")
+                continue
+
+            cmd = command(mode, tree)
+            cold = []
+            for _ in range(args.cold_runs):
+                clear_bytecode(tree)
+                cold.append(run_once(cmd, env)[0])
+            # Leaves bytecode behind for the warm runs
+            _, code, err = run_once(cmd, env)
+            warm = [run_once(cmd, env)[0] for _ in range(args.runs)]
+            imports = import_breakdown(run_once(command(mode, tree, importtime=True), env)[2])
+
+            result = {"args": MODES[mode][0], "exit_code": code, "warm": summarize(warm),
+                      "imports": imports}
+            if cold:
+                result["cold"] = summarize(cold)
+            if code != 0:
+                result["stderr_tail"] = err.strip().splitlines()[-5:]
+            results["modes"][mode] = result
+
+            cold_text = f"cold {result['cold']['median_ms']:7.1f} ms  " if cold else ""
+            print(f"{mode:<16} {cold_text}warm {result['warm']['median_ms']:7.1f} ms  "
+                  f"imports {imports['total_ms']:7.1f} ms ({imports['modules']} modules)"
+                  f"{'' if code == 0 else f'  exit {code}'}")
+    finally:
+        for proc in display_procs or []:
+            proc.terminate()
+            proc.wait()
+        shutil.rmtree(base, ignore_errors=True)
+
+    Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# Throwaway environment for benchmarks: a canned `nmcli` on PATH, no-op
+# stand-ins for what the proxy code shells out to, a private HOME with a
+# config, no connexd socket, backend pinned to nmcli.
+import os
+import stat
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CONNEX = ROOT / "connex.py"
+
+STUB_NMCLI = r'''#!/bin/sh
+case "$*" in
+    *"STATE general"*) echo "connected" ;;
+    *"CONNECTIVITY general"*) echo "full" ;;
+    "radio wifi") echo "enabled" ;;
+    *"device wifi list"*)
+        echo '*:AA\:BB\:CC\:DD\:EE\:01:HomeNet:6:2437 MHz:130 Mbit/s:78:WPA2'
+        echo ' :AA\:BB\:CC\:DD\:EE\:02:HomeNet:36:5180 MHz:540 Mbit/s:64:WPA2'
+        echo ' :AA\:BB\:CC\:DD\:EE\:03:Cafe\: Free:11:2462 MHz:54 Mbit/s:41:--'
+        ;;
+    *"connection show --active"*)
+        echo 'HomeNet:802-11-wireless:0b7e5a52-4c1e-4f0e-9a55-2f4a1d9c1a01:wlan0' ;;
+    *"connection show"*)
+        echo 'HomeNet:802-11-wireless:0b7e5a52-4c1e-4f0e-9a55-2f4a1d9c1a01:wlan0'
+        echo 'Office VPN:vpn:5d0c2a6e-8f7b-4d3c-b2a1-9e8f7d6c5b4a:'
+        ;;
+    *"device show"*)
+        echo 'GENERAL.DEVICE:wlan0'
+        echo 'GENERAL.TYPE:wifi'
+        echo 'GENERAL.STATE:100 (connected)'
+        echo 'GENERAL.CONNECTION:HomeNet'
+        echo 'IP4.ADDRESS[1]:192.168.1.23/24'
+        echo 'IP4.GATEWAY:192.168.1.1'
+        echo 'IP4.DNS[1]:192.168.1.1'
+        ;;
+    monitor) exec sleep 3600 ;;
+    *) ;;
+esac
+exit 0
+'''
+
+# Proxy set/disable call these; never touch the real system from a benchmark
+NOOP_COMMANDS = ("sudo", "gsettings", "kwriteconfig5", "git", "npm", "docker", "systemctl")
+STUB_NOOP = "#!/bin/sh\nexec cat > /dev/null\n"
+
+
+def _write_script(path, body):
+    path.write_text(body)
+    path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+def make_stub_env(base=None) -> dict:
+    base = Path(base or tempfile.mkdtemp(prefix="connex-bench-"))
+    bin_dir = base / "bin"
+    home = base / "home"
+    runtime = base / "run"
+    for d in (bin_dir, home / ".config" / "connex", runtime):
+        d.mkdir(parents=True, exist_ok=True)
+    os.chmod(runtime, 0o700)
+
+    _write_script(bin_dir / "nmcli", STUB_NMCLI)
+    for name in NOOP_COMMANDS:
+        _write_script(bin_dir / name, STUB_NOOP)
+
+    config = home / ".config" / "connex" / "config.ini"
+    if not config.exists():
+        config.write_text("[GENERAL]\ndebug = false\nbackend = nmcli\n\n[SCAN]\ncache_ttl = 10\n")
+
+    env = dict(os.environ)
+    # Warm runs should load cached bytecode like an installed copy does
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env.update({
+        "PATH": f"{bin_dir}{os.pathsep}{env.get('PATH', '')}",
+        "HOME": str(home),
+        "XDG_RUNTIME_DIR": str(runtime),
+        "CONNEX_BACKEND": "nmcli",
+    })
+    return env
+
+
+if __name__ == "__main__":
+    env = make_stub_env()
+    print(f"export PATH={env['PATH']!r} HOME={env['HOME']!r} "
+          f"XDG_RUNTIME_DIR={env['XDG_RUNTIME_DIR']!r} CONNEX_BACKEND=nmcli")
+    sys.exit(0)
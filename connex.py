@@ -1,37 +1,34 @@
 #!/usr/bin/env python3
-import gi
 import subprocess
-import shlex
 import argparse
 import sys
 sys.path.append('/usr/local/lib/connex')
 
-import json
-
-gi.require_version("Gtk", "3.0")
-gi.require_version('AppIndicator3', '0.1')
-gi.require_version('Notify', '0.7')
-from gi.repository import Gtk, GObject, GLib, Gdk, Notify, AppIndicator3
-
 # IMPORTS
-from assets.ui.main_window import WifiWindow
-from assets.tray.system_tray import SystemTrayApp 
-from assets.utils.debug import ensure_config_dir, get_os
+# Only what every mode needs; GTK and the UI are imported in run_gui() so
+# --cli and --proxy start without loading them
+from assets.utils.debug import ensure_config_dir, get_os, set_debug
 
 
 def cli_mode(args):
+    from assets.core.nm_backend import get_backend
+    from assets.core.nmcli_parser import group_by_ssid
+    from assets.core.ipc import DaemonClient
+
+    # list/status are answered from connexd's cache when it is running
+    daemon = DaemonClient()
+
     if args.cli_action == "list":
-        code, out, err = run_cmd_sync("nmcli -t -f SSID,SIGNAL,SECURITY device wifi list")
-        if code == 0:
+        networks = daemon.request("networks")
+        if networks is None:
+            networks = get_backend().get_wifi_networks()
+        if networks is not None:
             print("SSID\t\tSignal\tSecurity")
             print("-" * 50)
-            for line in out.splitlines():
-                if line.strip():
-                    parts = line.split(':')
-                    ssid = parts[0] if parts[0] else "<Hidden>"
-                    signal = parts[1] if len(parts) > 1 else "?"
-                    sec = parts[2] if len(parts) > 2 else "Open"
-                    print(f"{ssid}\t{signal}%\t{sec}")
+            for net in group_by_ssid(networks):
+                ssid = net['ssid'] or "<Hidden>"
+                sec = net['security'] or "Open"
+                print(f"{ssid}\t{net['signal']}%\t{sec}")
         return 0
     
     elif args.cli_action == "connect":
@@ -60,8 +57,8 @@ def cli_mode(args):
             print("Error: SSID required for disconnect")
             return 1
         
-        code, out, err = run_cmd_sync(f"nmcli connection down '{args.ssid}'")
-        if code == 0:
+        ok, err = get_backend().deactivate_connection(args.ssid)
+        if ok:
             print(f"✓ Disconnected from {args.ssid}")
             return 0
         else:
@@ -69,69 +66,87 @@ def cli_mode(args):
             return 1
     
     elif args.cli_action == "status":
-        code, out, err = run_cmd_sync("nmcli -t -f GENERAL,IP4 device show")
-        if code == 0:
+        state = daemon.request("status")
+        rows = state["device"] if state else get_backend().device_show()
+        if rows is not None:
             print("Network Status:")
             print("-" * 50)
-            for line in out.splitlines()[:15]:
-                if any(x in line for x in ["CONNECTION", "STATE", "IP4.ADDRESS", "IP4.GATEWAY"]):
-                    print(line.replace(":", ": "))
+            for key, val in rows[:15]:
+                if any(x in key for x in ["CONNECTION", "STATE", "IP4.ADDRESS", "IP4.GATEWAY"]):
+                    print(f"{key}: {val}")
+        return 0
+
+    elif args.cli_action == "history":
+        from assets.core.history import get_history, format_record
+        filters = {"ssid": args.ssid} if args.ssid else {}
+        records = daemon.request("history", limit=args.limit, **filters)
+        if records is None:
+            records = get_history().query(limit=args.limit, **filters)
+        if not records:
+            print("No connection history yet.")
+        for record in reversed(records):
+            print(format_record(record))
         return 0
 
     elif args.cli_action == "speedtest":
         
         from assets.core.speedtest import cli_speedtest
-        return cli_speedtest()
+        servers = [s for s in args.servers.split(",") if s] if args.servers else None
+        return cli_speedtest(streams=args.streams, duration=args.duration, servers=servers)
 
 
     return 0
 
 
-def run_cmd_sync(cmd):
-    try:
-        res = subprocess.run(shlex.split(cmd), capture_output=True, text=True, timeout=10)
-        return res.returncode, res.stdout.strip(), res.stderr.strip()
-    except Exception as e:
-        return 1, "", str(e)
+def proxy_mode(args):
+    from assets.core.proxies import ProxyManager
+    pm = ProxyManager()
 
+    if args.proxy_action == "status":
+        print(pm.get_status_text())
+        config = pm.get_current_proxy()
+        if config.get('enabled'):
+            print(f"Type: {config.get('type')}")
+            print(f"Host: {config.get('host')}")
+            print(f"Port: {config.get('port')}")
 
-def main():
-    if not get_os():
-        print("THIS PROGRAM IS NOT MADE FOR YOUR OS")
-        return
-    
-    parser = argparse.ArgumentParser(description="connex - Modern Wi-Fi Manager")
-    # Connex args
-    parser.add_argument("--debug", action="store_true", help="Enable debug mode")
-    parser.add_argument("--no-scan", action="store_true", help="Disable auto scanning")
-    # tray args
-    parser.add_argument("--tray", action="store_true", help="Start in system tray and window")
-    parser.add_argument("--tray-only",action="store_true", help="Start only the tray")
+    elif args.proxy_action == "set":
+        if not args.proxy_type or not args.proxy_host or not args.proxy_port:
+            print("Error: --proxy-type, --proxy-host, and --proxy-port required")
+            return 1
 
-    #CLI only
-    parser.add_argument("--cli", dest="cli_action",
-     choices=["list", "connect", "disconnect", "status", "speedtest"],
-     help="CLI mode"
-    )
-    parser.add_argument("--ssid", help="SSID for CLI connect/disconnect")
-    parser.add_argument("--password", help="Password for CLI connect")
-    # proxies
-    parser.add_argument("--proxy", dest="proxy_action",
-     choices=["status", "set", "disable", "test"],
-     help="Proxy configuration"
-    )
-    parser.add_argument("--proxy-type", help="Proxy type (http, https, socks5)")
-    parser.add_argument("--proxy-host", help="Proxy host")
-    parser.add_argument("--proxy-port", help="Proxy port")
+        success, msg = pm.set_proxy(
+            args.proxy_type, 
+            args.proxy_host, 
+            args.proxy_port
+        )
+        print(msg)
+        return 0 if success else 1
+
+    elif args.proxy_action == "disable":
+        success, msg = pm.disable_proxy()
+        print(msg)
+        return 0 if success else 1
+
+    elif args.proxy_action == "test":
+        if not args.proxy_host or not args.proxy_port:
+            print("Error: --proxy-host and --proxy-port required")
+            return 1
+
+        success, msg = pm.test_proxy(args.proxy_host, args.proxy_port)
+        print(msg)
+        return 0 if success else 1
+
+    return 0
+
+
+def run_gui(args):
+    import gi
+    gi.require_version("Gtk", "3.0")
+    gi.require_version('AppIndicator3', '0.1')
+    gi.require_version('Notify', '0.7')
+    from gi.repository import Gtk, Gdk, Notify
 
-    args = parser.parse_args()
-    
-    ensure_config_dir()
-    
-    # CLI mode
-    if args.cli_action:
-        return cli_mode(args)
-    
     css_provider = Gtk.CssProvider()
     css_provider.load_from_data(b"""
         .info-bar {
@@ -160,47 +175,8 @@ def main():
         Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
     )
 
-    # proxies
-    if args.proxy_action:
-        from assets.core.proxies import ProxyManager
-        pm = ProxyManager()
-        
-        if args.proxy_action == "status":
-            print(pm.get_status_text())
-            config = pm.get_current_proxy()
-            if config.get('enabled'):
-                print(f"Type: {config.get('type')}")
-                print(f"Host: {config.get('host')}")
-                print(f"Port: {config.get('port')}")
-        
-        elif args.proxy_action == "set":
-            if not args.proxy_type or not args.proxy_host or not args.proxy_port:
-                print("Error: --proxy-type, --proxy-host, and --proxy-port required")
-                return 1
-            
-            success, msg = pm.set_proxy(
-                args.proxy_type, 
-                args.proxy_host, 
-                args.proxy_port
-            )
-            print(msg)
-            return 0 if success else 1
-        
-        elif args.proxy_action == "disable":
-            success, msg = pm.disable_proxy()
-            print(msg)
-            return 0 if success else 1
-        
-        elif args.proxy_action == "test":
-            if not args.proxy_host or not args.proxy_port:
-                print("Error: --proxy-host and --proxy-port required")
-                return 1
-            
-            success, msg = pm.test_proxy(args.proxy_host, args.proxy_port)
-            print(msg)
-            return 0 if success else 1
-    
     if args.tray or args.tray_only:
+        from assets.tray.system_tray import SystemTrayApp
         tray = SystemTrayApp()
         if not args.tray_only:
             tray.show_window()
@@ -209,12 +185,76 @@ def main():
             Notify.Notification.new("connex", "Running in tray mode", "network-wireless").show()
         Gtk.main()
     else:
+        from assets.ui.main_window import WifiWindow
         win = WifiWindow(no_scan=args.no_scan)
         win.connect("destroy", Gtk.main_quit)
         Gtk.main()
     
     return 0
 
+
+def main():
+    if not get_os():
+        print("THIS PROGRAM IS NOT MADE FOR YOUR OS")
+        return
+    
+    parser = argparse.ArgumentParser(description="connex - Modern Wi-Fi Manager")
+    # Connex args
+    parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    parser.add_argument("--no-scan", action="store_true", help="Disable auto scanning")
+    # tray args
+    parser.add_argument("--tray", action="store_true", help="Start in system tray and window")
+    parser.add_argument("--tray-only",action="store_true", help="Start only the tray")
+    parser.add_argument("--daemon", action="store_true", help="Run connexd, sharing scans and state with other frontends")
+
+    #CLI only
+    parser.add_argument("--cli", dest="cli_action",
+     choices=["list", "connect", "disconnect", "status", "history", "speedtest"],
+     help="CLI mode"
+    )
+    parser.add_argument("--ssid", help="SSID for CLI connect/disconnect")
+    parser.add_argument("--password", help="Password for CLI connect")
+    parser.add_argument("--limit", type=int, default=20, help="Entries shown by CLI history")
+    parser.add_argument("--streams", type=int, help="Parallel streams for CLI speedtest")
+    parser.add_argument("--duration", type=float, help="Seconds per direction for CLI speedtest")
+    parser.add_argument("--servers", help="Comma separated connex speedtest server URLs for CLI speedtest")
+    # local speedtest server
+    parser.add_argument("--speedtest-server", action="store_true", help="Serve speedtest downloads/uploads over HTTP")
+    parser.add_argument("--speedtest-host", default="127.0.0.1", help="Address for --speedtest-server")
+    parser.add_argument("--speedtest-port", type=int, default=8089, help="Port for --speedtest-server")
+    # proxies
+    parser.add_argument("--proxy", dest="proxy_action",
+     choices=["status", "set", "disable", "test"],
+     help="Proxy configuration"
+    )
+    parser.add_argument("--proxy-type", help="Proxy type (http, https, socks5)")
+    parser.add_argument("--proxy-host", help="Proxy host")
+    parser.add_argument("--proxy-port", help="Proxy port")
+
+    args = parser.parse_args()
+    if args.debug:
+        set_debug(True)
+    
+    ensure_config_dir()
+
+    if args.daemon:
+        from assets.core.daemon import run_daemon
+        return run_daemon()
+
+    if args.speedtest_server:
+        from assets.core.speedtest_server import run_speedtest_server
+        return run_speedtest_server(args.speedtest_host, args.speedtest_port)
+
+    # CLI mode
+    if args.cli_action:
+        return cli_mode(args)
+
+    # proxies
+    if args.proxy_action:
+        return proxy_mode(args)
+
+    return run_gui(args)
+
 if __name__ == "__main__":
     try:
         sys.exit(main())
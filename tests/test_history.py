@@ -0,0 +1,149 @@
+import fcntl
+import time
+
+import pytest
+
+from assets.core.history import MAINTAIN_LOCK, MAINTAIN_STAMP, OUTCOME_FAILED, OUTCOME_SUCCESS, HistoryStore
+
+DAY = 86400
+
+LEGACY_LOG = (
+    "2024-03-02 10:00:00 | FAILED | Cafe | Signal: 40% | Error: Secrets were required\n"
+    "not a history line\n"
+    "2024-03-01 09:30:00 | SUCCESS | Home | Signal: 80%\n"
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(tmp_path / "h.db", tmp_path / "archive", rotate_days=30, retention_days=0, max_db_kb=0)
+    yield store
+    store.close()
+
+
+def fill(store, count, start=None, ssid="Home"):
+    start = start or time.time() - count
+    return [store.add(ssid, 50, i % 2 == 0, ts=start + i) for i in range(count)]
+
+
+# migrate_text_log
+
+def test_migrate_imports_in_time_order(store, tmp_path):
+    log = tmp_path / "history.log"
+    log.write_text(LEGACY_LOG)
+    assert store.migrate_text_log(log) == 2
+    records = store.query()
+    assert [r['ssid'] for r in records] == ["Cafe", "Home"]
+    assert records[0]['outcome'] == OUTCOME_FAILED and records[0]['error'] == "Secrets were required"
+    assert records[1]['outcome'] == OUTCOME_SUCCESS and records[1]['signal'] == 80
+    assert not log.exists()
+    assert (tmp_path / "history.log.migrated").exists()
+
+
+def test_migrate_twice_imports_once(store, tmp_path):
+    log = tmp_path / "history.log"
+    log.write_text(LEGACY_LOG)
+    assert store.migrate_text_log(log) == 2
+    assert store.migrate_text_log(log) == 0
+    assert store.count() == 2
+
+
+def test_migrate_renumbers_existing_rows(store, tmp_path):
+    store.add("Office", 60, True)
+    log = tmp_path / "history.log"
+    log.write_text(LEGACY_LOG)
+    store.migrate_text_log(log)
+    records = store.query()
+    assert [r['ssid'] for r in records] == ["Office", "Cafe", "Home"]
+    assert [r['id'] for r in records] == sorted((r['id'] for r in records), reverse=True)
+
+
+def test_migrate_without_log(store, tmp_path):
+    assert store.migrate_text_log(tmp_path / "missing.log") == 0
+    assert store.count() == 0
+    assert not (tmp_path / "missing.log.migrated").exists()
+
+
+# query
+
+def test_query_pages_with_before_id(store):
+    ids = fill(store, 25)
+    pages = []
+    before = None
+    while True:
+        page = store.query(limit=10, before_id=before)
+        if not page:
+            break
+        pages.append([r['id'] for r in page])
+        before = page[-1]['id']
+    assert [len(p) for p in pages] == [10, 10, 5]
+    assert sum(pages, []) == ids[::-1]
+
+
+def test_query_filters(store):
+    fill(store, 4)
+    store.add("Cafe", 30, False, error="Secrets were required")
+    assert [r['ssid'] for r in store.query(ssid="Cafe")] == ["Cafe"]
+    assert store.count(outcome=OUTCOME_FAILED) == 3
+    assert store.count(search="secrets") == 1
+    assert store.count(search="home") == 4
+
+
+# maintain
+
+def test_maintain_rotates_old_rows(store, tmp_path):
+    now = time.time()
+    old = fill(store, 6, start=now - 40 * DAY, ssid="Old")
+    new = fill(store, 4, start=now - 60)
+    store.maintain()
+
+    segments = store.segments()
+    assert len(segments) == 1
+    first_id, last_id, _, _, rows, _ = segments[0]
+    assert (first_id, last_id, rows) == (old[0], old[-1], 6)
+
+    assert store.count() == 10
+    assert store.count(ssid="Old") == 6
+    assert [r['id'] for r in store.query(limit=100)] == (old + new)[::-1]
+    # A page that starts in the live table and ends in the archive
+    page = store.query(limit=5, before_id=new[1])
+    assert [r['id'] for r in page] == [new[0]] + old[::-1][:4]
+
+
+def test_clear_removes_archives(store):
+    fill(store, 3, start=time.time() - 40 * DAY)
+    store.maintain()
+    assert store.segments()
+    store.clear()
+    assert store.count() == 0
+    assert not store.segments()
+
+
+def test_maintain_skips_while_another_process_holds_the_lock(store, tmp_path):
+    fill(store, 3, start=time.time() - 40 * DAY)
+    (tmp_path / "archive").mkdir()
+    with open(tmp_path / "archive" / MAINTAIN_LOCK, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        assert store.maintain() is False
+    assert not store.segments()
+    assert store.maintain() is True
+    assert store.segments()
+
+
+def test_maintain_if_due_reads_the_shared_stamp(store, tmp_path):
+    fill(store, 3, start=time.time() - 40 * DAY)
+    (tmp_path / "archive").mkdir()
+    # Another process maintained a moment ago
+    (tmp_path / "archive" / MAINTAIN_STAMP).touch()
+    assert store.maintain(if_due=True) is False
+    assert not store.segments()
+
+
+def test_search_is_literal(store):
+    store.add("my_net", 50, True)
+    store.add("myXnet", 50, True)
+    store.add("100% Free", 50, False, error="DHCP timed out")
+    assert [r['ssid'] for r in store.query(search="y_n")] == ["my_net"]
+    assert [r['ssid'] for r in store.query(search="0%")] == ["100% Free"]
+    assert store.count(search="FREE") == 1
+    assert store.count(search="dhcp") == 1
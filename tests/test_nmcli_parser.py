@@ -0,0 +1,148 @@
+from assets.core.nmcli_parser import (
+    get_value,
+    group_by_ssid,
+    parse_connections,
+    parse_key_values,
+    parse_wifi_list,
+    split_terse,
+)
+
+
+def ap(ssid, signal, in_use=False, bssid="AA:BB:CC:DD:EE:01"):
+    return {'ssid': ssid, 'bssid': bssid, 'chan': 6, 'freq': 2437, 'rate': 130,
+            'signal': signal, 'security': "WPA2", 'in_use': in_use}
+
+
+# split_terse
+
+def test_split_terse_plain():
+    assert split_terse("a:b:c") == ["a", "b", "c"]
+
+
+def test_split_terse_escaped_colon():
+    assert split_terse(r"AA\:BB\:CC:Cafe\: Free") == ["AA:BB:CC", "Cafe: Free"]
+
+
+def test_split_terse_escaped_backslash():
+    assert split_terse(r"back\\slash:x") == ["back\\slash", "x"]
+
+
+def test_split_terse_field_ending_in_escaped_backslash():
+    # "a\\" followed by the separator, not an escaped colon
+    assert split_terse("a\\\\:b") == ["a\\", "b"]
+    assert split_terse("a\\\\\\:b:c") == ["a\\:b", "c"]
+
+
+def test_split_terse_maxsplit():
+    assert split_terse(r"IP4.ADDRESS[1]:fe80\:\:1/64", 1) == ["IP4.ADDRESS[1]", "fe80::1/64"]
+
+
+# parse_wifi_list
+
+def test_parse_wifi_list_fields():
+    out = r"*:AA\:BB\:CC\:DD\:EE\:01:Cafe\: Free:6:2437 MHz:54 Mbit/s:40:--"
+    assert parse_wifi_list(out) == [{
+        'ssid': "Cafe: Free", 'bssid': "AA:BB:CC:DD:EE:01", 'chan': 6, 'freq': 2437,
+        'rate': 54, 'signal': 40, 'security': "", 'in_use': True,
+    }]
+
+
+def test_parse_wifi_list_hidden_ssid():
+    out = r" :AA\:BB\:CC\:DD\:EE\:02::11:2462 MHz:130 Mbit/s:55:WPA2"
+    (hidden,) = parse_wifi_list(out)
+    assert hidden['ssid'] == ""
+    assert hidden['signal'] == 55 and not hidden['in_use']
+
+
+def test_parse_wifi_list_skips_blank_lines():
+    out = "\n  \n" + r" :AA\:BB\:CC\:DD\:EE\:02:Home:1:2412 MHz:54 Mbit/s:70:WPA2" + "\n\n"
+    assert [a['ssid'] for a in parse_wifi_list(out)] == ["Home"]
+
+
+def test_parse_wifi_list_truncated_row():
+    (short,) = parse_wifi_list(r" :AA\:BB\:CC\:DD\:EE\:03:Short")
+    assert short['ssid'] == "Short"
+    assert (short['chan'], short['freq'], short['rate'], short['signal']) == (0, 0, 0, 0)
+    assert short['security'] == ""
+
+
+def test_parse_wifi_list_non_numeric_values():
+    out = r" :AA\:BB\:CC\:DD\:EE\:04:Odd:--:n/a MHz:? Mbit/s:strong:WPA3"
+    (odd,) = parse_wifi_list(out)
+    assert (odd['chan'], odd['freq'], odd['rate'], odd['signal']) == (0, 0, 0, 0)
+    assert odd['security'] == "WPA3"
+
+
+# parse_connections
+
+def test_parse_connections_skips_empty_type():
+    out = "\n".join([
+        "HomeNet:802-11-wireless:0b7e5a52-4c1e-4f0e-9a55-2f4a1d9c1a01:wlan0",
+        "Broken::5d0c2a6e-8f7b-4d3c-b2a1-9e8f7d6c5b4a:",
+        r"Office\: VPN:vpn:5d0c2a6e-8f7b-4d3c-b2a1-9e8f7d6c5b4b:",
+        "OnlyName",
+    ])
+    assert parse_connections(out) == [
+        {'name': "HomeNet", 'type': "802-11-wireless",
+         'uuid': "0b7e5a52-4c1e-4f0e-9a55-2f4a1d9c1a01", 'device': "wlan0"},
+        {'name': "Office: VPN", 'type': "vpn",
+         'uuid': "5d0c2a6e-8f7b-4d3c-b2a1-9e8f7d6c5b4b", 'device': ""},
+    ]
+
+
+# parse_key_values / get_value
+
+DEVICE_SHOW = "\n".join([
+    "GENERAL.DEVICE:wlan0",
+    "IP4.ADDRESS[1]:192.168.1.23/24",
+    "IP4.ADDRESS[2]:10.0.0.5/8",
+    "IP4.GATEWAY:192.168.1.1",
+    r"IP6.ADDRESS[1]:fe80\:\:1/64",
+    "no separator here",
+])
+
+
+def test_parse_key_values_multi_valued():
+    rows = parse_key_values(DEVICE_SHOW)
+    assert ("IP4.ADDRESS[1]", "192.168.1.23/24") in rows
+    assert ("IP4.ADDRESS[2]", "10.0.0.5/8") in rows
+    assert ("IP6.ADDRESS[1]", "fe80::1/64") in rows
+    assert len(rows) == 5
+
+
+def test_get_value_first_match():
+    assert get_value(DEVICE_SHOW, "IP4.ADDRESS") == "192.168.1.23/24"
+    assert get_value(DEVICE_SHOW, "IP4.ADDRESS[2]") == "10.0.0.5/8"
+    assert get_value(DEVICE_SHOW, "IP4.GATEWAY") == "192.168.1.1"
+    assert get_value(DEVICE_SHOW) == "wlan0"
+    assert get_value(DEVICE_SHOW, "IP4.DNS") == ""
+
+
+# group_by_ssid
+
+def test_group_by_ssid_keeps_strongest_ap():
+    nets = group_by_ssid([
+        ap("Cafe", 40, bssid="AA:00:00:00:00:01"),
+        ap("Cafe", 80, bssid="AA:00:00:00:00:02"),
+        ap("Home", 60, bssid="BB:00:00:00:00:01"),
+    ])
+    assert [n['ssid'] for n in nets] == ["Cafe", "Home"]
+    cafe = nets[0]
+    assert cafe['bssid'] == "AA:00:00:00:00:02" and cafe['signal'] == 80
+    assert [a['signal'] for a in cafe['aps']] == [80, 40]
+
+
+def test_group_by_ssid_keeps_in_use_from_weaker_ap():
+    nets = group_by_ssid([
+        ap("Cafe", 40, in_use=True, bssid="AA:00:00:00:00:01"),
+        ap("Cafe", 80, bssid="AA:00:00:00:00:02"),
+    ])
+    assert nets[0]['in_use'] and nets[0]['signal'] == 80
+
+
+def test_group_by_ssid_keeps_in_use_from_stronger_ap():
+    nets = group_by_ssid([
+        ap("Cafe", 80, in_use=True, bssid="AA:00:00:00:00:02"),
+        ap("Cafe", 40, bssid="AA:00:00:00:00:01"),
+    ])
+    assert nets[0]['in_use'] and nets[0]['bssid'] == "AA:00:00:00:00:02"